@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis of UTM Test Files
+
+Scans a directory for exported test files (UTM_Test_*.csv / *.utm), computes a
+per-specimen summary in a process pool and writes one summary table.
+
+Results are cached next to the summary table, keyed by the SHA-256 of each
+file's content, so re-runs only parse new or changed files.
+
+Usage:
+    python batch_analysis.py <directory> [-o summary.csv] [-j JOBS] [-r] [--no-cache]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import data_files
+from material_properties import material_properties
+
+FILE_PATTERNS = ("*UTM_Test_*.csv", "*UTM_Test_*.utm")
+CACHE_FILENAME = ".utm_batch_cache.json"
+CACHE_VERSION = 2  # Bumped when the summary values change
+
+SUMMARY_FIELDS = (
+    "File", "File ID", "Test Date", "Comment", "Area_mm2", "GaugeLength_mm",
+    "DataPoints", "Duration_s", "MaxLoad_N", "UTS_MPa", "Modulus_MPa", "YieldStrength_MPa",
+    "UniformElongation_pct", "ElongationAtBreak_pct", "Toughness_MJ_m3", "SHA256",
+    "Error",  # Why the file could not be analyzed (empty for valid files)
+)
+
+
+def hash_file(file_path, chunk_size=1 << 20):
+    """SHA-256 hex digest of the file content"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def summarize(metadata, columns):
+    """
+    Compute the summary values of one test
+
+    Args:
+        metadata (dict): File metadata (see data_files)
+        columns (dict): Column arrays with at least time, force, strain and stress
+
+    Returns:
+        dict: DataPoints, Duration_s, MaxLoad_N and the material properties
+            (UTS_MPa, Modulus_MPa, YieldStrength_MPa, UniformElongation_pct,
+            ElongationAtBreak_pct, Toughness_MJ_m3)
+    """
+    time = np.asarray(columns["time"])
+    force = np.asarray(columns["force"])
+    n = len(force)
+    if n == 0:
+        return {"DataPoints": 0, "Duration_s": 0.0, "MaxLoad_N": 0.0, "UTS_MPa": 0.0,
+                "Modulus_MPa": float("nan"), "YieldStrength_MPa": float("nan"),
+                "UniformElongation_pct": 0.0, "ElongationAtBreak_pct": 0.0, "Toughness_MJ_m3": 0.0}
+
+    # Max load by absolute value (sign preserved, as in the application)
+    max_load = float(force[int(np.argmax(np.abs(force)))])
+
+    # Same analysis as the application's material properties
+    properties = material_properties(columns["strain"], columns["stress"], metadata.get("break_index"))
+
+    return {
+        "DataPoints": n,
+        "Duration_s": float(time[-1] - time[0]),
+        "MaxLoad_N": max_load,
+        "UTS_MPa": properties["uts_mpa"],
+        "Modulus_MPa": properties["modulus_mpa"],
+        "YieldStrength_MPa": properties["yield_strength_mpa"],
+        "UniformElongation_pct": properties["uniform_elongation_pct"],
+        "ElongationAtBreak_pct": properties["elongation_at_break_pct"],
+        "Toughness_MJ_m3": properties["toughness_mj_m3"],
+    }
+
+
+def summarize_file(file_path):
+    """Read one test file and return its summary row (runs in a worker process)"""
+    file_path = Path(file_path)
+    try:
+        metadata, columns = data_files.read_data_file(file_path)
+        row = summarize(metadata, columns)
+        error = ""
+    except Exception as e:
+        metadata, row, error = {}, {}, str(e)
+    row.update({
+        "File": file_path.name,
+        "File ID": data_files.file_id_from_name(file_path.name),
+        "Test Date": metadata.get("test_date", ""),
+        "Comment": metadata.get("comment", ""),
+        "Area_mm2": metadata.get("specimen_area_mm2", ""),
+        "GaugeLength_mm": metadata.get("gauge_length_mm", ""),
+    })
+    if error:
+        row["Error"] = error
+    return row
+
+
+def find_files(directory, recursive=False):
+    """Sorted list of test files in the directory"""
+    directory = Path(directory)
+    files = set()
+    for pattern in FILE_PATTERNS:
+        files.update(directory.rglob(pattern) if recursive else directory.glob(pattern))
+    return sorted(files)
+
+
+def load_cache(cache_path):
+    """Load the result cache ({'files': {path: [size, mtime_ns, sha]}, 'results': {sha: row}})"""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "files": {}, "results": {}}
+
+
+def save_cache(cache_path, cache):
+    tmp_path = str(cache_path) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def run_batch(directory, output=None, jobs=None, recursive=False, use_cache=True, log=print):
+    """
+    Summarize all test files in a directory
+
+    Args:
+        directory (str): Directory to scan
+        output (str): Summary CSV path (default: <directory>/utm_summary.csv)
+        jobs (int): Worker processes (default: CPU count)
+        recursive (bool): Also scan subdirectories
+        use_cache (bool): Reuse cached results for unchanged files
+        log (callable): Progress output
+
+    Returns:
+        list: Summary rows (dicts), in file order
+    """
+    directory = Path(directory)
+    output = Path(output) if output else directory / "utm_summary.csv"
+    cache_path = output.parent / CACHE_FILENAME
+    cache = load_cache(cache_path) if use_cache else {"version": CACHE_VERSION, "files": {}, "results": {}}
+
+    files = find_files(directory, recursive)
+    log(f"Found {len(files)} test file(s) in {directory}")
+
+    # Files whose size/mtime match the cache reuse the stored hash; others are hashed again
+    hashes = {}
+    to_hash = []
+    for path in files:
+        st = path.stat()
+        entry = cache["files"].get(str(path))
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            hashes[path] = entry[2]
+        else:
+            to_hash.append(path)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(to_hash) // (4 * (jobs or os.cpu_count() or 1)))
+        for path, digest in zip(to_hash, pool.map(hash_file, to_hash, chunksize=chunksize)):
+            st = path.stat()
+            cache["files"][str(path)] = [st.st_size, st.st_mtime_ns, digest]
+            hashes[path] = digest
+
+        # Only parse files whose content is not in the cache (duplicates parsed once)
+        pending = {}
+        for path in files:
+            if hashes[path] not in cache["results"]:
+                pending.setdefault(hashes[path], path)
+        n_new = sum(1 for path in files if hashes[path] in pending)
+        log(f"{len(files) - n_new} cached, {n_new} to analyze")
+
+        failed = {}
+        todo = list(pending.items())
+        chunksize = max(1, len(todo) // (4 * (jobs or os.cpu_count() or 1)))
+        for (digest, path), row in zip(todo, pool.map(summarize_file, [p for _, p in todo], chunksize=chunksize)):
+            if "Error" in row:
+                log(f"  {path.name}: {row['Error']}")
+                failed[digest] = row  # Not cached, retried on the next run
+            else:
+                cache["results"][digest] = row
+
+    rows = []
+    for path in files:
+        digest = hashes[path]
+        row = dict(cache["results"].get(digest) or failed[digest])
+        # File name/ID come from the path (identical content may exist under several names)
+        row["File"] = path.name
+        row["File ID"] = data_files.file_id_from_name(path.name)
+        row["SHA256"] = digest
+        rows.append(row)
+
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    log(f"Summary written to {output}")
+
+    if use_cache:
+        # Drop entries for files that no longer exist
+        existing = {str(p) for p in files}
+        digests = set(hashes.values())
+        cache["files"] = {k: v for k, v in cache["files"].items() if k in existing}
+        cache["results"] = {k: v for k, v in cache["results"].items() if k in digests}
+        save_cache(cache_path, cache)
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a directory of UTM test files")
+    parser.add_argument("directory", help="Directory containing UTM_Test_*.csv / *.utm files")
+    parser.add_argument("-o", "--output", help="Summary CSV file (default: <directory>/utm_summary.csv)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Scan subdirectories")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the result cache")
+    args = parser.parse_args()
+
+    if not Path(args.directory).is_dir():
+        print(f"Not a directory: {args.directory}")
+        sys.exit(1)
+
+    run_batch(args.directory, args.output, args.jobs, args.recursive, not args.no_cache)
+
+
+if __name__ == "__main__":
+    main()
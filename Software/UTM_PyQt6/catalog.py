@@ -0,0 +1,242 @@
+"""
+Test Catalog for UTM Application
+
+Local SQLite index of saved test runs (.utm and exported CSV files). Only the
+file headers are read when indexing, and directories are re-indexed
+incrementally (files are skipped if their size and modification time are
+unchanged, including CSV files found not to be UTM recordings), so keeping
+tens of thousands of runs searchable is cheap.
+
+Each method opens its own connection, so the catalog can be used from a
+worker thread while the GUI thread searches.
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+import data_files
+
+DEFAULT_CATALOG_PATH = Path.home() / ".utm" / "catalog.sqlite"
+
+# Indexed metadata fields (column name = metadata key, see data_files)
+FIELDS = (
+    ("file_id", "TEXT"),
+    ("test_date", "TEXT"),
+    ("comment", "TEXT"),
+    ("specimen_area_mm2", "REAL"),
+    ("gauge_length_mm", "REAL"),
+    ("calibration_scale", "REAL"),
+    ("calibration_offset", "REAL"),
+    ("firmware_version", "TEXT"),
+    ("app_version", "TEXT"),
+    ("data_points", "INTEGER"),
+    ("duration_s", "REAL"),
+    ("max_load_n", "REAL"),
+    ("max_stress_mpa", "REAL"),
+    ("max_strain", "REAL"),
+)
+
+# Columns matched by search terms
+SEARCH_FIELDS = ("file_id", "comment", "test_date", "path")
+
+
+def is_test_file(name):
+    """True for file names the catalog indexes (.utm and .csv)"""
+    return name.lower().endswith((".utm", ".csv"))
+
+
+class TestCatalog:
+    """SQLite catalog of saved test runs"""
+
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            columns = ", ".join(f"{name} {kind}" for name, kind in FIELDS)
+            db.execute(f"CREATE TABLE IF NOT EXISTS runs ("
+                       f"path TEXT PRIMARY KEY, directory TEXT, size INTEGER, mtime_ns INTEGER, {columns})")
+            db.execute("CREATE INDEX IF NOT EXISTS runs_directory ON runs(directory)")
+            db.execute("CREATE INDEX IF NOT EXISTS runs_test_date ON runs(test_date)")
+            db.execute("CREATE INDEX IF NOT EXISTS runs_file_id ON runs(file_id)")
+            db.execute("CREATE TABLE IF NOT EXISTS watched_dirs (path TEXT PRIMARY KEY)")
+            # Files that are not UTM test files, so they aren't parsed again until they change
+            db.execute("CREATE TABLE IF NOT EXISTS ignored_files ("
+                       "path TEXT PRIMARY KEY, directory TEXT, size INTEGER, mtime_ns INTEGER)")
+            db.execute("CREATE INDEX IF NOT EXISTS ignored_files_directory ON ignored_files(directory)")
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed"""
+        db = sqlite3.connect(self.db_path, timeout=10)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # ----- Watched directories -----
+
+    def watched_directories(self):
+        with self._connect() as db:
+            return [row["path"] for row in db.execute("SELECT path FROM watched_dirs ORDER BY path")]
+
+    def add_watched_directory(self, directory):
+        with self._connect() as db:
+            db.execute("INSERT OR IGNORE INTO watched_dirs (path) VALUES (?)", (str(Path(directory).resolve()),))
+
+    def remove_watched_directory(self, directory):
+        with self._connect() as db:
+            db.execute("DELETE FROM watched_dirs WHERE path = ?", (str(Path(directory).resolve()),))
+
+    # ----- Indexing -----
+
+    @staticmethod
+    def _row_for(path, stat):
+        """Catalog row for one file (reads the header only), None if it isn't a UTM test file"""
+        try:
+            metadata = data_files.read_header(path)
+        except Exception:
+            return None
+        if not metadata:
+            return None  # CSV without a UTM header
+        metadata.setdefault("file_id", data_files.file_id_from_name(path.name))
+        row = {"path": str(path), "directory": str(path.parent),
+               "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        for name, _ in FIELDS:
+            row[name] = metadata.get(name)
+        return row
+
+    def _store(self, db, rows):
+        if not rows:
+            return
+        names = ["path", "directory", "size", "mtime_ns"] + [name for name, _ in FIELDS]
+        db.executemany(
+            f"INSERT OR REPLACE INTO runs ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            [tuple(row[name] for name in names) for row in rows])
+
+    def add_file(self, file_path):
+        """Index (or re-index) a single file, returns True if it was added"""
+        path = Path(file_path).resolve()
+        row = self._row_for(path, path.stat())
+        if row is None:
+            return False
+        with self._connect() as db:
+            self._store(db, [row])
+            db.execute("DELETE FROM ignored_files WHERE path = ?", (str(path),))
+        return True
+
+    def index_directory(self, directory, recursive=True, visited=None):
+        """
+        Incrementally index a directory
+
+        Only new or changed files (by size and modification time) are read, and
+        rows for files that were deleted are removed.
+
+        Args:
+            directory (str or Path): Directory to index
+            recursive (bool): Also index all subdirectories
+            visited (list): If given, every directory scanned is appended to it
+
+        Returns:
+            int: Number of files (re-)indexed
+        """
+        directory = Path(directory).resolve()
+        with self._connect() as db:
+            known = {}
+            ignored = {}
+            for table, files in (("runs", known), ("ignored_files", ignored)):
+                if recursive:
+                    rows = db.execute(
+                        f"SELECT path, size, mtime_ns FROM {table} "
+                        f"WHERE directory = ? OR substr(directory, 1, ?) = ?",
+                        (str(directory), len(str(directory)) + 1, str(directory) + os.sep))
+                else:
+                    rows = db.execute(f"SELECT path, size, mtime_ns FROM {table} WHERE directory = ?",
+                                      (str(directory),))
+                files.update((row["path"], (row["size"], row["mtime_ns"])) for row in rows)
+
+        seen = set()
+        rows = []
+        skipped = []
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            if visited is not None:
+                visited.append(str(current))
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(Path(entry.path))
+                    continue
+                if not is_test_file(entry.name):
+                    continue
+                seen.add(entry.path)
+                stat = entry.stat()
+                key = (stat.st_size, stat.st_mtime_ns)
+                if known.get(entry.path) == key or ignored.get(entry.path) == key:
+                    continue
+                row = self._row_for(Path(entry.path), stat)
+                if row is not None:
+                    rows.append(row)
+                else:
+                    skipped.append((entry.path, str(Path(entry.path).parent)) + key)
+
+        removed = [(path,) for path in known if path not in seen]
+        # Forget ignored files that were deleted or have become test files
+        unignored = [(path,) for path in ignored if path not in seen]
+        unignored += [(row["path"],) for row in rows if row["path"] in ignored]
+        with self._connect() as db:
+            self._store(db, rows)
+            db.executemany("DELETE FROM runs WHERE path = ?", removed)
+            db.executemany("DELETE FROM ignored_files WHERE path = ?", unignored)
+            db.executemany("INSERT OR REPLACE INTO ignored_files (path, directory, size, mtime_ns) "
+                           "VALUES (?, ?, ?, ?)", skipped)
+        return len(rows)
+
+    def index_watched(self, visited=None):
+        """
+        Incrementally index all watched directories
+
+        Args:
+            visited (list): If given, every directory scanned is appended to it
+
+        Returns:
+            int: Number of files (re-)indexed
+        """
+        return sum(self.index_directory(d, visited=visited)
+                   for d in self.watched_directories() if os.path.isdir(d))
+
+    # ----- Queries -----
+
+    def search(self, text="", limit=500):
+        """
+        Search runs, newest first
+
+        Every whitespace-separated term must match (case-insensitive substring)
+        one of the File ID, comment, test date or path. '%' and '_' match literally.
+
+        Returns:
+            list: sqlite3.Row objects with path and all FIELDS
+        """
+        clauses = []
+        params = []
+        for term in text.split():
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            like = f"%{escaped}%"
+            clauses.append("(" + " OR ".join(f"{field} LIKE ? ESCAPE '\\'" for field in SEARCH_FIELDS) + ")")
+            params.extend([like] * len(SEARCH_FIELDS))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as db:
+            return db.execute(f"SELECT * FROM runs {where} ORDER BY test_date DESC, path LIMIT ?",
+                              params + [limit]).fetchall()
+
+    def count(self):
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
@@ -0,0 +1,243 @@
+"""
+Test Browser for UTM Application
+
+Searchable dialog over the local test catalog plus the background indexer that
+keeps the catalog up to date with the watched directories.
+"""
+
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal, Qt
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QFileDialog)
+
+
+class CatalogIndexWorker(QThread):
+    """Worker thread that incrementally indexes the watched directories"""
+    finished_indexing = pyqtSignal(int, list)  # number of files (re-)indexed, directories scanned
+
+    def __init__(self, catalog):
+        super().__init__()
+        self.catalog = catalog
+
+    def run(self):
+        visited = []
+        try:
+            count = self.catalog.index_watched(visited)
+        except Exception:
+            count = 0
+        self.finished_indexing.emit(count, visited)
+
+
+class CatalogIndexer(QObject):
+    """
+    Watches the catalog directories and re-indexes them in the background when they change
+
+    Indexing is recursive, so the subdirectories found by each index pass are
+    watched as well (new subdirectories are picked up by the pass their
+    parent's change triggers).
+    """
+    indexed = pyqtSignal(int)  # number of files (re-)indexed by the last run
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self._worker = None
+        self._rerun = False
+        self._subdirectories = set()  # Subdirectories of the watched directories, from the last pass
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule)
+
+        # Debounce bursts of file system events (e.g. while a file is being written)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(1000)
+        self._debounce.timeout.connect(self.reindex)
+
+        self._update_watched()
+
+    def _update_watched(self):
+        """Sync the file system watcher with the catalog's watched directories"""
+        current = set(self._watcher.directories())
+        wanted = set(self.catalog.watched_directories()) | self._subdirectories
+        if current - wanted:
+            self._watcher.removePaths(list(current - wanted))
+        if wanted - current:
+            self._watcher.addPaths(list(wanted - current))
+
+    def add_directory(self, directory):
+        """Add a directory to the catalog, watch it and index it"""
+        self.catalog.add_watched_directory(directory)
+        self._update_watched()
+        self.reindex()
+
+    def add_file(self, file_path):
+        """Index a newly saved file right away and watch its directory"""
+        self.catalog.add_watched_directory(Path(file_path).parent)
+        self._update_watched()
+        self.catalog.add_file(file_path)
+        self.indexed.emit(1)
+
+    def _schedule(self, _path=None):
+        self._debounce.start()
+
+    def reindex(self):
+        """Start an incremental index run (queued if one is already running)"""
+        if self._worker is not None and self._worker.isRunning():
+            self._rerun = True
+            return
+        self._worker = CatalogIndexWorker(self.catalog)
+        self._worker.finished_indexing.connect(self._on_finished)
+        self._worker.start()
+
+    def _on_finished(self, count, visited):
+        self._subdirectories = set(visited)
+        self._update_watched()
+        self.indexed.emit(count)
+        if self._rerun:
+            self._rerun = False
+            self.reindex()
+
+    def stop(self):
+        """Stop watching and wait for a running index pass"""
+        self._debounce.stop()
+        if self._worker is not None:
+            self._worker.wait()
+
+
+class TestBrowserDialog(QDialog):
+    """Dialog for searching the test catalog and opening a run"""
+
+    # (header, catalog field, format)
+    COLUMNS = (
+        ("File ID", "file_id", "{}"),
+        ("Test Date", "test_date", "{}"),
+        ("Comment", "comment", "{}"),
+        ("Max Load (N)", "max_load_n", "{:.2f}"),
+        ("Max Stress (MPa)", "max_stress_mpa", "{:.4f}"),
+        ("Duration (s)", "duration_s", "{:.1f}"),
+        ("Points", "data_points", "{}"),
+        ("Area (mm²)", "specimen_area_mm2", "{}"),
+        ("L₀ (mm)", "gauge_length_mm", "{}"),
+        ("Firmware", "firmware_version", "{}"),
+        ("App", "app_version", "{}"),
+        ("Path", "path", "{}"),
+    )
+    MAX_RESULTS = 500
+
+    fileSelected = pyqtSignal(str)
+    compareRequested = pyqtSignal(list)
+
+    def __init__(self, catalog, indexer, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.indexer = indexer
+        self.setWindowTitle("Test Browser")
+        self.resize(1000, 500)
+
+        layout = QVBoxLayout(self)
+
+        # Search row
+        search_layout = QHBoxLayout()
+        self.searchLineEdit = QLineEdit()
+        self.searchLineEdit.setPlaceholderText("Search File ID, comment, date or path...")
+        self.searchLineEdit.setClearButtonEnabled(True)
+        search_layout.addWidget(self.searchLineEdit)
+        self.addFolderButton = QPushButton("Add Folder...")
+        search_layout.addWidget(self.addFolderButton)
+        self.rescanButton = QPushButton("Rescan")
+        search_layout.addWidget(self.rescanButton)
+        layout.addLayout(search_layout)
+
+        # Results table
+        self.resultsTable = QTableWidget(0, len(self.COLUMNS))
+        self.resultsTable.setHorizontalHeaderLabels([c[0] for c in self.COLUMNS])
+        self.resultsTable.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.resultsTable.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.resultsTable.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.resultsTable.verticalHeader().setVisible(False)
+        self.resultsTable.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.resultsTable.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.resultsTable)
+
+        # Status and open button
+        bottom_layout = QHBoxLayout()
+        self.statusLabel = QLabel()
+        bottom_layout.addWidget(self.statusLabel)
+        bottom_layout.addStretch()
+        self.compareButton = QPushButton("Compare Selected")
+        self.compareButton.setMinimumHeight(30)
+        bottom_layout.addWidget(self.compareButton)
+        self.openButton = QPushButton("Open")
+        self.openButton.setMinimumHeight(30)
+        bottom_layout.addWidget(self.openButton)
+        layout.addLayout(bottom_layout)
+
+        # Search as the user types (debounced)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.refresh)
+
+        self.searchLineEdit.textChanged.connect(self._search_timer.start)
+        self.searchLineEdit.returnPressed.connect(self._open_selected)
+        self.addFolderButton.clicked.connect(self._on_add_folder)
+        self.rescanButton.clicked.connect(self._on_rescan)
+        self.openButton.clicked.connect(self._open_selected)
+        self.compareButton.clicked.connect(self._compare_selected)
+        self.resultsTable.cellDoubleClicked.connect(self._open_selected)
+        self.indexer.indexed.connect(self._on_indexed)
+
+        self.refresh()
+
+    def refresh(self):
+        """Run the current search and fill the results table"""
+        rows = self.catalog.search(self.searchLineEdit.text(), self.MAX_RESULTS)
+
+        self.resultsTable.setUpdatesEnabled(False)
+        self.resultsTable.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (_, field, fmt) in enumerate(self.COLUMNS):
+                value = row[field]
+                text = "" if value is None else fmt.format(value)
+                item = QTableWidgetItem(text)
+                if c == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, row["path"])
+                self.resultsTable.setItem(r, c, item)
+        self.resultsTable.setUpdatesEnabled(True)
+        if rows:
+            self.resultsTable.selectRow(0)
+
+        total = self.catalog.count()
+        shown = f"{len(rows)} of {total}" if len(rows) < total else f"{total}"
+        folders = len(self.catalog.watched_directories())
+        self.statusLabel.setText(f"{shown} run(s) in {folders} folder(s)")
+
+    def _on_add_folder(self):
+        directory = QFileDialog.getExistingDirectory(self, "Add Folder to Test Catalog")
+        if directory:
+            self.statusLabel.setText("Indexing...")
+            self.indexer.add_directory(directory)
+
+    def _on_rescan(self):
+        self.statusLabel.setText("Indexing...")
+        self.indexer.reindex()
+
+    def _on_indexed(self, count):
+        self.refresh()
+
+    def _open_selected(self, *args):
+        row = self.resultsTable.currentRow()
+        if row < 0:
+            return
+        path = self.resultsTable.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        self.fileSelected.emit(path)
+        self.accept()
+
+    def _compare_selected(self):
+        rows = sorted({index.row() for index in self.resultsTable.selectionModel().selectedRows()})
+        paths = [self.resultsTable.item(row, 0).data(Qt.ItemDataRole.UserRole) for row in rows]
+        if paths:
+            self.compareRequested.emit(paths)
+            self.accept()
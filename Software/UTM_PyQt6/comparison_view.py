@@ -0,0 +1,360 @@
+"""
+Test Comparison View for UTM Application
+
+Overlays several stored tests on load-time and stress-strain axes. Files are
+loaded concurrently in the background, together with each curve's min/max
+pyramid and strain envelope, so panning and zooming only re-decimates the
+visible range and the GUI thread never runs a pass over a whole file.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QPushButton,
+                             QComboBox, QDoubleSpinBox, QLabel, QTabWidget, QFileDialog, QSplitter)
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+
+import data_files
+from decimation import MinMaxPyramid
+
+
+class ComparisonLoader(QThread):
+    """Worker thread that loads several test files concurrently (as ComparisonCurve objects)"""
+    loaded = pyqtSignal(object)  # ComparisonCurve
+    failed = pyqtSignal(str, str)  # path, error message
+
+    MAX_WORKERS = 8
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = list(paths)
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(self.paths) or 1)) as pool:
+            futures = {pool.submit(self._load, path): path for path in self.paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    curve = future.result()
+                except Exception as e:
+                    self.failed.emit(path, str(e))
+                    continue
+                self.loaded.emit(curve)
+
+    @staticmethod
+    def _load(path):
+        metadata, columns = data_files.read_data_file(path)
+        return ComparisonCurve(path, metadata, columns)
+
+
+class ComparisonCurve:
+    """
+    One overlaid test: its data, cached decimation pyramid and plot lines
+
+    Construction builds the pyramid and envelope (a pass over all samples), so
+    it is done by the loader; color and lines are set when the curve is added.
+    """
+
+    def __init__(self, path, metadata, columns):
+        self.path = path
+        self.metadata = metadata
+        self.label = data_files.file_id_from_name(Path(path).name) or Path(path).stem
+        self.color = None
+
+        self.time = np.asarray(columns["time"])
+        self.force = np.asarray(columns["force"])
+        self.strain = np.asarray(columns["strain"])
+        self.stress = np.asarray(columns["stress"])
+
+        # stress = force / area, so the force pyramid serves both plots
+        self.pyramid = MinMaxPyramid(self.force)
+
+        # Monotone envelope of strain to find the index range of a strain window
+        if len(self.strain) and self.strain[-1] < self.strain[0]:
+            self._strain_sign = -1.0
+        else:
+            self._strain_sign = 1.0
+        self.strain_envelope = np.maximum.accumulate(self._strain_sign * self.strain)
+
+        # Alignment offsets (subtracted from x)
+        self.time_offset = 0.0
+        self.strain_offset = 0.0
+
+        self.load_line = None
+        self.ss_line = None
+
+    def time_range(self, x0, x1):
+        """Index range of samples with aligned time in [x0, x1]"""
+        i0 = np.searchsorted(self.time, x0 + self.time_offset, side='left')
+        i1 = np.searchsorted(self.time, x1 + self.time_offset, side='right')
+        return max(0, i0 - 1), min(len(self.time), i1 + 1)
+
+    def strain_range(self, x0, x1):
+        """Conservative index range of samples with aligned strain in [x0, x1]"""
+        lo, hi = sorted((self._strain_sign * (x0 + self.strain_offset),
+                         self._strain_sign * (x1 + self.strain_offset)))
+        i0 = np.searchsorted(self.strain_envelope, lo, side='left')
+        i1 = np.searchsorted(self.strain_envelope, hi, side='right')
+        if i1 >= len(self.strain):
+            i1 = len(self.strain)
+        return max(0, i0 - 1), min(len(self.strain), i1 + 1)
+
+
+def compute_alignment(curves, mode, threshold):
+    """
+    Set per-curve time/strain offsets
+
+    Args:
+        curves (list): ComparisonCurve objects
+        mode (str): 'none' or 'threshold' (align at the first sample with |force| >= threshold)
+        threshold (float): Load threshold in N
+    """
+    for curve in curves:
+        if mode == 'threshold' and len(curve.force):
+            above = np.abs(curve.force) >= threshold
+            idx = int(np.argmax(above)) if above.any() else 0
+            curve.time_offset = float(curve.time[idx])
+            curve.strain_offset = float(curve.strain[idx])
+        else:
+            curve.time_offset = float(curve.time[0]) if len(curve.time) else 0.0
+            curve.strain_offset = 0.0
+
+
+class ComparisonWindow(QWidget):
+    """Window that overlays N stored tests"""
+
+    # matplotlib tab10 colors
+    COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+              '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle("Compare Tests")
+        self.resize(1100, 650)
+
+        self.curves = []
+        self._loaders = []
+        self._loading = set()  # Paths queued or being loaded
+        self._color_index = 0
+
+        layout = QHBoxLayout(self)
+        splitter = QSplitter()
+        layout.addWidget(splitter)
+
+        # Left panel: test list and alignment controls
+        panel = QWidget()
+        panel_layout = QVBoxLayout(panel)
+        panel_layout.setContentsMargins(0, 0, 0, 0)
+        self.testList = QListWidget()
+        panel_layout.addWidget(self.testList)
+
+        buttons = QHBoxLayout()
+        self.addFilesButton = QPushButton("Add Files...")
+        self.removeButton = QPushButton("Remove")
+        buttons.addWidget(self.addFilesButton)
+        buttons.addWidget(self.removeButton)
+        panel_layout.addLayout(buttons)
+
+        panel_layout.addWidget(QLabel("Align:"))
+        self.alignComboBox = QComboBox()
+        self.alignComboBox.addItem("Start of test", 'none')
+        self.alignComboBox.addItem("First load threshold", 'threshold')
+        panel_layout.addWidget(self.alignComboBox)
+
+        threshold_layout = QHBoxLayout()
+        threshold_layout.addWidget(QLabel("Threshold:"))
+        self.thresholdSpinBox = QDoubleSpinBox()
+        self.thresholdSpinBox.setRange(0.0, 100000.0)
+        self.thresholdSpinBox.setDecimals(1)
+        self.thresholdSpinBox.setValue(10.0)
+        self.thresholdSpinBox.setSuffix(" N")
+        threshold_layout.addWidget(self.thresholdSpinBox)
+        panel_layout.addLayout(threshold_layout)
+
+        self.statusLabel = QLabel("")
+        panel_layout.addWidget(self.statusLabel)
+        splitter.addWidget(panel)
+
+        # Right panel: plots
+        self.tabs = QTabWidget()
+        self.load_figure, self.load_ax, self.load_canvas = self._create_plot(
+            "Load vs Time", "Time (s)", "Force (N)")
+        self.ss_figure, self.ss_ax, self.ss_canvas = self._create_plot(
+            "Stress vs Strain", "Strain (mm/mm)", "Stress (MPa)")
+        splitter.addWidget(self.tabs)
+        splitter.setStretchFactor(1, 1)
+        splitter.setSizes([250, 850])
+
+        # Re-decimate the visible range when zooming/panning
+        self.load_ax.callbacks.connect('xlim_changed', lambda ax: self._render_load())
+        self.ss_ax.callbacks.connect('xlim_changed', lambda ax: self._render_ss())
+
+        self.addFilesButton.clicked.connect(self._on_add_files)
+        self.removeButton.clicked.connect(self._on_remove)
+        self.testList.itemChanged.connect(self._on_item_changed)
+        self.alignComboBox.currentIndexChanged.connect(self._on_alignment_changed)
+        self.thresholdSpinBox.valueChanged.connect(self._on_alignment_changed)
+
+    def _create_plot(self, title, xlabel, ylabel):
+        """Create a tab with a matplotlib canvas and navigation toolbar"""
+        figure = Figure(figsize=(8, 4), dpi=100)
+        figure.set_facecolor('#f0f0f0')
+        canvas = FigureCanvas(figure)
+        ax = figure.add_subplot(111)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+
+        tab = QWidget()
+        tab_layout = QVBoxLayout(tab)
+        tab_layout.addWidget(NavigationToolbar(canvas, tab))
+        tab_layout.addWidget(canvas)
+        self.tabs.addTab(tab, title)
+        figure.tight_layout()
+        return figure, ax, canvas
+
+    # ----- Loading -----
+
+    def add_files(self, paths):
+        """Load files in the background and add them to the comparison"""
+        existing = {curve.path for curve in self.curves} | self._loading
+        paths = list(dict.fromkeys(p for p in paths if p not in existing))
+        if not paths:
+            return
+        self._loading.update(paths)
+        self.statusLabel.setText(f"Loading {len(paths)} file(s)...")
+        loader = ComparisonLoader(paths)
+        loader.loaded.connect(self._on_loaded)
+        loader.failed.connect(self._on_failed)
+        loader.finished.connect(lambda: self._on_loader_finished(loader))
+        self._loaders.append(loader)
+        loader.start()
+
+    def _on_add_files(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Add Test Data", "",
+            "UTM Test Data (*.utm *.csv);;UTM Files (*.utm);;CSV Files (*.csv);;All Files (*)")
+        self.add_files(paths)
+
+    def _on_loaded(self, curve):
+        self._loading.discard(curve.path)
+        path = curve.path
+        color = self.COLORS[self._color_index % len(self.COLORS)]
+        self._color_index += 1
+        curve.color = color
+        compute_alignment([curve], self.alignComboBox.currentData(), self.thresholdSpinBox.value())
+        curve.load_line, = self.load_ax.plot([], [], '-', color=color, linewidth=1, label=curve.label)
+        curve.ss_line, = self.ss_ax.plot([], [], '-', color=color, linewidth=1, label=curve.label)
+        self.curves.append(curve)
+
+        item = QListWidgetItem(curve.label)
+        item.setToolTip(path)
+        item.setForeground(QColor(color))
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        item.setCheckState(Qt.CheckState.Checked)
+        item.setData(Qt.ItemDataRole.UserRole, path)
+        self.testList.addItem(item)
+
+        self._reset_view()
+
+    def _on_failed(self, path, error):
+        self._loading.discard(path)
+        self.statusLabel.setText(f"Failed: {Path(path).name}: {error}")
+
+    def _on_loader_finished(self, loader):
+        if loader in self._loaders:
+            self._loaders.remove(loader)
+        if not self._loaders:
+            self.statusLabel.setText(f"{len(self.curves)} test(s)")
+
+    # ----- Curve management -----
+
+    def _curve_for_item(self, item):
+        path = item.data(Qt.ItemDataRole.UserRole)
+        for curve in self.curves:
+            if curve.path == path:
+                return curve
+        return None
+
+    def _on_item_changed(self, item):
+        curve = self._curve_for_item(item)
+        if curve is not None:
+            visible = item.checkState() == Qt.CheckState.Checked
+            curve.load_line.set_visible(visible)
+            curve.ss_line.set_visible(visible)
+            self._update_legends()
+            self.load_canvas.draw_idle()
+            self.ss_canvas.draw_idle()
+
+    def _on_remove(self):
+        for item in self.testList.selectedItems():
+            curve = self._curve_for_item(item)
+            if curve is not None:
+                curve.load_line.remove()
+                curve.ss_line.remove()
+                self.curves.remove(curve)
+            self.testList.takeItem(self.testList.row(item))
+        self._reset_view()
+        self.statusLabel.setText(f"{len(self.curves)} test(s)")
+
+    def _on_alignment_changed(self):
+        self.thresholdSpinBox.setEnabled(self.alignComboBox.currentData() == 'threshold')
+        compute_alignment(self.curves, self.alignComboBox.currentData(), self.thresholdSpinBox.value())
+        self._reset_view()
+
+    # ----- Rendering -----
+
+    def _reset_view(self):
+        """Render all curves at full range and autoscale both plots"""
+        for ax, render in ((self.load_ax, self._render_load), (self.ss_ax, self._render_ss)):
+            render(full=True)
+            ax.relim(visible_only=True)
+            ax.autoscale_view()
+        self._update_legends()
+        for canvas in (self.load_canvas, self.ss_canvas):
+            toolbar = canvas.parent().findChild(NavigationToolbar)
+            if toolbar is not None:
+                toolbar.update()  # New home view for the toolbar
+            canvas.draw_idle()
+
+    def _update_legends(self):
+        for ax in (self.load_ax, self.ss_ax):
+            if any(curve.load_line.get_visible() for curve in self.curves):
+                ax.legend(loc='best', fontsize=8)
+            elif ax.get_legend() is not None:
+                ax.get_legend().remove()
+
+    def _render_load(self, full=False):
+        x0, x1 = self.load_ax.get_xlim()
+        n_pixels = max(100, int(self.load_ax.bbox.width))
+        for curve in self.curves:
+            if full:
+                i0, i1 = 0, len(curve.time)
+            else:
+                i0, i1 = curve.time_range(x0, x1)
+            idx = curve.pyramid.indices(i0, i1, n_pixels)
+            curve.load_line.set_data(curve.time[idx] - curve.time_offset, curve.force[idx])
+        self.load_canvas.draw_idle()
+
+    def _render_ss(self, full=False):
+        x0, x1 = self.ss_ax.get_xlim()
+        n_pixels = max(100, int(self.ss_ax.bbox.width))
+        for curve in self.curves:
+            if full:
+                i0, i1 = 0, len(curve.strain)
+            else:
+                i0, i1 = curve.strain_range(x0, x1)
+            idx = curve.pyramid.indices(i0, i1, n_pixels)
+            curve.ss_line.set_data(curve.strain[idx] - curve.strain_offset, curve.stress[idx])
+        self.ss_canvas.draw_idle()
+
+    def closeEvent(self, event):
+        for loader in list(self._loaders):
+            loader.wait()
+        event.accept()
@@ -0,0 +1,241 @@
+"""
+Test Data File Reading
+
+GUI-independent readers for exported test files (CSV with metadata header and
+native .utm). Used by the application import and by the batch analysis tools.
+
+Metadata keys are shared by both formats (see UTMApplication._export_metadata):
+test_date, duration_s, data_points, comment, calibration_scale,
+calibration_offset, specimen_area_mm2, gauge_length_mm, the break detection
+settings (break_detection_enabled, break_drop_fraction, break_drop_window_s,
+break_min_force_n, break_post_margin_s), max_load_n, max_stress_mpa,
+max_strain, the material properties (modulus_mpa, yield_strength_mpa, uts_mpa,
+uniform_elongation_pct, elongation_at_break_pct, toughness_mj_m3), break_index
+(detected break, None or absent if none), live_yield_strain and
+live_yield_stress_mpa (live detector, None or absent if none), app_version,
+firmware_version.
+"""
+
+import re
+
+import numpy as np
+
+import utm_format
+
+# CSV data columns, in file order (sample store column names)
+CSV_COLUMNS = ("time", "raw", "force", "position", "speed", "strain", "stress")
+
+# Material property header lines: line marker -> (label before the value, metadata key)
+PROPERTY_LINES = {
+    "# Modulus:": ("Modulus", "modulus_mpa"),
+    "# Yield Strength": ("Yield Strength (Rp0.2)", "yield_strength_mpa"),
+    "# UTS:": ("UTS", "uts_mpa"),
+    "# Uniform Elongation:": ("Uniform Elongation", "uniform_elongation_pct"),
+    "# Elongation at Break:": ("Elongation at Break", "elongation_at_break_pct"),
+    "# Toughness:": ("Toughness", "toughness_mj_m3"),
+}
+
+
+def file_id_from_name(name):
+    """File ID prefix of '{file_id}_UTM_Test_{timestamp}' file names ('' if none)"""
+    prefix, sep, _ = name.partition("UTM_Test_")
+    return prefix.rstrip("_") if sep else ""
+
+
+def parse_csv_header(lines):
+    """
+    Parse the '#' metadata header of an exported CSV file
+
+    Args:
+        lines (list): File lines (only the header part is read)
+
+    Returns:
+        tuple: (metadata dict, list of header comment lines, index of first data line)
+    """
+    metadata = {}
+    header_lines = []
+    data_start_line = len(lines)
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if line.startswith('#'):
+            header_lines.append(line)
+            # Parse metadata
+            if '# Comment:' in line:
+                metadata["comment"] = line.replace('# Comment:', '').strip()
+            elif '# Test Date:' in line:
+                metadata["test_date"] = line.replace('# Test Date:', '').strip()
+            elif '# Duration:' in line:
+                match = re.search(r'Duration:\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["duration_s"] = float(match.group(1))
+            elif '# Data Points:' in line:
+                match = re.search(r'Data Points:\s*(\d+)', line)
+                if match:
+                    metadata["data_points"] = int(match.group(1))
+            elif '# Calibration' in line:
+                # Parse: # Calibration - Scale: -0.0065, Offset: -24.5185
+                match = re.search(r'Scale:\s*([+-]?\d*\.?\d+),\s*Offset:\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["calibration_scale"] = float(match.group(1))
+                    metadata["calibration_offset"] = float(match.group(2))
+            elif '# Specimen' in line:
+                # Parse: # Specimen - Area: 80.0 mm², Gauge Length: 80.0 mm
+                match = re.search(r'Area:\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["specimen_area_mm2"] = float(match.group(1))
+                match = re.search(r'Gauge Length:\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["gauge_length_mm"] = float(match.group(1))
+            elif '# Break Detection' in line:
+                # Parse: # Break Detection - Enabled: yes, Drop: 50 %, Window: 0.2 s, Min Peak: 20 N, Post Margin: 1 s
+                match = re.search(r'Enabled:\s*(yes|no)', line)
+                if match:
+                    metadata["break_detection_enabled"] = match.group(1) == "yes"
+                for label, key, scale in (("Drop", "break_drop_fraction", 0.01),
+                                          ("Window", "break_drop_window_s", 1.0),
+                                          ("Min Peak", "break_min_force_n", 1.0),
+                                          ("Post Margin", "break_post_margin_s", 1.0)):
+                    match = re.search(label + r':\s*([+-]?\d*\.?\d+)', line)
+                    if match:
+                        metadata[key] = float(match.group(1)) * scale
+            elif '# Max Load:' in line:
+                match = re.search(r'Max Load:\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["max_load_n"] = float(match.group(1))
+            elif '# Max Stress:' in line:
+                match = re.search(r'Max Stress:\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["max_stress_mpa"] = float(match.group(1))
+            elif '# Max Strain:' in line:
+                match = re.search(r'Max Strain:\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["max_strain"] = float(match.group(1))
+            elif any(key in line for key in PROPERTY_LINES):
+                for key, (label, name) in PROPERTY_LINES.items():
+                    if key in line:
+                        match = re.search(re.escape(label) + r':\s*([+-]?\d*\.?\d+)', line)
+                        if match:
+                            metadata[name] = float(match.group(1))
+                        break
+            elif '# Break Index:' in line:
+                match = re.search(r'Break Index:\s*(\d+)', line)
+                if match:
+                    metadata["break_index"] = int(match.group(1))
+            elif '# Live Yield:' in line:
+                match = re.search(r'Live Yield:\s*([+-]?\d*\.?\d+) MPa at Strain\s*([+-]?\d*\.?\d+)', line)
+                if match:
+                    metadata["live_yield_stress_mpa"] = float(match.group(1))
+                    metadata["live_yield_strain"] = float(match.group(2))
+            elif '# App Version:' in line:
+                metadata["app_version"] = line.replace('# App Version:', '').strip()
+            elif '# Firmware Version:' in line:
+                metadata["firmware_version"] = line.replace('# Firmware Version:', '').strip()
+        elif line:
+            # First non-comment, non-empty line should be header
+            if 'Time_s' in line or 'Force_N' in line:
+                data_start_line = i + 1
+            else:
+                data_start_line = i
+            break
+    return metadata, header_lines, data_start_line
+
+
+def read_csv_header(file_path):
+    """Read only the metadata header of a CSV file (stops at the column header line)"""
+    lines = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            lines.append(line)
+            stripped = line.strip()
+            if stripped and not stripped.startswith('#'):
+                break
+    metadata, _, _ = parse_csv_header(lines)
+    return metadata
+
+
+def _parse_csv_rows(lines):
+    """Parse data rows, skipping malformed ones (missing trailing columns default to 0)"""
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        parts = line.split(',')
+        if len(parts) >= 3:
+            try:
+                values = [float(p) for p in parts[:7]]
+            except ValueError:
+                continue  # Skip malformed rows
+            rows.append(values + [0.0] * (7 - len(values)))
+    return np.array(rows, dtype=np.float64).reshape(-1, 7)
+
+
+def read_csv(file_path):
+    """
+    Read an exported CSV file
+
+    Returns:
+        tuple: (metadata dict, dict of column name -> contiguous array, header comment lines)
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    metadata, header_lines, data_start_line = parse_csv_header(lines)
+    data_lines = lines[data_start_line:]
+
+    # Fast path for well-formed files, lenient row-by-row parsing otherwise
+    try:
+        data = np.loadtxt(data_lines, delimiter=',', comments='#', ndmin=2, dtype=np.float64)
+        if data.shape[1] < 3:
+            raise ValueError("Too few columns")
+        if data.shape[1] < 7:
+            data = np.hstack([data, np.zeros((len(data), 7 - data.shape[1]))])
+        data = data[:, :7]
+    except ValueError:
+        data = _parse_csv_rows(data_lines)
+
+    # One contiguous array per column
+    data = data.T.copy()
+    columns = {name: data[i] for i, name in enumerate(CSV_COLUMNS)}
+    return metadata, columns, header_lines
+
+
+def read_header(file_path):
+    """Read only the metadata of a .utm or CSV file"""
+    if str(file_path).lower().endswith(".utm"):
+        metadata, _, _ = utm_format.read_utm_header(file_path)
+        return metadata
+    return read_csv_header(file_path)
+
+
+def derive_strain_stress(metadata, columns, gauge_length=None, area=None):
+    """
+    Add strain and stress columns computed from position and force
+
+    Args:
+        metadata (dict): File metadata (specimen geometry is taken from here)
+        columns (dict): Must contain 'position' and 'force'
+        gauge_length, area (float): Fallback geometry if missing from the metadata
+    """
+    gauge_length = metadata.get("gauge_length_mm") or gauge_length or 0
+    area = metadata.get("specimen_area_mm2") or area or 0
+    position = columns["position"]
+    force = columns["force"]
+    columns["strain"] = position / gauge_length if gauge_length > 0 else np.zeros_like(position)
+    columns["stress"] = force / area if area > 0 else np.zeros_like(force)
+    return columns
+
+
+def read_data_file(file_path):
+    """
+    Read a .utm or CSV test file
+
+    Returns:
+        tuple: (metadata dict, dict of column name -> array) with all CSV_COLUMNS present
+    """
+    if str(file_path).lower().endswith(".utm"):
+        metadata, columns = utm_format.open_utm(file_path)
+        return metadata, derive_strain_stress(metadata, columns)
+    metadata, columns, _ = read_csv(file_path)
+    return metadata, columns
@@ -0,0 +1,351 @@
+"""
+Plot Decimation for UTM Application
+
+Peak-preserving reduction of long sample series to roughly one min/max pair per
+screen pixel, so plots stay fast regardless of how many samples a test has.
+"""
+
+import numpy as np
+
+
+class _GrowableArray:
+    """Growable 1-D array (amortized O(1) appends)"""
+
+    def __init__(self, dtype=np.int64):
+        self.data = np.empty(0, dtype=dtype)
+        self.count = 0
+
+    def view(self):
+        return self.data[:self.count]
+
+    def write(self, offset, values):
+        """Write values at offset (count becomes offset + len(values))"""
+        end = offset + len(values)
+        if end > len(self.data):
+            grown = np.empty(max(end, 2 * len(self.data), 64), dtype=self.data.dtype)
+            grown[:self.count] = self.data[:self.count]
+            self.data = grown
+        self.data[offset:end] = values
+        self.count = end
+
+
+class MinMaxPyramid:
+    """
+    Multi-resolution min/max index pyramid over a 1-D series
+
+    Level k stores, for each block of BASE_BLOCK * FACTOR**k samples, the index
+    of the smallest and the largest value. Any index range can then be drawn
+    from the coarsest level that still has about one block per pixel, so the
+    cost of a query depends on the pixel count, not on the series length.
+    Both extremes of every block are kept, so peaks are never dropped.
+
+    The pyramid is maintained incrementally: update() only recomputes the
+    (partial) last block of each level and the blocks for new samples.
+    """
+
+    BASE_BLOCK = 8
+    FACTOR = 4
+
+    def __init__(self, values=None):
+        self.values = np.empty(0)
+        self.levels = []  # list of (block_size, min buffer, max buffer)
+        if values is not None:
+            self.update(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def update(self, values):
+        """
+        Extend the pyramid to values, which must start with the samples already indexed
+
+        Args:
+            values (np.ndarray): The whole series (e.g. the grown sample store column)
+        """
+        n_old = len(self.values)
+        self.values = values
+        n = len(values)
+        if n < n_old:
+            self.levels = []  # Series was replaced, rebuild
+            n_old = 0
+        if n == n_old or n <= self.BASE_BLOCK:
+            return
+
+        # First entry of each level that changes (the partial last block is recomputed)
+        dirty = n_old // self.BASE_BLOCK
+        src_count = n
+        src_min = src_max = None  # Level 0 is built from the sample indices
+        factor = self.BASE_BLOCK
+        block = self.BASE_BLOCK
+        k = 0
+        while True:
+            count = -(-src_count // factor)
+            if k == len(self.levels):
+                if k > 0 and src_count <= self.FACTOR:
+                    break
+                self.levels.append((block, _GrowableArray(), _GrowableArray()))
+                dirty = 0
+            _, min_buf, max_buf = self.levels[k]
+
+            s0 = dirty * factor
+            if src_min is None:
+                min_src = max_src = np.arange(s0, src_count)
+            else:
+                min_src, max_src = src_min[s0:src_count], src_max[s0:src_count]
+            new_min, new_max = self._reduce(min_src, max_src, factor)
+            min_buf.write(dirty, new_min)
+            max_buf.write(dirty, new_max)
+
+            src_min, src_max = min_buf.view(), max_buf.view()
+            src_count = count
+            dirty //= self.FACTOR
+            factor = self.FACTOR
+            block *= self.FACTOR
+            k += 1
+        del self.levels[k:]
+
+    def _reduce(self, min_idx, max_idx, factor):
+        """Combine groups of `factor` entries into one (last group padded with its last entry)"""
+        pad = -len(min_idx) % factor
+        if pad:
+            min_idx = np.concatenate([min_idx, np.repeat(min_idx[-1], pad)])
+            max_idx = np.concatenate([max_idx, np.repeat(max_idx[-1], pad)])
+        min_idx = min_idx.reshape(-1, factor)
+        max_idx = max_idx.reshape(-1, factor)
+        rows = np.arange(len(min_idx))
+        new_min = min_idx[rows, np.argmin(self.values[min_idx], axis=1)]
+        new_max = max_idx[rows, np.argmax(self.values[max_idx], axis=1)]
+        return new_min, new_max
+
+    def extent(self):
+        """(min, max) of the whole series, from the top level"""
+        if not len(self.values):
+            return 0.0, 0.0
+        if not self.levels:
+            return float(self.values.min()), float(self.values.max())
+        _, min_buf, max_buf = self.levels[-1]
+        return float(self.values[min_buf.view()].min()), float(self.values[max_buf.view()].max())
+
+    def indices(self, start, stop, n_pixels):
+        """
+        Sorted sample indices that represent values[start:stop] at the given width
+
+        Args:
+            start, stop (int): Index range
+            n_pixels (int): Target horizontal resolution
+
+        Returns:
+            np.ndarray: Indices (min and max of each block, plus both range ends)
+        """
+        n = len(self.values)
+        start = max(0, int(start))
+        stop = min(n, int(stop))
+        if stop <= start:
+            return np.empty(0, dtype=np.int64)
+        n_pixels = max(1, int(n_pixels))
+        count = stop - start
+        if count <= 2 * n_pixels or not self.levels:
+            return np.arange(start, stop)
+
+        # Coarsest level with at least one block per pixel
+        chosen = None
+        for block, min_buf, max_buf in self.levels:
+            if count // block < n_pixels:
+                break
+            chosen = (block, min_buf.view(), max_buf.view())
+        if chosen is None:
+            return np.arange(start, stop)
+
+        block, min_idx, max_idx = chosen
+        b0 = start // block
+        b1 = -(-stop // block)
+        idx = np.concatenate(([start], min_idx[b0:b1], max_idx[b0:b1], [stop - 1]))
+        idx = idx[(idx >= start) & (idx < stop)]
+        return np.unique(idx)
+
+
+class AppendDecimator:
+    """
+    Display buffer for a growing series shown at full range
+
+    Uses the pyramid level with about one to four blocks per pixel and keeps
+    the (x, y) points of all completed blocks in a persistent buffer. Each
+    frame only adds the blocks completed since the last one and rewrites the
+    points of the current partial block, so the cost depends on the number of
+    new samples, not on the test length. The buffer is rebuilt when the level
+    changes (about every 4x growth) or the pyramid is replaced.
+    """
+
+    def __init__(self):
+        self._pyramid = None
+        self._block = None
+        self._complete = 0  # Number of completed blocks in the buffer
+        self._points = 0  # Number of buffered points for the completed blocks
+        self._x = _GrowableArray(np.float64)
+        self._y = _GrowableArray(np.float64)
+
+    def update(self, pyramid, x, n_pixels):
+        """
+        Display points for the whole series
+
+        Args:
+            pyramid (MinMaxPyramid): Pyramid over the y values (up to date)
+            x (np.ndarray): x values, same length as the pyramid
+            n_pixels (int): Plot width in pixels
+
+        Returns:
+            tuple: (x, y) views of the display buffer (valid until the next update)
+        """
+        y = pyramid.values
+        n = len(y)
+        level = None
+        for entry in pyramid.levels:
+            if n // entry[0] < max(1, n_pixels // 2):
+                break
+            level = entry
+        if level is None:
+            # Few samples: draw all of them (copied, so the plot never holds a view of the series)
+            self._pyramid = None
+            self._x.write(0, x)
+            self._y.write(0, y)
+            return self._x.view(), self._y.view()
+
+        block, min_buf, max_buf = level
+        if pyramid is not self._pyramid or block != self._block:
+            self._pyramid = pyramid
+            self._block = block
+            self._complete = 0
+            self._points = 1
+            self._x.write(0, x[:1])
+            self._y.write(0, y[:1])
+
+        # Append the min/max points of newly completed blocks (in index order)
+        complete = n // block
+        if complete > self._complete:
+            idx = self._block_points(min_buf.view(), max_buf.view(), self._complete, complete)
+            self._x.write(self._points, x[idx])
+            self._y.write(self._points, y[idx])
+            self._complete = complete
+            self._points += len(idx)
+
+        # Partial last block and the newest sample (overwritten next frame)
+        idx = self._block_points(min_buf.view(), max_buf.view(), complete, min_buf.count)
+        idx = np.append(idx, n - 1)
+        self._x.write(self._points, x[idx])
+        self._y.write(self._points, y[idx])
+        return self._x.view(), self._y.view()
+
+    @staticmethod
+    def _block_points(min_idx, max_idx, b0, b1):
+        """Min and max index of blocks b0..b1, in sample order"""
+        pairs = np.stack((min_idx[b0:b1], max_idx[b0:b1]), axis=1)
+        pairs.sort(axis=1)
+        return pairs.ravel()
+
+
+class MonotoneEnvelope:
+    """
+    Running maximum of a mostly monotone series (e.g. strain), for x-range lookups
+
+    Finds the index range whose x values fall in a window by binary search.
+    The range is exact for monotone data and a superset otherwise. Decreasing
+    series (compression) are handled by negating them. Maintained
+    incrementally like MinMaxPyramid.
+    """
+
+    def __init__(self):
+        self.sign = 1.0
+        self._envelope = np.empty(0)
+        self._n = 0
+
+    def update(self, values):
+        n = len(values)
+        sign = -1.0 if n > 1 and values[-1] < values[0] else 1.0
+        if n < self._n or sign != self.sign:
+            self._n = 0  # Replaced or direction changed, rebuild
+            self.sign = sign
+        if n == self._n:
+            return
+        new = np.maximum.accumulate(sign * np.asarray(values[self._n:n], dtype=np.float64))
+        if self._n:
+            np.maximum(new, self._envelope[self._n - 1], out=new)
+        if n > len(self._envelope):
+            grown = np.empty(max(n, 2 * len(self._envelope)))
+            grown[:self._n] = self._envelope[:self._n]
+            self._envelope = grown
+        self._envelope[self._n:n] = new
+        self._n = n
+
+    def index_range(self, x0, x1):
+        """(start, stop) of the samples that can have x in [x0, x1]"""
+        envelope = self._envelope[:self._n]
+        lo, hi = sorted((self.sign * x0, self.sign * x1))
+        start = np.searchsorted(envelope, lo, side='left')
+        stop = np.searchsorted(envelope, hi, side='right')
+        return max(0, start - 1), min(self._n, stop + 1)
+
+
+def m4_indices(values, n_pixels, start=0, stop=None):
+    """
+    M4 decimation: first, last, min and max sample of each pixel column
+
+    The index range is split into n_pixels equal blocks, so for uniformly
+    sampled data each block is one pixel column of the plot. Keeping all four
+    samples per column draws the same polyline as the full data, including
+    every peak and spike.
+
+    Args:
+        values (np.ndarray): y values
+        n_pixels (int): Plot width in pixels
+        start, stop (int): Index range (default: all samples)
+
+    Returns:
+        np.ndarray: Sorted sample indices
+    """
+    stop = len(values) if stop is None else min(int(stop), len(values))
+    start = max(0, int(start))
+    count = stop - start
+    n_pixels = max(1, int(n_pixels))
+    if count <= 4 * n_pixels:
+        return np.arange(start, max(start, stop))
+
+    block = -(-count // n_pixels)  # ceil
+    n_full = count // block
+    full_stop = start + n_full * block
+    blocks = values[start:full_stop].reshape(n_full, block)
+    offsets = start + np.arange(n_full) * block
+    idx = [offsets, offsets + np.argmin(blocks, axis=1), offsets + np.argmax(blocks, axis=1), offsets + block - 1]
+    if full_stop < stop:
+        # Partial last column
+        tail = values[full_stop:stop]
+        idx.append(np.array([full_stop, full_stop + np.argmin(tail), full_stop + np.argmax(tail), stop - 1]))
+    return np.unique(np.concatenate(idx))
+
+
+def column_extrema(pyramid, n_columns):
+    """
+    Min and max of each of n_columns equal index ranges of a series
+
+    Used for sparklines (e.g. behind the crop slider, whose positions are
+    sample-index percentages). Built from the pyramid at twice the column
+    count, so the cost depends on n_columns, not on the series length. An
+    extreme close to a column border may show up in the neighbouring column.
+
+    Args:
+        pyramid (MinMaxPyramid): Pyramid of the series
+        n_columns (int): Number of columns (e.g. the widget width in pixels)
+
+    Returns:
+        tuple: (min, max) arrays, one entry per column (fewer for short series)
+    """
+    values = pyramid.values
+    n = len(values)
+    n_columns = min(max(1, int(n_columns)), n)
+    if n == 0:
+        return np.empty(0), np.empty(0)
+    idx = pyramid.indices(0, n, 2 * n_columns)
+    columns = idx * n_columns // n
+    starts = np.searchsorted(columns, np.arange(n_columns))
+    starts = np.minimum(starts, len(idx) - 1)  # A column without a sample repeats its neighbour
+    v = values[idx]
+    return np.minimum.reduceat(v, starts), np.maximum.reduceat(v, starts)
@@ -0,0 +1,240 @@
+"""
+Derived Channels for UTM Application
+
+Series computed from the recorded columns of a SampleStore (force, position,
+time) and the specimen parameters. Each channel declares the columns or other
+channels it is computed from and the parameters it depends on; values are
+computed vectorized on first use, cached, and extended incrementally as
+samples are appended. A cached series is recomputed only when the store's
+existing samples change (crop, load, clear) or one of its parameters does.
+Plots, readouts, analysis and exports all read strain and stress from here,
+so they always agree with the current specimen geometry.
+"""
+
+import numpy as np
+
+from decimation import MinMaxPyramid, MonotoneEnvelope
+from point_lookup import GridIndex
+
+# Parameters shared by the channels (specimen geometry in mm / mm², rate window in s,
+# modulus window in samples)
+DEFAULT_PARAMS = {
+    "gauge_length": 80.0,
+    "area": 80.0,
+    "rate_window": 0.5,
+    "modulus_window": 200,
+}
+
+
+def _ratio(values, divisor):
+    """values / divisor, zeros for a non-positive divisor (geometry not set)"""
+    if divisor > 0:
+        return values / divisor
+    return np.zeros(len(values))
+
+
+def _windowed_rate(time, values, start, stop, window):
+    """
+    d(values)/dt over the last `window` seconds before each sample
+
+    A backward difference over a time window instead of between neighbouring
+    samples: position is polled far less often than force is sampled, so it
+    is piecewise constant at the sample rate. Values for a sample never change
+    once later samples arrive, which keeps incremental updates exact.
+    """
+    t = time[start:stop]
+    first = np.searchsorted(time, t - window, side='left')
+    dt = t - time[first]
+    dv = values[start:stop] - values[first]
+    return np.divide(dv, dt, out=np.zeros(stop - start), where=dt > 0)
+
+
+def _windowed_slope(x, y, start, stop, window):
+    """
+    Least-squares slope of y over x for the last `window` samples up to each sample
+
+    Matches streaming_analysis.WindowedSlope, which computes the same values
+    live. Window sums come from cumulative sums over the needed samples only
+    (taken relative to the first of them to limit cancellation).
+    """
+    first = max(0, start - window + 1)
+    xs = x[first:stop] - x[first]
+    ys = y[first:stop] - y[first]
+
+    def window_sums(values):
+        c = np.concatenate(([0.0], np.cumsum(values)))
+        ends = np.arange(start - first, stop - first) + 1
+        return c[ends] - c[np.maximum(0, ends - window)]
+
+    n = np.minimum(np.arange(start, stop) + 1, window).astype(np.float64)
+    sx, sy = window_sums(xs), window_sums(ys)
+    sxx, sxy = window_sums(xs * xs), window_sums(xs * ys)
+    den = n * sxx - sx * sx
+    valid = (n >= 2) & (den > 1e-12 * n * np.abs(sxx))
+    return np.divide(n * sxy - sx * sy, den, out=np.full(stop - start, np.nan), where=valid)
+
+
+class DerivedChannel:
+    """
+    Declaration of a derived series
+
+    compute(start, stop, params, *inputs) returns the values of samples
+    start..stop-1 (an array of length stop - start). The inputs are the whole
+    series (store columns or other channels), so windowed channels can look
+    back before start.
+    """
+
+    def __init__(self, name, label, unit, inputs, params, compute):
+        self.name = name
+        self.label = label
+        self.unit = unit
+        self.inputs = inputs
+        self.params = params
+        self.compute = compute
+
+
+CHANNELS = {channel.name: channel for channel in (
+    DerivedChannel(
+        "displacement", "Displacement", "mm", ("position",), (),
+        lambda start, stop, p, position: position[start:stop]),
+    DerivedChannel(
+        "engineering_strain", "Engineering strain", "mm/mm", ("displacement",), ("gauge_length",),
+        lambda start, stop, p, displacement: _ratio(displacement[start:stop], p["gauge_length"])),
+    DerivedChannel(
+        "engineering_stress", "Engineering stress", "MPa", ("force",), ("area",),
+        lambda start, stop, p, force: _ratio(force[start:stop], p["area"])),
+    DerivedChannel(
+        "true_strain", "True strain", "mm/mm", ("engineering_strain",), (),
+        lambda start, stop, p, strain: np.log1p(np.maximum(strain[start:stop], -0.999999))),
+    DerivedChannel(
+        "true_stress", "True stress", "MPa", ("engineering_stress", "engineering_strain"), (),
+        lambda start, stop, p, stress, strain: stress[start:stop] * (1.0 + strain[start:stop])),
+    DerivedChannel(
+        "crosshead_speed", "Crosshead speed", "mm/s", ("time", "displacement"), ("rate_window",),
+        lambda start, stop, p, time, displacement:
+            _windowed_rate(time, displacement, start, stop, p["rate_window"])),
+    DerivedChannel(
+        "strain_rate", "Strain rate", "1/s", ("crosshead_speed",), ("gauge_length",),
+        lambda start, stop, p, speed: _ratio(speed[start:stop], p["gauge_length"])),
+    DerivedChannel(
+        "windowed_modulus", "Windowed modulus", "MPa", ("engineering_strain", "engineering_stress"),
+        ("modulus_window",),
+        lambda start, stop, p, strain, stress:
+            _windowed_slope(strain, stress, start, stop, int(p["modulus_window"]))),
+)}
+
+# Channels written to exports next to the recorded columns: (file/variable name, channel)
+EXPORT_CHANNELS = (
+    ("True_Strain", "true_strain"),
+    ("True_Stress_MPa", "true_stress"),
+    ("Crosshead_Speed_mm_s", "crosshead_speed"),
+    ("Strain_Rate_1_s", "strain_rate"),
+    ("Windowed_Modulus_MPa", "windowed_modulus"),
+)
+
+
+class DerivedChannels:
+    """
+    Cached derived series of one SampleStore
+
+    Usage:
+        derived = DerivedChannels(samples, gauge_length=50.0, area=20.0)
+        true_stress = derived.get("true_stress")
+    """
+
+    def __init__(self, store, **params):
+        self.store = store
+        self.params = dict(DEFAULT_PARAMS)
+        self.params.update(params)
+        self._cache = {}  # name -> (epoch, parameter values, buffer, valid count)
+        self._structures = {}  # (kind, names) -> (stamp, pyramid / envelope / grid index)
+
+    def set_params(self, **params):
+        """Change parameters (channels depending on them are recomputed on next use)"""
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise KeyError(f"Unknown derived channel parameter(s): {', '.join(sorted(unknown))}")
+        self.params.update(params)
+
+    def _param_values(self, name):
+        """Values of all parameters the channel depends on, directly or through its inputs"""
+        names = set()
+        stack = [name]
+        while stack:
+            channel = CHANNELS.get(stack.pop())
+            if channel is not None:
+                names.update(channel.params)
+                stack.extend(channel.inputs)
+        return tuple(self.params[p] for p in sorted(names))
+
+    def get(self, name):
+        """
+        All values of a derived channel (or a store column)
+
+        Returns:
+            np.ndarray: One value per sample (a view of the cache, do not modify)
+        """
+        channel = CHANNELS.get(name)
+        if channel is None:
+            return self.store.column(name)
+
+        n = len(self.store)
+        epoch = self.store.epoch
+        param_values = self._param_values(name)
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != epoch or cached[1] != param_values:
+            cached = (epoch, param_values, np.empty(0), 0)
+        _, _, buffer, count = cached
+        if count == n:
+            return buffer[:n]
+
+        inputs = [self.get(input_name) for input_name in channel.inputs]
+        if n > len(buffer):
+            grown = np.empty(max(n, 2 * len(buffer), 1024))
+            grown[:count] = buffer[:count]
+            buffer = grown
+        buffer[count:n] = channel.compute(count, n, self.params, *inputs)
+        self._cache[name] = (epoch, param_values, buffer, n)
+        return buffer[:n]
+
+    def stamp(self, *names):
+        """Value that changes whenever existing values of the named channels change"""
+        return (self.store.epoch,) + tuple(self._param_values(name) for name in names)
+
+    def _structure(self, kind, names, factory):
+        """Cached lookup structure over channels, replaced when their values change"""
+        stamp = self.stamp(*names)
+        cached = self._structures.get((kind, names))
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, factory())
+            self._structures[(kind, names)] = cached
+        return cached[1]
+
+    def pyramid(self, name):
+        """Min/max pyramid of a channel (or store column), updated incrementally"""
+        if name not in CHANNELS:
+            return self.store.pyramid(name)
+        pyramid = self._structure("pyramid", (name,), MinMaxPyramid)
+        pyramid.update(self.get(name))
+        return pyramid
+
+    def envelope(self, name):
+        """Running-max envelope of a channel (or store column), for x-range lookups"""
+        if name not in CHANNELS:
+            return self.store.envelope(name)
+        envelope = self._structure("envelope", (name,), MonotoneEnvelope)
+        envelope.update(self.get(name))
+        return envelope
+
+    def grid_index(self, x_name, y_name):
+        """Nearest-point index over two channels (or store columns)"""
+        if x_name not in CHANNELS and y_name not in CHANNELS:
+            return self.store.grid_index(x_name, y_name)
+        index = self._structure("grid", (x_name, y_name), GridIndex)
+        index.update(self.get(x_name), self.get(y_name))
+        return index
+
+    def invalidate(self):
+        """Drop all cached series"""
+        self._cache.clear()
+        self._structures.clear()
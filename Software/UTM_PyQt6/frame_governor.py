@@ -0,0 +1,102 @@
+"""
+Frame Rate Governor for UTM Application
+
+Adapts the live plot frame rate and drawing density to what the machine can
+afford, so a slow PC or a long test never starves the serial handling and the
+controls of GUI-thread time.
+"""
+
+
+class FrameGovernor:
+    """
+    Chooses the live plot timer interval and decimation density
+
+    Every rendered frame reports how long it took. The interval between frames
+    is kept so that rendering uses at most CPU_BUDGET of the GUI thread, but is
+    never shorter than the user's max fps, and is stretched while the event
+    loop lags behind the timer (e.g. during serial bursts). If even MIN_FPS
+    would exceed the budget, the density (points per pixel column) is lowered
+    instead, and raised again once frames are cheap enough.
+    """
+
+    CPU_BUDGET = 0.3  # Fraction of the GUI thread available for plot rendering
+    MIN_FPS = 4.0
+    MIN_DENSITY = 0.25
+    SMOOTHING = 0.2  # Weight of the newest measurement in the running averages
+
+    def __init__(self, max_fps=30.0):
+        self.max_fps = max_fps
+        self.density = 1.0  # Multiplier for the plot width passed to decimation
+        self.render_time = 0.0  # Average seconds per rendered frame
+        self.lag = 0.0  # Average seconds the timer fired late
+        self.fps = 0.0  # Measured rendered frames per second
+        self._interval = 1.0 / max_fps
+        self._last_tick = None
+        self._last_frame = None
+
+    @property
+    def interval_ms(self):
+        """Timer interval to use for the next frame"""
+        return max(1, int(round(self._interval * 1000)))
+
+    @property
+    def render_ms(self):
+        return self.render_time * 1000
+
+    def set_max_fps(self, max_fps):
+        """Set the user's frame rate limit (the next frames adapt from there)"""
+        self.max_fps = max(1.0, float(max_fps))
+        self._interval = 1.0 / self.max_fps
+
+    def tick(self, now):
+        """
+        Record a timer tick and measure how late it fired
+
+        Args:
+            now (float): time.perf_counter() at the start of the tick
+        """
+        if self._last_tick is not None:
+            late = max(0.0, now - self._last_tick - self._interval)
+            self.lag += self.SMOOTHING * (late - self.lag)
+        self._last_tick = now
+
+    def frame_rendered(self, now, seconds):
+        """
+        Record a rendered frame and adapt the interval and density
+
+        Args:
+            now (float): time.perf_counter() at the start of the frame
+            seconds (float): Time spent rendering the frame
+        """
+        if self._last_frame is None:
+            self.render_time = seconds
+        else:
+            self.render_time += self.SMOOTHING * (seconds - self.render_time)
+            period = now - self._last_frame
+            if period > 0:
+                rate = 1.0 / period
+                self.fps = rate if not self.fps else self.fps + self.SMOOTHING * (rate - self.fps)
+        self._last_frame = now
+
+        min_interval = 1.0 / self.max_fps
+        max_interval = max(min_interval, 1.0 / self.MIN_FPS)
+        interval = max(min_interval, self.render_time / self.CPU_BUDGET + self.lag)
+        if interval > max_interval:
+            # Even the slowest frame rate is over budget: draw fewer points per frame
+            self.density = max(self.MIN_DENSITY, self.density * 0.8)
+            interval = max_interval
+        elif self.density < 1.0 and self.render_time / self.density < 0.8 * self.CPU_BUDGET * max_interval:
+            # Full density would fit the budget again
+            self.density = min(1.0, self.density * 1.25)
+        self._interval = interval
+
+    def idle(self, now):
+        """True if no frame was rendered in the last second (nothing changed on screen)"""
+        return self._last_frame is None or now - self._last_frame > 1.0
+
+    def reset(self):
+        """Forget the timing history (e.g. after rendering was paused)"""
+        self._last_tick = None
+        self._last_frame = None
+        self.fps = 0.0
+        self.lag = 0.0
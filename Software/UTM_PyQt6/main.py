@@ -9,26 +9,49 @@ APPLICATION VERSION - UPDATE ON EVERY COMMIT!
 ============================================
 """
 
-__version__ = "0.5.3"
+__version__ = "0.27.13"
 
 
+import logging
+import multiprocessing
 import sys
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QProgressDialog, QVBoxLayout, QFileDialog
-from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QProgressDialog, QVBoxLayout, QFileDialog, QLabel, QToolTip
+from PyQt6.QtCore import QTimer, QEvent
+from PyQt6.QtGui import QCursor
 from PyQt6 import uic
 from serial_manager import SerialManager
-from widgets import FluentSwitch, SpeedGauge, RangeSlider
+from widgets import FluentSwitch, SpeedGauge, RangeSlider, OverviewStrip
+from sample_store import SampleStore, abs_max
+from readouts import ReadoutModel
+from derived_channels import DerivedChannels, EXPORT_CHANNELS
+from material_properties import material_properties, summary_text, RESULT_KEYS
+from streaming_analysis import WindowedSlope, OffsetYieldDetector, BreakDetector
+import utm_format
+import data_files
+from catalog import TestCatalog
+from catalog_browser import CatalogIndexer, TestBrowserDialog
+from comparison_view import ComparisonWindow
+from mat_export import MatExportWorker
+from plot_export import PlotImageRenderer, PLOT_KINDS, IMAGE_FORMATS
+from decimation import m4_indices, AppendDecimator, column_extrema
+from frame_governor import FrameGovernor
+from point_lookup import nearest_sorted_index
 from datetime import datetime
+import numpy as np
 
-# Matplotlib imports for embedding plots
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
+# Live plot backends (pyqtgraph or matplotlib)
+from plot_backends import create_live_plot, default_backend
 
 # Path to the UI file
 UI_FILE = Path(__file__).parent / "ui" / "utm_mainwindow.ui"
 
+# Rotating console log (enabled with the 'Log to file' checkbox)
+CONSOLE_LOG_PATH = Path.home() / ".utm" / "console.log"
+
 
 class UTMApplication(QMainWindow):
     """Main application window for UTM control"""
@@ -42,6 +65,9 @@ class UTMApplication(QMainWindow):
         # Set window title with version
         self.setWindowTitle(f"UTM Control v{__version__}")
 
+        # Console message batching (before anything is logged)
+        self._setup_console()
+
         # Apply custom styles
         self.apply_styles()
 
@@ -98,6 +124,9 @@ class UTMApplication(QMainWindow):
         # Replace speed gauge placeholder with actual SpeedGauge widget
         self._setup_speed_gauge()
 
+        # Add the test browser button next to Open/Save Data
+        self._setup_browse_button()
+
     def _replace_checkbox_with_switch_horizontal(self, checkbox_name, switch_name, layout_name):
         """Helper to replace a checkbox with FluentSwitch in a horizontal layout"""
         checkbox = getattr(self, checkbox_name, None)
@@ -180,34 +209,26 @@ class UTMApplication(QMainWindow):
                 layout.insertWidget(i, self.speedGauge)
                 break
 
+    def _setup_browse_button(self):
+        """Add the 'Browse Tests' and 'Export Plot Image' buttons to the data buttons row"""
+        from PyQt6.QtWidgets import QPushButton
+
+        self.browseTestsButton = QPushButton("Browse Tests")
+        self.browseTestsButton.setMinimumHeight(40)
+        self.browseTestsButton.setToolTip("Search all saved test runs")
+        self.dataButtonsLayout.insertWidget(0, self.browseTestsButton)
+
+        # Export the current plot as an image (after Save Data)
+        self.exportPlotButton = QPushButton("Export Plot Image")
+        self.exportPlotButton.setMinimumHeight(40)
+        self.exportPlotButton.setToolTip("Save the load or stress-strain plot as a high-resolution PNG, SVG or PDF")
+        self.dataButtonsLayout.addWidget(self.exportPlotButton)
+
     def _setup_load_plot(self):
-        """Setup the matplotlib canvas for the load plot"""
-        # Create the matplotlib figure and canvas
-        self.load_figure = Figure(figsize=(8, 4), dpi=100)
-        self.load_figure.set_facecolor('#f0f0f0')
-        self.load_canvas = FigureCanvas(self.load_figure)
-
-        # Create the axes
-        self.load_ax = self.load_figure.add_subplot(111)
-        self.load_ax.set_xlabel('Time')
-        self.load_ax.set_ylabel('Force (N)')
-        self.load_ax.set_title('Load vs Time')
-        self.load_ax.grid(True, alpha=0.3)
-
-        # Create the line object (empty initially)
-        self.load_line, = self.load_ax.plot([], [], 'b-', linewidth=1)
-        self.load_markers, = self.load_ax.plot([], [], 'b.', markersize=3)
-
-        # Create crop selection markers (vertical lines and shaded region)
-        self.crop_line_low = self.load_ax.axvline(x=0, color='red', linestyle='--', linewidth=1.5, visible=False)
-        self.crop_line_high = self.load_ax.axvline(x=0, color='red', linestyle='--', linewidth=1.5, visible=False)
-        self.crop_span = self.load_ax.axvspan(0, 1, alpha=0.2, color='yellow', visible=False)
-
-        # Format x-axis for time
-        self.load_ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-        self.load_figure.autofmt_xdate()
-
-        # Replace the placeholder with the canvas
+        """Setup the live plot widget for the load plot"""
+        self.load_plot = create_live_plot(self.PLOT_BACKEND, 'Load vs Time', 'Time', 'Force (N)', time_axis=True)
+
+        # Replace the placeholder with the plot widget
         # The placeholder is inside loadPlotFrame which has a layout
         layout = self.loadPlotFrame.layout()
         if layout is not None:
@@ -219,17 +240,42 @@ class UTMApplication(QMainWindow):
                     self.loadPlotPlaceholder.hide()
                     self.loadPlotPlaceholder.deleteLater()
                     break
-            # Add the canvas
-            layout.addWidget(self.load_canvas)
+            # Add the plot widget
+            layout.addWidget(self.load_plot.widget)
         else:
             # Create a layout if none exists
             layout = QVBoxLayout(self.loadPlotFrame)
             layout.setContentsMargins(0, 0, 0, 0)
             self.loadPlotPlaceholder.hide()
             self.loadPlotPlaceholder.deleteLater()
-            layout.addWidget(self.load_canvas)
-
-        self.load_figure.tight_layout()
+            layout.addWidget(self.load_plot.widget)
+
+        self._setup_rolling_window(layout)
+
+    def _setup_rolling_window(self, layout):
+        """Add the rolling window controls above the load plot and the overview strip below it"""
+        from PyQt6.QtWidgets import QCheckBox, QSpinBox, QHBoxLayout
+
+        controls = QHBoxLayout()
+        self.rollingWindowCheckBox = QCheckBox("Show only the last")
+        self.rollingWindowCheckBox.setToolTip("Scroll the load plot with the newest samples instead of showing the whole test")
+        controls.addWidget(self.rollingWindowCheckBox)
+        self.rollingWindowSpinBox = QSpinBox()
+        self.rollingWindowSpinBox.setRange(1, 3600)
+        self.rollingWindowSpinBox.setValue(30)
+        self.rollingWindowSpinBox.setSuffix(" s")
+        controls.addWidget(self.rollingWindowSpinBox)
+        controls.addStretch()
+        layout.insertLayout(0, controls)
+
+        # Whole test at low resolution, with the rolling window highlighted
+        self.loadOverviewStrip = OverviewStrip()
+        self.loadOverviewStrip.setToolTip("Whole test (the highlighted part is shown above)")
+        self.loadOverviewStrip.hide()
+        layout.addWidget(self.loadOverviewStrip)
+
+        self.rollingWindowCheckBox.stateChanged.connect(self._on_rolling_window_toggled)
+        self.rollingWindowSpinBox.valueChanged.connect(self._on_rolling_window_changed)
 
     def _setup_range_slider(self):
         """Setup the range slider for data cropping"""
@@ -252,29 +298,10 @@ class UTMApplication(QMainWindow):
         self.cropRangeSlider.rangeChanged.connect(self._on_crop_range_changed)
 
     def _setup_stress_strain_plot(self):
-        """Setup the matplotlib canvas for the stress-strain plot"""
-        # Create the matplotlib figure and canvas
-        self.ss_figure = Figure(figsize=(8, 4), dpi=100)
-        self.ss_figure.set_facecolor('#f0f0f0')
-        self.ss_canvas = FigureCanvas(self.ss_figure)
-
-        # Create the axes
-        self.ss_ax = self.ss_figure.add_subplot(111)
-        self.ss_ax.set_xlabel('Strain (mm/mm)')
-        self.ss_ax.set_ylabel('Stress (MPa)')
-        self.ss_ax.set_title('Stress vs Strain')
-        self.ss_ax.grid(True, alpha=0.3)
-
-        # Create the line object (empty initially)
-        self.ss_line, = self.ss_ax.plot([], [], 'b-', linewidth=1)
-        self.ss_markers, = self.ss_ax.plot([], [], 'b.', markersize=3)
-
-        # Create crop selection markers (vertical lines and shaded region)
-        self.ss_crop_line_low = self.ss_ax.axvline(x=0, color='red', linestyle='--', linewidth=1.5, visible=False)
-        self.ss_crop_line_high = self.ss_ax.axvline(x=0, color='red', linestyle='--', linewidth=1.5, visible=False)
-        self.ss_crop_span = self.ss_ax.axvspan(0, 1, alpha=0.2, color='yellow', visible=False)
-
-        # Replace the placeholder with the canvas
+        """Setup the live plot widget for the stress-strain plot"""
+        self.ss_plot = create_live_plot(self.PLOT_BACKEND, 'Stress vs Strain', 'Strain (mm/mm)', 'Stress (MPa)')
+
+        # Replace the placeholder with the plot widget
         layout = self.stressStrainPlotFrame.layout()
         if layout is not None:
             # Remove the placeholder
@@ -285,17 +312,41 @@ class UTMApplication(QMainWindow):
                     self.stressStrainPlotPlaceholder.hide()
                     self.stressStrainPlotPlaceholder.deleteLater()
                     break
-            # Add the canvas
-            layout.addWidget(self.ss_canvas)
+            # Add the plot widget
+            layout.addWidget(self.ss_plot.widget)
         else:
             # Create a layout if none exists
             layout = QVBoxLayout(self.stressStrainPlotFrame)
             layout.setContentsMargins(0, 0, 0, 0)
             self.stressStrainPlotPlaceholder.hide()
             self.stressStrainPlotPlaceholder.deleteLater()
-            layout.addWidget(self.ss_canvas)
-
-        self.ss_figure.tight_layout()
+            layout.addWidget(self.ss_plot.widget)
+
+        self.ssViewComboBox.blockSignals(True)
+        for view in self.SS_VIEWS:
+            self.ssViewComboBox.addItem(PLOT_KINDS[view][0], view)
+        self.ssViewComboBox.blockSignals(False)
+
+    def _ss_channels(self):
+        """(x channel, y channel) of the current stress-strain tab view"""
+        _, _, _, x_name, y_name = PLOT_KINDS[self.ss_view]
+        return x_name, y_name
+
+    def _on_ss_view_changed(self):
+        """Show other derived channels on the stress-strain tab"""
+        self.ss_view = self.ssViewComboBox.currentData()
+        title, xlabel, ylabel, _, _ = PLOT_KINDS[self.ss_view]
+        self.ss_plot.set_title(title)
+        self.ss_plot.set_labels(xlabel, ylabel)
+        self.ss_plot.hide_crosshair()
+        # Crop markers move to the new x channel
+        low, high = self.ssCropRangeSlider.low(), self.ssCropRangeSlider.high()
+        self._pending_crop_previews[self.ss_plot] = (low, high)
+        if self.ssAutoScaleCheckBox.isChecked():
+            self.stress_strain_plot_needs_update = True
+            self._render_frame()
+        else:
+            self.ssAutoScaleCheckBox.setChecked(True)  # Re-renders at full range
 
     def _setup_ss_range_slider(self):
         """Setup the range slider for stress-strain data cropping"""
@@ -330,51 +381,53 @@ class UTMApplication(QMainWindow):
         self.ssCropRangeSlider.rangeChanged.connect(self._on_ss_crop_range_changed)
 
     def _update_load_plot(self):
-        """Update the load plot (called by timer at 5 Hz)"""
+        """Update the load plot (called by the render timer)"""
         if not self.load_plot_needs_update:
             return
 
         self.load_plot_needs_update = False
 
-        n_points = len(self.load_plot_times)
+        n_points = len(self.samples)
         if n_points == 0:
             return
 
-        # Downsample for display if we have too many points
-        if n_points > self.LOAD_PLOT_DOWNSAMPLE_THRESHOLD:
-            # Calculate step size to get approximately DISPLAY_POINTS
-            step = max(1, n_points // self.LOAD_PLOT_DISPLAY_POINTS)
-            times = self.load_plot_times[::step]
-            forces = self.load_plot_forces[::step]
-            # Always include the last point for real-time feel
-            if self.load_plot_times[-1] not in times:
-                times = times + [self.load_plot_times[-1]]
-                forces = forces + [self.load_plot_forces[-1]]
+        times = self.samples.time
+        force_pyramid = self.samples.pyramid('force')
+        autoscale = hasattr(self, 'loadAutoScaleCheckBox') and self.loadAutoScaleCheckBox.isChecked()
+        rolling = self.rollingWindowCheckBox.isChecked()
+        if rolling:
+            # Last N seconds: a slice of the store, so a frame only touches the window
+            start, stop = self.samples.tail_range(self.rollingWindowSpinBox.value())
+            idx = self._display_indices('force', start, stop, self._plot_pixels(self.load_plot))
+            x, y = times[idx], self.samples.force[idx]
+        elif autoscale:
+            # Whole test: only the samples added since the last frame are decimated
+            x, y = self._load_display.update(force_pyramid, times, self._plot_pixels(self.load_plot))
         else:
-            times = list(self.load_plot_times)
-            forces = list(self.load_plot_forces)
-
-        # Update the line data
-        self.load_line.set_data(times, forces)
-
-        # Update markers if enabled (only show on downsampled data)
-        if hasattr(self, 'loadShowMarkersCheckBox') and self.loadShowMarkersCheckBox.isChecked():
-            self.load_markers.set_data(times, forces)
-            self.load_markers.set_visible(True)
-        else:
-            self.load_markers.set_visible(False)
-
-        # Auto-scale if enabled - use explicit axis limits for datetime x-axis
-        if hasattr(self, 'loadAutoScaleCheckBox') and self.loadAutoScaleCheckBox.isChecked():
-            # Set x-axis limits explicitly for datetime data (need at least 2 different times)
-            if len(times) > 1:
-                self.load_ax.set_xlim(times[0], times[-1])
-            # Recalculate y-axis limits
-            self.load_ax.relim()
-            self.load_ax.autoscale_view(scalex=False, scaley=True)
-
-        # Redraw the canvas
-        self.load_canvas.draw_idle()
+            # Only the visible time range (zoomed/panned), plus one sample on each side
+            x_min, x_max = self.load_plot.x_range()
+            start = max(0, int(np.searchsorted(times, x_min, side='left')) - 1)
+            stop = min(n_points, int(np.searchsorted(times, x_max, side='right')) + 1)
+            # Peak-preserving downsampling to the plot width
+            idx = self._display_indices('force', start, stop, self._plot_pixels(self.load_plot))
+            x, y = times[idx], self.samples.force[idx]
+
+        # Update the line data (and markers if enabled)
+        self.load_plot.set_time_origin(self.samples.start_time)
+        show_markers = hasattr(self, 'loadShowMarkersCheckBox') and self.loadShowMarkersCheckBox.isChecked()
+        self.load_plot.set_data(x, y, markers=show_markers)
+
+        # Auto-scale if enabled - axis bounds are kept by the pyramids, no pass over the data
+        if rolling:
+            # The decimated window keeps every block's min and max, so its extent is exact
+            window_start = max(times[0], times[-1] - self.rollingWindowSpinBox.value())
+            self.load_plot.autoscale(window_start, times[-1], float(y.min()), float(y.max()))
+            self._update_overview_strip(force_pyramid, window_start)
+        elif autoscale:
+            self.load_plot.autoscale(times[0], times[-1], *force_pyramid.extent())
+
+        # Redraw the plot
+        self.load_plot.redraw()
 
     def _update_stress_strain_plot(self):
         """Update the stress-strain plot (called by timer)"""
@@ -383,44 +436,240 @@ class UTMApplication(QMainWindow):
 
         self.stress_strain_plot_needs_update = False
 
-        n_points = len(self.stress_strain_strains)
+        n_points = len(self.samples)
         if n_points == 0:
             return
 
-        # Downsample for display if we have too many points
-        if n_points > self.LOAD_PLOT_DOWNSAMPLE_THRESHOLD:
-            # Calculate step size to get approximately DISPLAY_POINTS
-            step = max(1, n_points // self.LOAD_PLOT_DISPLAY_POINTS)
-            strains = self.stress_strain_strains[::step]
-            stresses = self.stress_strain_stresses[::step]
-            # Always include the last point for real-time feel
-            if self.stress_strain_strains[-1] not in strains:
-                strains = strains + [self.stress_strain_strains[-1]]
-                stresses = stresses + [self.stress_strain_stresses[-1]]
+        x_name, y_name = self._ss_channels()
+        x_values = self.derived.get(x_name)
+        y_pyramid = self.derived.pyramid(y_name)
+        autoscale = hasattr(self, 'ssAutoScaleCheckBox') and self.ssAutoScaleCheckBox.isChecked()
+        if autoscale:
+            # Whole test: only the samples added since the last frame are decimated
+            # (the buffer starts over when the view or the x channel's values change)
+            display_key = (self.ss_view, self.derived.stamp(x_name))
+            if display_key != self._ss_display_key:
+                self._ss_display_key = display_key
+                self._ss_display = AppendDecimator()
+            x, y = self._ss_display.update(y_pyramid, x_values, self._plot_pixels(self.ss_plot))
+        else:
+            # Only the samples that can fall in the visible x range
+            start, stop = self.derived.envelope(x_name).index_range(*self.ss_plot.x_range())
+            # Peak-preserving downsampling to the plot width
+            idx = self._display_indices(y_name, start, stop, self._plot_pixels(self.ss_plot))
+            x, y = x_values[idx], y_pyramid.values[idx]
+
+        # Update the line data (and markers if enabled)
+        show_markers = hasattr(self, 'ssShowMarkersCheckBox') and self.ssShowMarkersCheckBox.isChecked()
+        self.ss_plot.set_data(x, y, markers=show_markers)
+
+        # Auto-scale if enabled - axis bounds are kept by the pyramids, no pass over the data
+        if autoscale:
+            self.ss_plot.autoscale(*self.derived.pyramid(x_name).extent(), *y_pyramid.extent())
+
+        # Redraw the plot
+        self.ss_plot.redraw()
+
+    # ========== Render Scheduling ==========
+
+    def _window_exposed(self):
+        """False while the window is minimized, hidden or fully covered"""
+        if self.isMinimized() or not self.isVisible():
+            return False
+        handle = self.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def _plot_visible(self, plot):
+        """True if the plot is on screen (its tab is the current one and the window is exposed)"""
+        return plot.widget.isVisible() and self._window_exposed()
+
+    def _request_redraw(self, plot):
+        """Redraw a plot now if it is visible, otherwise once it becomes visible"""
+        if self._plot_visible(plot):
+            plot.redraw()
         else:
-            strains = list(self.stress_strain_strains)
-            stresses = list(self.stress_strain_stresses)
+            self._pending_redraws.add(plot)
+
+    def _render_frame(self):
+        """Render the visible plots that changed (hidden ones stay dirty until shown)"""
+        if not self._window_exposed():
+            return
+        start = time.perf_counter()
+        self.frame_governor.tick(start)
+        self._update_slider_envelope(self.cropRangeSlider, 'force')
+        self._update_slider_envelope(self.ssCropRangeSlider, self._ss_channels()[1])
+        self._apply_crop_previews()
+        self._update_material_properties()
+        self.readouts.flush()
+        rendered = False
+        if self.load_plot.widget.isVisible() and self.load_plot_needs_update:
+            self._update_load_plot()
+            rendered = True
+        if self.ss_plot.widget.isVisible() and self.stress_strain_plot_needs_update:
+            self._update_stress_strain_plot()
+            rendered = True
+        for plot in list(self._pending_redraws):
+            if plot.widget.isVisible():
+                self._pending_redraws.discard(plot)
+                plot.redraw()
+                rendered = True
+
+        # Adapt the frame rate and density to the measured cost
+        if rendered:
+            self.frame_governor.frame_rendered(start, time.perf_counter() - start)
+            self.load_plot_timer.setInterval(self.frame_governor.interval_ms)
+        self._update_render_stats(start)
+
+    def _update_slider_envelope(self, slider, column):
+        """Draw the channel's envelope behind a visible crop slider (recomputed on new data or resize)"""
+        if not slider.isVisible():
+            return
+        key = (self.samples.version, column, self.derived.stamp(column), slider.trackWidth())
+        if self._slider_envelope_keys.get(slider) == key:
+            return
+        self._slider_envelope_keys[slider] = key
+        if len(self.samples) == 0:
+            slider.clearEnvelope()
+            return
+        slider.setEnvelope(*column_extrema(self.derived.pyramid(column), slider.trackWidth()))
 
-        # Update the line data
-        self.ss_line.set_data(strains, stresses)
+    def _plot_pixels(self, plot):
+        """Horizontal resolution to decimate to (the plot width, scaled down by the governor when frames are too costly)"""
+        return max(1, int(plot.pixel_width() * self.frame_governor.density))
 
-        # Update markers if enabled
-        if hasattr(self, 'ssShowMarkersCheckBox') and self.ssShowMarkersCheckBox.isChecked():
-            self.ss_markers.set_data(strains, stresses)
-            self.ss_markers.set_visible(True)
+    def _update_render_stats(self, now):
+        """Show the display frame rate and render time in the status bar (twice per second)"""
+        if now - self._render_stats_time < 0.5:
+            return
+        self._render_stats_time = now
+        governor = self.frame_governor
+        if governor.idle(now):
+            text = "Display: idle"
         else:
-            self.ss_markers.set_visible(False)
+            text = f"Display: {governor.fps:.0f} fps, {governor.render_ms:.1f} ms/frame"
+            if governor.density < 1.0:
+                text += f", {governor.density:.0%} detail"
+        self.renderStatsLabel.setText(text)
+
+    def changeEvent(self, event):
+        """Pause plot rendering while minimized"""
+        if event.type() == QEvent.Type.WindowStateChange and hasattr(self, 'load_plot_timer'):
+            if self.isMinimized():
+                self.load_plot_timer.stop()
+            elif not self.load_plot_timer.isActive():
+                self.frame_governor.reset()
+                self.load_plot_timer.start()
+                self._render_frame()
+        super().changeEvent(event)
+
+    def _display_indices(self, column, start, stop, n_pixels):
+        """
+        Sample indices to draw for column[start:stop] at the given plot width
 
-        # Auto-scale if enabled
-        if hasattr(self, 'ssAutoScaleCheckBox') and self.ssAutoScaleCheckBox.isChecked():
-            if len(strains) > 1 and min(strains) != max(strains):
-                self.ss_ax.set_xlim(min(strains), max(strains))
-            # Recalculate y-axis limits
-            self.ss_ax.relim()
-            self.ss_ax.autoscale_view(scalex=False, scaley=True)
+        column is a sample store column or a derived channel.
+        The indices come from the column's min/max pyramid (O(pixels), whatever
+        the test length) and are then reduced to at most first/last/min/max per
+        pixel column (M4), so peaks always show up on the plot. Results are
+        cached per data version and view.
+        """
+        key = (self.samples.version, self.derived.stamp(column), len(self.samples), start, stop, n_pixels)
+        cached = self._display_index_cache.get(column)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        pyramid = self.derived.pyramid(column)
+        values = pyramid.values
+        idx = pyramid.indices(start, stop, n_pixels)
+        idx = idx[m4_indices(values[idx], n_pixels)]
+        self._display_index_cache[column] = (key, idx)
+        return idx
+
+    def _on_load_plot_view_changed(self):
+        """User zoomed/panned the load plot: stop following the data and redraw the visible range"""
+        if self.rollingWindowCheckBox.isChecked():
+            self.rollingWindowCheckBox.blockSignals(True)
+            self.rollingWindowCheckBox.setChecked(False)
+            self.rollingWindowCheckBox.blockSignals(False)
+            self.loadOverviewStrip.hide()
+        self.loadAutoScaleCheckBox.blockSignals(True)
+        self.loadAutoScaleCheckBox.setChecked(False)
+        self.loadAutoScaleCheckBox.blockSignals(False)
+        self.load_plot_needs_update = True
+        self._update_load_plot()
 
-        # Redraw the canvas
-        self.ss_canvas.draw_idle()
+    def _on_ss_plot_view_changed(self):
+        """User zoomed/panned the stress-strain plot: stop following the data and redraw the visible range"""
+        self.ssAutoScaleCheckBox.blockSignals(True)
+        self.ssAutoScaleCheckBox.setChecked(False)
+        self.ssAutoScaleCheckBox.blockSignals(False)
+        self.stress_strain_plot_needs_update = True
+        self._update_stress_strain_plot()
+
+    def _update_overview_strip(self, force_pyramid, window_start):
+        """Draw the whole test in the overview strip (only the new samples are decimated)"""
+        times = self.samples.time
+        x, y = self._overview_display.update(force_pyramid, times, self.loadOverviewStrip.width())
+        self.loadOverviewStrip.setData(x, y, (times[0], times[-1]), force_pyramid.extent())
+        self.loadOverviewStrip.setWindow(window_start, times[-1])
+
+    def _on_rolling_window_toggled(self):
+        """Switch the load plot between the whole test and the last N seconds"""
+        rolling = self.rollingWindowCheckBox.isChecked()
+        self.loadOverviewStrip.setVisible(rolling)
+        if not rolling and not self.loadAutoScaleCheckBox.isChecked():
+            # Back to the whole test
+            self.loadAutoScaleCheckBox.setChecked(True)  # Re-renders
+            return
+        self.load_plot_needs_update = True
+        self._update_load_plot()
+
+    def _on_rolling_window_changed(self):
+        if self.rollingWindowCheckBox.isChecked():
+            self.load_plot_needs_update = True
+            self._update_load_plot()
+
+    def _on_plot_hover(self, plot, hover):
+        """Put the crosshair on the sample nearest to the mouse and show its values in a tooltip"""
+        index = None
+        if hover is not None and len(self.samples):
+            x, y, x_scale, y_scale = hover
+            if plot is self.load_plot:
+                # Time is monotone: binary search
+                index = nearest_sorted_index(self.samples.time, x)
+            else:
+                # Stress-strain can fold back: grid index, nearest in screen distance
+                x_name, y_name = self._ss_channels()
+                index = self.derived.grid_index(x_name, y_name).nearest(
+                    self.derived.get(x_name), self.derived.get(y_name), x, y, x_scale, y_scale,
+                    self.HOVER_RADIUS_PX)
+
+        if index is None:
+            if plot.crosshair_visible:
+                plot.hide_crosshair()
+                self._request_redraw(plot)
+                QToolTip.hideText()
+            return
+
+        if plot is self.load_plot:
+            plot.show_crosshair(self.samples.time[index], self.samples.force[index])
+        else:
+            x_name, y_name = self._ss_channels()
+            plot.show_crosshair(self.derived.get(x_name)[index], self.derived.get(y_name)[index])
+        self._request_redraw(plot)
+        QToolTip.showText(QCursor.pos(), (
+            f"Time: {self.samples.time[index]:.3f} s\n"
+            f"Force: {self.samples.force[index]:.2f} N\n"
+            f"Position: {self.samples.position[index]:.3f} mm\n"
+            f"Stress: {self.derived.get('engineering_stress')[index]:.4f} MPa\n"
+            f"Strain: {self.derived.get('engineering_strain')[index]:.6f}"
+        ), plot.widget)
+
+    def _on_load_autoscale_toggled(self):
+        self.load_plot_needs_update = True
+        self._update_load_plot()
+
+    def _on_ss_autoscale_toggled(self):
+        self.stress_strain_plot_needs_update = True
+        self._update_stress_strain_plot()
 
     def connect_signals(self):
         """Connect UI signals to their respective slot functions"""
@@ -443,6 +692,12 @@ class UTMApplication(QMainWindow):
         # Show Markers checkboxes - trigger plot redraw when toggled
         self.ssShowMarkersCheckBox.stateChanged.connect(self._update_stress_strain_plot)
         self.loadShowMarkersCheckBox.stateChanged.connect(self._update_load_plot)
+        self.loadAutoScaleCheckBox.stateChanged.connect(self._on_load_autoscale_toggled)
+
+        # Plots on a newly shown tab are rendered right away
+        self.tabWidget.currentChanged.connect(lambda index: self._render_frame())
+        self.ssAutoScaleCheckBox.stateChanged.connect(self._on_ss_autoscale_toggled)
+        self.ssViewComboBox.currentIndexChanged.connect(self._on_ss_view_changed)
 
         # Load Plot tab controls
         self.clearLoadPlotButton.clicked.connect(self.on_clear_load_plot)
@@ -486,13 +741,21 @@ class UTMApplication(QMainWindow):
         self.moveUpButton.clicked.connect(self.on_move_up)
         self.moveDownButton.clicked.connect(self.on_move_down)
 
+        # Right panel - Break detection settings
+        self.breakDetectionCheckBox.toggled.connect(self.on_break_settings_changed)
+        for spin_box in (self.breakDropSpinBox, self.breakWindowSpinBox,
+                         self.breakMinForceSpinBox, self.breakMarginSpinBox):
+            spin_box.valueChanged.connect(self.on_break_settings_changed)
+
         # Right panel - Data export/import
         self.saveDataButton.clicked.connect(self.on_save_data)
         self.openDataButton.clicked.connect(self.on_open_data)
+        self.browseTestsButton.clicked.connect(self.on_browse_tests)
+        self.exportPlotButton.clicked.connect(self.on_export_plot_image)
 
     def init_state(self):
         """Initialize application state variables"""
-        from PyQt6.QtCore import QTimer
+        from PyQt6.QtCore import QTimer, QEvent
 
         # Serial communication
         self.serial_manager = SerialManager()
@@ -502,11 +765,15 @@ class UTMApplication(QMainWindow):
         # Connect serial manager signals
         self.serial_manager.connection_changed.connect(self.on_connection_state_changed)
         self.serial_manager.data_received.connect(self.on_serial_data_received)
+        # Position/velocity lines are shown by their own handlers (if enabled), never as raw lines
+        self.serial_manager.set_subscriptions((SerialManager.STATUS, SerialManager.ECHO,
+                                               SerialManager.LOAD, SerialManager.UNKNOWN))
         self.serial_manager.load_cell_data.connect(self.on_load_cell_data)
         self.serial_manager.position_data.connect(self.on_motor_position_data)
         self.serial_manager.velocity_data.connect(self.on_motor_velocity_data)
         self.serial_manager.firmware_version.connect(self.on_firmware_version)
         self.serial_manager.error_occurred.connect(self.on_serial_error)
+        self.serial_manager.break_detected.connect(self.on_break_detected)
 
         # Data storage
         self.current_load = 0.0
@@ -514,28 +781,60 @@ class UTMApplication(QMainWindow):
         self.cross_sectional_area = 80.0  # mm²
         self.gauge_length = 80.0  # mm
 
-        # Load plot data - store ALL points for complete test visualization
-        self.load_plot_times = []  # All timestamps
-        self.load_plot_forces = []  # All force values (calibrated)
-        self.load_plot_raw_forces = []  # Raw ADC values for export
-        self.load_plot_positions = []  # Crosshead position (mm) for export
-        self.load_plot_speeds = []  # Crosshead speed (mm/s) for export
+        # Readout labels, updated once per display frame (see _render_frame)
+        self.readouts = ReadoutModel()
+        self.readouts.bind('current_load', self.currentLoadValue, "{:.2f}")
+        self.readouts.bind('max_load', self.maxLoadValue, "{:.2f}")
+        self.readouts.bind('max_stress', self.maxStressValue, "{:.4f}")
+        self.readouts.bind('max_strain', self.maxStrainValue, "{:.6f}")
+        self.readouts.bind('points', self.currentPointsValue)
+        self.readouts.bind('points', self.ssCurrentPointsValue)
+        self.readouts.bind('displacement', self.displacementLabel, "δ = {:.4f} mm")
+        self.readouts.bind('material_properties', self.materialPropertiesLabel)
+        self.readouts.bind('live_modulus', self.liveModulusValue,
+                           lambda v: f"{v / 1000:.2f} GPa" if np.isfinite(v) else "–")
+        self.readouts.bind('live_yield', self.liveYieldValue,
+                           lambda v: f"{v:.1f} MPa" if np.isfinite(v) else "–")
+        self._properties_key = None  # Crop range, data epoch and specimen geometry of the shown properties
+        self._properties_version = None
+        self._properties_time = 0.0
+
+        # Test data - store ALL points for complete test visualization
+        # Columns: time (elapsed s), raw ADC, force (N), position (mm) and speed (mm/s)
+        self.samples = SampleStore()
+        # Engineering/true stress and strain, crosshead speed and strain rate, computed on demand
+        # (the only source of geometry-dependent values: plots, readouts, analysis and exports)
+        self.derived = DerivedChannels(self.samples, gauge_length=self.gauge_length,
+                                       area=self.cross_sectional_area)
         self.load_plot_needs_update = False  # Flag to trigger plot redraw
+
+        # Live stiffness and yield, fed per sample (same window as the 'windowed_modulus' channel)
+        self.live_modulus = WindowedSlope(self.derived.params["modulus_window"])
+        self.yield_detector = OffsetYieldDetector()
         self.data_unsaved = False  # Flag to track if data needs saving
 
-        # Downsampling for display performance (plot every Nth point when > threshold)
-        self.LOAD_PLOT_DOWNSAMPLE_THRESHOLD = 1000  # Start downsampling after this many points
-        self.LOAD_PLOT_DISPLAY_POINTS = 500  # Target points to display when downsampling
+        # Decimated display indices per column: {column: ((data version, points, range, width), indices)}
+        self._display_index_cache = {}
+        # Plots whose overlay changed while hidden, redrawn when shown
+        self._pending_redraws = set()
+
+        # Persistent display buffers for the full-range (auto scale) view, appended per frame
+        self._load_display = AppendDecimator()
+        self._ss_display = AppendDecimator()
+        self._ss_display_key = None  # (view, x channel stamp) the stress-strain buffer was built for
+        self._overview_display = AppendDecimator()  # Whole test in the rolling window overview strip
 
-        # Stress-strain plot data (calculated from load plot data)
-        self.stress_strain_strains = []  # Strain values (dimensionless)
-        self.stress_strain_stresses = []  # Stress values (MPa)
+        # Stress-strain tab plot (strain/stress and the other views come from self.derived)
         self.stress_strain_plot_needs_update = False  # Flag to trigger plot redraw
+        self.ss_view = "stress_strain"  # PLOT_KINDS key shown on the stress-strain tab
 
         # Max values tracking for stress-strain
         self.max_stress = 0.0  # MPa
         self.max_strain = 0.0  # dimensionless
 
+        # Plotting backend for the live plots (pyqtgraph if installed)
+        self.PLOT_BACKEND = default_backend()
+
         # Initialize the load plot and range slider
         self._setup_load_plot()
         self._setup_range_slider()
@@ -544,6 +843,14 @@ class UTMApplication(QMainWindow):
         self._setup_stress_strain_plot()
         self._setup_ss_range_slider()
 
+        # Zooming/panning a plot re-renders its visible range
+        self.load_plot.on_view_changed = self._on_load_plot_view_changed
+        self.ss_plot.on_view_changed = self._on_ss_plot_view_changed
+
+        # Hovering a plot shows the values of the nearest sample
+        self.load_plot.on_hover = lambda hover: self._on_plot_hover(self.load_plot, hover)
+        self.ss_plot.on_hover = lambda hover: self._on_plot_hover(self.ss_plot, hover)
+
         # Calibration values (synced with UI spinboxes)
         self.force_scale = self.scaleSpinBox.value()
         self.force_offset = self.offsetSpinBox.value()
@@ -579,6 +886,13 @@ class UTMApplication(QMainWindow):
         self.incremental_move_grace_period = False  # True briefly after starting incremental move
         self.movement_start_grace_period = False  # True briefly after starting movement
 
+        # Break detection (checked in the serial read handler while motors are enabled,
+        # settings synced with the Break Detection spinboxes)
+        self.break_detector = BreakDetector()
+        self._apply_break_settings()
+        self.recording_frozen = False  # True once the post-break margin has been recorded
+        self._break_freeze_time = None  # Elapsed test time at which recording freezes
+
         # Polling timers for motor data
         # Timer for position polling (always when connected)
         self.motor_position_timer = QTimer()
@@ -602,13 +916,30 @@ class UTMApplication(QMainWindow):
         self.incremental_grace_timer.setInterval(1000)  # 1 second grace period
         self.incremental_grace_timer.timeout.connect(self._end_incremental_grace_period)
 
-        # Timer for plot updates (rate controlled by displayRateSpinBox)
-        # Synced between Load Plot and Stress-Strain tabs
+        # Timer for plot updates (max rate set by displayRateSpinBox, synced between the
+        # Load Plot and Stress-Strain tabs; the governor slows it down when frames are costly)
+        self.frame_governor = FrameGovernor()
+        self._render_stats_time = 0.0
+        self._slider_envelope_keys = {}  # crop slider -> (data version, track width) of its envelope
+        self._pending_crop_previews = {}  # plot -> latest (low, high) slider range, shown on the next frame
+        self.renderStatsLabel = QLabel("Display: idle")
+        self.statusbar.addPermanentWidget(self.renderStatsLabel)
         self.load_plot_timer = QTimer()
-        self._update_display_rate()  # Set initial interval from spinbox
-        self.load_plot_timer.timeout.connect(self._update_load_plot)
-        self.load_plot_timer.timeout.connect(self._update_stress_strain_plot)
-        self.load_plot_timer.start()  # Always running, but only redraws when needed
+        self._update_display_rate()  # Set initial max frame rate from spinbox
+        self.load_plot_timer.timeout.connect(self._render_frame)
+        self.load_plot_timer.start()  # Running unless minimized, only redraws visible plots with new data
+
+        # Test catalog (index of saved runs), updated in the background
+        self.catalog = TestCatalog()
+        self.catalog_indexer = CatalogIndexer(self.catalog, self)
+        self.catalog_indexer.reindex()
+        self.comparison_window = None  # Created on first use
+        self.mat_export_worker = None
+        self._mat_export_version = None  # samples.version when the running MATLAB export started
+        self.plot_renderer = PlotImageRenderer(self)  # Off-thread plot image rendering
+        self.plot_renderer.image_ready.connect(self._on_plot_image_ready)
+        self.plot_renderer.render_failed.connect(self._on_plot_image_failed)
+        self._plot_image_requests = {}  # cache key -> file paths waiting for that image
 
         # Console initialization
         self.append_to_console("UTM Control Application Started")
@@ -647,21 +978,92 @@ class UTMApplication(QMainWindow):
 
     # ========== Console Functions ==========
 
-    def append_to_console(self, message):
-        """Append a message to the console with optional timestamp"""
-        from datetime import datetime
+    def _setup_console(self):
+        """
+        Set up batched console output
 
-        if self.timestampCheckBox.isChecked():
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            message = f"{timestamp} -> {message}"
+        Messages are queued and written to the console once per frame in a
+        single append. The console keeps at most maximumBlockCount lines (set
+        in the .ui file) and so does the queue, so a chatty device costs
+        bounded memory and layout work. The full history can go to a rotating
+        log file.
+        """
+        self._console_pending = deque(maxlen=self.consoleTextEdit.maximumBlockCount())
+        self._console_log_pending = []
+        self._console_log = None  # Logger while 'Log to file' is checked
+        self._console_second = None
+        self._console_second_text = ""
+
+        self.console_flush_timer = QTimer(self)
+        self.console_flush_timer.setSingleShot(True)
+        self.console_flush_timer.setInterval(33)  # About one batch per display frame
+        self.console_flush_timer.timeout.connect(self._flush_console)
+
+        self.logToFileCheckBox.toggled.connect(self._on_log_to_file_toggled)
+        self.tabWidget.currentChanged.connect(lambda index: self._flush_console())
+
+    def _console_timestamp(self):
+        """Current time as HH:MM:SS.mmm (the clock part is formatted once per second)"""
+        now = time.time()
+        second = int(now)
+        if second != self._console_second:
+            self._console_second = second
+            self._console_second_text = time.strftime("%H:%M:%S", time.localtime(second))
+        return f"{self._console_second_text}.{int((now - second) * 1000):03d}"
 
-        self.consoleTextEdit.append(message)
+    def append_to_console(self, message):
+        """Queue a message for the console (with optional timestamp), shown with the next batch"""
+        if self.timestampCheckBox.isChecked() or self._console_log is not None:
+            line = f"{self._console_timestamp()} -> {message}"
+            if self._console_log is not None:
+                self._console_log_pending.append(line)  # Always timestamped in the file
+            if not self.timestampCheckBox.isChecked():
+                line = message
+        else:
+            line = message
+        self._console_pending.append(line)
+        if not self.console_flush_timer.isActive():
+            self.console_flush_timer.start()
+
+    def _flush_console(self):
+        """Write the queued messages: to the log file always, to the console while it is shown"""
+        if self._console_log_pending:
+            self._console_log.info("\n".join(self._console_log_pending))
+            self._console_log_pending.clear()
+        if not self._console_pending or not self.consoleTextEdit.isVisible():
+            return  # Flushed when the console tab is shown
+
+        self.consoleTextEdit.appendPlainText("\n".join(self._console_pending))
+        self._console_pending.clear()
 
         # Auto-scroll to bottom if enabled
         if self.autoScrollCheckBox.isChecked():
             scrollbar = self.consoleTextEdit.verticalScrollBar()
             scrollbar.setValue(scrollbar.maximum())
 
+    def _on_log_to_file_toggled(self, checked):
+        """Start or stop writing the console history to the rotating log file"""
+        if checked:
+            try:
+                CONSOLE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(CONSOLE_LOG_PATH, maxBytes=5_000_000, backupCount=3, encoding='utf-8')
+            except OSError as e:
+                QMessageBox.warning(self, "Log File Error", f"Could not open the console log file:\n{e}")
+                self.logToFileCheckBox.setChecked(False)
+                return
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._console_log = logging.getLogger("utm.console")
+            self._console_log.setLevel(logging.INFO)
+            self._console_log.propagate = False
+            self._console_log.addHandler(handler)
+            self.append_to_console(f"Logging console to {CONSOLE_LOG_PATH}")
+        elif self._console_log is not None:
+            self._flush_console()
+            for handler in list(self._console_log.handlers):
+                self._console_log.removeHandler(handler)
+                handler.close()
+            self._console_log = None
+
     def set_status(self, message, is_warning=False):
         """Set the status bar message
 
@@ -700,6 +1102,7 @@ class UTMApplication(QMainWindow):
 
     def on_clear_console(self):
         """Clear the console text"""
+        self._console_pending.clear()
         self.consoleTextEdit.clear()
         self.append_to_console("Console cleared")
 
@@ -715,6 +1118,11 @@ class UTMApplication(QMainWindow):
         """Handle changes to specimen dimensions"""
         self.cross_sectional_area = self.areaSpinBox.value()
         self.gauge_length = self.gaugeLengthSpinBox.value()
+        self.derived.set_params(gauge_length=self.gauge_length, area=self.cross_sectional_area)
+        self._reset_live_analysis()
+        # Strain/stress of the recorded samples follow the new dimensions
+        self._update_max_values()
+        self.stress_strain_plot_needs_update = True
         self.append_to_console(
             f"Specimen dimensions updated: Area={self.cross_sectional_area} mm², "
             f"L₀={self.gauge_length} mm"
@@ -726,37 +1134,30 @@ class UTMApplication(QMainWindow):
         """Update plot title to show unsaved indicator"""
         base_title = "Load vs Time"
         if self.data_unsaved:
-            self.load_ax.set_title(f"{base_title} *")
+            self.load_plot.set_title(f"{base_title} *")
         else:
-            self.load_ax.set_title(base_title)
-        self.load_canvas.draw_idle()
+            self.load_plot.set_title(base_title)
+        self._request_redraw(self.load_plot)
 
     def on_clear_load_plot(self):
         """Clear the load plot data (also clears stress-strain data since they are synced)"""
-        # Clear all load plot stored data
-        self.load_plot_times.clear()
-        self.load_plot_forces.clear()
-        self.load_plot_raw_forces.clear()
-        self.load_plot_positions.clear()
-        self.load_plot_speeds.clear()
-
-        # Clear stress-strain data
-        self.stress_strain_strains.clear()
-        self.stress_strain_stresses.clear()
+        # Clear all stored data (load and stress-strain)
+        self.samples.clear()
+        self._reset_live_analysis()
+        self._reset_break_recording()
 
         # Reset max load
         self.max_load = 0.0
-        self.maxLoadValue.setText("0.00")
+        self.readouts.set('max_load', 0.0)
 
         # Reset max stress/strain
         self.max_stress = 0.0
         self.max_strain = 0.0
-        self.maxStressValue.setText("0.0000")
-        self.maxStrainValue.setText("0.000000")
+        self.readouts.set('max_stress', 0.0)
+        self.readouts.set('max_strain', 0.0)
 
         # Reset current points count (both tabs)
-        self.currentPointsValue.setText("0")
-        self.ssCurrentPointsValue.setText("0")
+        self.readouts.set('points', 0)
 
         # Reset unsaved flag and update title
         self.data_unsaved = False
@@ -772,37 +1173,22 @@ class UTMApplication(QMainWindow):
         self.ssCropRangeSlider.setRange(0, 100)
         self.ssCropRangeSlider.blockSignals(False)
 
-        # Hide load plot crop markers
-        self.crop_line_low.set_visible(False)
-        self.crop_line_high.set_visible(False)
-        self.crop_span.set_visible(False)
-
-        # Hide stress-strain crop markers
-        self.ss_crop_line_low.set_visible(False)
-        self.ss_crop_line_high.set_visible(False)
-        self.ss_crop_span.set_visible(False)
-
-        # Clear the load plot display
-        self.load_line.set_data([], [])
-        self.load_markers.set_data([], [])
-        self.load_ax.relim()
-        self.load_ax.autoscale_view()
-        self.load_canvas.draw_idle()
-
-        # Clear the stress-strain plot display
-        self.ss_line.set_data([], [])
-        self.ss_markers.set_data([], [])
-        self.ss_ax.relim()
-        self.ss_ax.autoscale_view()
-        self.ss_canvas.draw_idle()
+        # Clear the load plot display (including crop markers)
+        self._pending_crop_previews.clear()
+        self.load_plot.clear()
+        self.loadOverviewStrip.clear()
+        self._request_redraw(self.load_plot)
+
+        # Clear the stress-strain plot display (including crop markers)
+        self.ss_plot.clear()
+        self._request_redraw(self.ss_plot)
 
         self.append_to_console("Plots cleared")
 
     def _update_display_rate(self):
-        """Update the load plot timer interval from the current display rate"""
-        rate_seconds = self.displayRateSpinBox.value()
-        interval_ms = int(rate_seconds * 1000)
-        self.load_plot_timer.setInterval(interval_ms)
+        """Apply the max display rate (fps) to the frame governor and the plot timer"""
+        self.frame_governor.set_max_fps(self.displayRateSpinBox.value())
+        self.load_plot_timer.setInterval(self.frame_governor.interval_ms)
 
     def _on_display_rate_changed(self):
         """Handle display rate change from Load Plot tab - sync to Stress/Strain tab"""
@@ -821,95 +1207,42 @@ class UTMApplication(QMainWindow):
         self._update_display_rate()
 
     def _on_crop_range_changed(self, low, high):
-        """Handle range slider value changes - update crop markers on plot"""
-        n_points = len(self.load_plot_times)
-        if n_points == 0:
-            # No data - hide markers
-            self.crop_line_low.set_visible(False)
-            self.crop_line_high.set_visible(False)
-            self.crop_span.set_visible(False)
-            self.load_canvas.draw_idle()
-            return
-
-        # If at full range (0-100), hide markers
-        if low == 0 and high == 100:
-            self.crop_line_low.set_visible(False)
-            self.crop_line_high.set_visible(False)
-            self.crop_span.set_visible(False)
-            self.load_canvas.draw_idle()
-            return
-
-        # Calculate indices from percentages
-        low_idx = int((low / 100.0) * (n_points - 1))
-        high_idx = int((high / 100.0) * (n_points - 1))
-
-        # Get x positions (time values) for the markers
-        low_time = mdates.date2num(self.load_plot_times[low_idx])
-        high_time = mdates.date2num(self.load_plot_times[high_idx])
-
-        # Update vertical line positions
-        self.crop_line_low.set_xdata([low_time, low_time])
-        self.crop_line_high.set_xdata([high_time, high_time])
-
-        # Update the span (shaded region)
-        # Need to remove old span and create new one since axvspan doesn't have set_xy
-        self.crop_span.remove()
-        self.crop_span = self.load_ax.axvspan(low_time, high_time, alpha=0.2, color='yellow', visible=True)
-
-        # Show the markers
-        self.crop_line_low.set_visible(True)
-        self.crop_line_high.set_visible(True)
-
-        self.load_canvas.draw_idle()
+        """Handle range slider value changes - preview the crop on the load plot (next frame)"""
+        self._pending_crop_previews[self.load_plot] = (low, high)
 
     def _on_ss_crop_range_changed(self, low, high):
-        """Handle stress-strain range slider value changes - update crop markers on plot"""
-        n_points = len(self.stress_strain_strains)
-        if n_points == 0:
-            # No data - hide markers
-            self.ss_crop_line_low.set_visible(False)
-            self.ss_crop_line_high.set_visible(False)
-            self.ss_crop_span.set_visible(False)
-            self.ss_canvas.draw_idle()
-            return
-
-        # If at full range (0-100), hide markers
-        if low == 0 and high == 100:
-            self.ss_crop_line_low.set_visible(False)
-            self.ss_crop_line_high.set_visible(False)
-            self.ss_crop_span.set_visible(False)
-            self.ss_canvas.draw_idle()
-            return
-
-        # Calculate indices from percentages
-        low_idx = int((low / 100.0) * (n_points - 1))
-        high_idx = int((high / 100.0) * (n_points - 1))
-
-        # Get x positions (strain values) for the markers
-        low_strain = self.stress_strain_strains[low_idx]
-        high_strain = self.stress_strain_strains[high_idx]
-
-        # Update vertical line positions
-        self.ss_crop_line_low.set_xdata([low_strain, low_strain])
-        self.ss_crop_line_high.set_xdata([high_strain, high_strain])
+        """Handle stress-strain range slider value changes - preview the crop on both plots (next frame)"""
+        self._pending_crop_previews[self.ss_plot] = (low, high)
 
-        # Update the span (shaded region)
-        self.ss_crop_span.remove()
-        self.ss_crop_span = self.ss_ax.axvspan(low_strain, high_strain, alpha=0.2, color='yellow', visible=True)
+        # Keep both range sliders in sync (without a second round of signals)
+        self.cropRangeSlider.blockSignals(True)
+        self.cropRangeSlider.setRange(low, high)
+        self.cropRangeSlider.blockSignals(False)
+        self._pending_crop_previews[self.load_plot] = (low, high)
 
-        # Show the markers
-        self.ss_crop_line_low.set_visible(True)
-        self.ss_crop_line_high.set_visible(True)
+    def _apply_crop_previews(self):
+        """
+        Move the crop overlays to the latest slider ranges (called once per frame)
 
-        self.ss_canvas.draw_idle()
+        A slider drag emits many range changes per frame; only the last one is
+        shown. The overlay is moved in place, so a plot only redraws its
+        dynamic layer (in the same frame as any new data).
+        """
+        previews, self._pending_crop_previews = self._pending_crop_previews, {}
+        n_points = len(self.samples)
+        for plot, (low, high) in previews.items():
+            if n_points == 0 or (low == 0 and high == 100):
+                # No data or full range - hide markers
+                plot.hide_crop()
+            else:
+                # Calculate indices from percentages
+                low_idx = int((low / 100.0) * (n_points - 1))
+                high_idx = int((high / 100.0) * (n_points - 1))
 
-        # Keep both range sliders in sync
-        self.cropRangeSlider.blockSignals(True)
-        self.cropRangeSlider.setLow(low)
-        self.cropRangeSlider.setHigh(high)
-        self.cropRangeSlider.blockSignals(False)
-        # Update load plot crop markers
-        self._on_crop_range_changed(low, high)
+                # Marker positions: elapsed time on the load plot, the view's x channel on the stress-strain plot
+                x = self.samples.time if plot is self.load_plot else self.derived.get(self._ss_channels()[0])
+                plot.show_crop(x[low_idx], x[high_idx])
+            self._pending_redraws.add(plot)
 
     def _sync_plot_toggles(self):
         """Keep both plot toggle checkboxes in sync"""
@@ -925,7 +1258,7 @@ class UTMApplication(QMainWindow):
 
     def on_crop_data(self):
         """Crop the data to the selected range (affects both plots since data is synced)"""
-        n_points = len(self.load_plot_times)
+        n_points = len(self.samples)
         if n_points == 0:
             self.append_to_console("No data to crop")
             return
@@ -943,43 +1276,12 @@ class UTMApplication(QMainWindow):
         low_idx = int((low / 100.0) * (n_points - 1))
         high_idx = int((high / 100.0) * (n_points - 1))
 
-        # Crop the load plot data
-        self.load_plot_times = self.load_plot_times[low_idx:high_idx + 1]
-        self.load_plot_forces = self.load_plot_forces[low_idx:high_idx + 1]
-        self.load_plot_raw_forces = self.load_plot_raw_forces[low_idx:high_idx + 1]
-        self.load_plot_positions = self.load_plot_positions[low_idx:high_idx + 1]
-        self.load_plot_speeds = self.load_plot_speeds[low_idx:high_idx + 1]
-
-        # Crop the stress-strain data
-        self.stress_strain_strains = self.stress_strain_strains[low_idx:high_idx + 1]
-        self.stress_strain_stresses = self.stress_strain_stresses[low_idx:high_idx + 1]
-
-        # Recalculate max load from cropped data (by absolute value, preserving sign)
-        if self.load_plot_forces:
-            self.max_load = max(self.load_plot_forces, key=abs)
-            self.maxLoadValue.setText(f"{self.max_load:.2f}")
-        else:
-            self.max_load = 0.0
-            self.maxLoadValue.setText("0.00")
-
-        # Recalculate max stress/strain from cropped data
-        if self.stress_strain_stresses:
-            self.max_stress = max(self.stress_strain_stresses, key=abs)
-            self.maxStressValue.setText(f"{self.max_stress:.4f}")
-        else:
-            self.max_stress = 0.0
-            self.maxStressValue.setText("0.0000")
-
-        if self.stress_strain_strains:
-            self.max_strain = max(self.stress_strain_strains, key=abs)
-            self.maxStrainValue.setText(f"{self.max_strain:.6f}")
-        else:
-            self.max_strain = 0.0
-            self.maxStrainValue.setText("0.000000")
+        # Crop the data (load and stress-strain columns together)
+        self.samples.crop(low_idx, high_idx)
+        self._reset_live_analysis()
 
-        # Update current points count (both tabs)
-        self.currentPointsValue.setText(str(len(self.load_plot_forces)))
-        self.ssCurrentPointsValue.setText(str(len(self.stress_strain_stresses)))
+        # Recalculate max load/stress/strain from cropped data
+        self._update_max_values()
 
         # Reset both range sliders to full range
         self.cropRangeSlider.blockSignals(True)
@@ -990,23 +1292,75 @@ class UTMApplication(QMainWindow):
         self.ssCropRangeSlider.setRange(0, 100)
         self.ssCropRangeSlider.blockSignals(False)
 
-        # Hide the load plot crop markers
-        self.crop_line_low.set_visible(False)
-        self.crop_line_high.set_visible(False)
-        self.crop_span.set_visible(False)
-
-        # Hide the stress-strain crop markers
-        self.ss_crop_line_low.set_visible(False)
-        self.ss_crop_line_high.set_visible(False)
-        self.ss_crop_span.set_visible(False)
+        # Hide the crop markers on both plots
+        self._pending_crop_previews.clear()
+        self.load_plot.hide_crop()
+        self.ss_plot.hide_crop()
 
         # Force both plots to update
         self.load_plot_needs_update = True
         self.stress_strain_plot_needs_update = True
-        self._update_load_plot()
-        self._update_stress_strain_plot()
+        self._render_frame()
+
+        self.append_to_console(f"Data cropped: {n_points} -> {len(self.samples)} points")
+
+    def _update_max_values(self):
+        """Recalculate max load/stress/strain (by absolute value, preserving sign) and point counts"""
+        self.max_load = abs_max(self.samples.force)
+        self.max_stress = abs_max(self.derived.get("engineering_stress"))
+        self.max_strain = abs_max(self.derived.get("engineering_strain"))
+        self.readouts.set('max_load', self.max_load)
+        self.readouts.set('max_stress', self.max_stress)
+        self.readouts.set('max_strain', self.max_strain)
+
+        # Update current points count (same for both plots)
+        self.readouts.set('points', len(self.samples))
+
+    def _reset_live_analysis(self):
+        """Restart the live stiffness/yield estimators (new, cropped or rescaled data)"""
+        self.live_modulus.reset()
+        self.yield_detector.reset()
+        self.readouts.set('live_modulus', float('nan'))
+        self.readouts.set('live_yield', float('nan'))
+
+    def _reset_break_recording(self):
+        """Resume recording after a break (new or loaded data) and re-arm the detector"""
+        self.recording_frozen = False
+        self._break_freeze_time = None
+        self.break_detector.reset()
+
+    def _selected_range(self):
+        """Index range (start, stop) selected by the crop slider (all samples at full range)"""
+        n_points = len(self.samples)
+        low, high = self.cropRangeSlider.low(), self.cropRangeSlider.high()
+        if n_points == 0 or (low == 0 and high == 100):
+            return 0, n_points
+        return int((low / 100.0) * (n_points - 1)), int((high / 100.0) * (n_points - 1)) + 1
+
+    def _update_material_properties(self):
+        """
+        Show the material properties of the selected range (called once per frame)
+
+        Re-analyzed right away when the crop range, the data (load, crop, clear),
+        the detected break or the specimen geometry changes, and at most every PROPERTIES_INTERVAL
+        while samples are appended.
+        """
+        key = (self.cropRangeSlider.low(), self.cropRangeSlider.high(), self.samples.epoch,
+               self.samples.break_index, self.gauge_length, self.cross_sectional_area)
+        now = time.perf_counter()
+        if key == self._properties_key and (self._properties_version == self.samples.version
+                                            or now - self._properties_time < self.PROPERTIES_INTERVAL):
+            return
+        self._properties_key = key
+        self._properties_version = self.samples.version
+        self._properties_time = now
 
-        self.append_to_console(f"Data cropped: {n_points} -> {len(self.load_plot_times)} points")
+        start, stop = self._selected_range()
+        break_index = self.samples.break_index
+        result = material_properties(self.derived.get("engineering_strain")[start:stop],
+                                     self.derived.get("engineering_stress")[start:stop],
+                                     None if break_index is None else break_index - start)
+        self.readouts.set('material_properties', summary_text(result))
 
     def on_tare(self):
         """Zero the load cell (tare function) - adjusts offset based on recent readings"""
@@ -1196,8 +1550,8 @@ class UTMApplication(QMainWindow):
         self.append_to_console("Calibration cancelled")
 
     def update_load_display(self):
-        """Update the load value display"""
-        self.currentLoadValue.setText(f"{self.current_load:.2f}")
+        """Update the load value display (shown on the next display frame)"""
+        self.readouts.set('current_load', self.current_load)
 
     # ========== Connection Functions ==========
 
@@ -1398,6 +1752,15 @@ class UTMApplication(QMainWindow):
     MAX_RPM = 450  # Maximum allowed RPM (hardware limit)
     MAX_MM_PER_S = MAX_RPM * MM_PER_S_PER_RPM  # ~1.875 mm/s
 
+    # Stress-strain hover snaps to samples within this distance (pixels)
+    HOVER_RADIUS_PX = 40
+
+    # Material properties are re-analyzed at most this often (seconds) while samples are recorded
+    PROPERTIES_INTERVAL = 1.0
+
+    # Views selectable on the stress-strain tab (PLOT_KINDS keys)
+    SS_VIEWS = ("stress_strain", "true_stress_strain", "force_displacement", "crosshead_speed", "strain_rate")
+
     def _init_speed_controls(self):
         """Initialize speed controls with mm/s defaults"""
         # Set spinbox for mm/s mode with safety limit
@@ -1575,6 +1938,7 @@ class UTMApplication(QMainWindow):
 
             self.append_to_console("Motors ENABLED (direction set to STOP)")
             self.set_status("Motors enabled - Select direction to move")
+            self._arm_break_detection(True)
             if self.connected:
                 self.serial_manager.send_command("Enable")
                 # Start velocity polling when motors are enabled
@@ -1587,6 +1951,7 @@ class UTMApplication(QMainWindow):
 
             self.append_to_console("Motors DISABLED (stopped)")
             self.set_status("Motors disabled")
+            self._arm_break_detection(False)
             if self.connected:
                 self.serial_manager.send_command("Stop")
                 self.serial_manager.send_command("Disable")
@@ -1600,6 +1965,56 @@ class UTMApplication(QMainWindow):
         # Update direction and incremental move controls based on motor state
         self.update_controls_enabled_state()
 
+    def _apply_break_settings(self):
+        """Copy the Break Detection settings to the detector (takes effect on its next reading)"""
+        self.break_detection_enabled = self.breakDetectionCheckBox.isChecked()
+        self.break_drop_fraction = self.breakDropSpinBox.value() / 100.0  # Drop from the recent peak
+        self.break_drop_window = self.breakWindowSpinBox.value()  # Seconds within which the drop must happen
+        self.break_min_force = self.breakMinForceSpinBox.value()  # N, smaller peaks never count as a break
+        self.break_post_margin = self.breakMarginSpinBox.value()  # Seconds still recorded after the break
+        self.break_detector.drop_fraction = self.break_drop_fraction
+        self.break_detector.window = self.break_drop_window
+        self.break_detector.min_force = self.break_min_force
+
+    def on_break_settings_changed(self):
+        """Break detection settings edited (also applies to a running test)"""
+        was_enabled = self.break_detection_enabled
+        self._apply_break_settings()
+        if self.motorsSwitch.isChecked() and self.break_detection_enabled != was_enabled:
+            self._arm_break_detection(self.break_detection_enabled)
+
+    def _arm_break_detection(self, armed):
+        """Start (reset) or stop watching the load readings for a specimen break"""
+        self._apply_break_settings()
+        if armed and self.break_detection_enabled:
+            self.break_detector.reset()
+            # Readings are indexed by the store position they get if recorded
+            self.serial_manager.set_break_detector(
+                self.break_detector, lambda raw: -(raw * self.force_scale) - self.force_offset,
+                lambda: len(self.samples) if self._is_recording() else None)
+        else:
+            self.serial_manager.set_break_detector(None)
+
+    def on_break_detected(self, force):
+        """Specimen break detected while reading the load cell (Stop has already been sent)"""
+        self.append_to_console(
+            f"⚠ Break detected: {abs(force):.1f} N after peak {self.break_detector.peak_force:.1f} N "
+            f"- motors stopped")
+        self.set_status("⚠ SPECIMEN BREAK DETECTED - Motors stopped", is_warning=True)
+
+        # Reset direction to STOP
+        self.stopRadioButton.blockSignals(True)
+        self.stopRadioButton.setChecked(True)
+        self.stopRadioButton.blockSignals(False)
+        self.stall_count = 0
+
+        # Mark the last recorded sample before the drop (as evaluated by the detector)
+        # and keep recording for the post-break margin
+        break_index = self.break_detector.break_index
+        if self._is_recording() and break_index is not None and break_index < len(self.samples):
+            self.samples.break_index = break_index
+            self._break_freeze_time = float(self.samples.time[-1]) + self.break_post_margin
+
     def on_emergency_stop(self):
         """Emergency stop button pressed"""
         self.append_to_console("EMERGENCY STOP activated!")
@@ -1637,7 +2052,7 @@ class UTMApplication(QMainWindow):
         self.motor_position_zero = current_position_mm
         self.motor_displacement_mm = 0.0
         self.append_to_console(f"Motor position tared (offset: {self.motor_position_zero:.4f} mm)")
-        self.displacementLabel.setText("δ = 0.0000 mm")
+        self.readouts.set('displacement', 0.0)
 
     def on_move_up(self):
         """Move up by specified distance"""
@@ -1692,9 +2107,9 @@ class UTMApplication(QMainWindow):
     # ========== Data Export Functions ==========
 
     def on_save_data(self):
-        """Save data to CSV file with metadata header"""
+        """Save data to a native .utm file or a CSV file with metadata header"""
         # Check if there's data to save
-        if len(self.load_plot_times) == 0:
+        if len(self.samples) == 0:
             QMessageBox.warning(self, "No Data", "No data to save. Record some data first.")
             return
 
@@ -1702,251 +2117,341 @@ class UTMApplication(QMainWindow):
         timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
         file_id = self.fileIdLineEdit.text().strip()
         if file_id:
-            default_filename = f"{file_id}_UTM_Test_{timestamp_str}.csv"
+            default_filename = f"{file_id}_UTM_Test_{timestamp_str}.utm"
         else:
-            default_filename = f"UTM_Test_{timestamp_str}.csv"
+            default_filename = f"UTM_Test_{timestamp_str}.utm"
 
         # Open file dialog
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Save Test Data",
             default_filename,
-            "CSV Files (*.csv);;All Files (*)"
+            "UTM Files (*.utm);;CSV Files (*.csv);;MATLAB Files (*.mat);;All Files (*)"
         )
 
         if not file_path:
             return  # User cancelled
 
+        # Choosing the CSV/MATLAB filter switches the default .utm extension
+        if file_path.lower().endswith(".utm"):
+            if selected_filter.startswith("CSV"):
+                file_path = file_path[:-4] + ".csv"
+            elif selected_filter.startswith("MATLAB"):
+                file_path = file_path[:-4] + ".mat"
+
+        if file_path.lower().endswith(".mat"):
+            self._export_mat(file_path)
+            return
+
         try:
-            self._export_csv(file_path)
+            if file_path.lower().endswith(".csv"):
+                self._export_csv(file_path)
+            else:
+                self._export_utm(file_path)
             self.data_unsaved = False
             self._update_plot_title()
             self.append_to_console(f"Data saved to: {file_path}")
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to save data:\n{str(e)}")
             self.append_to_console(f"Export error: {str(e)}")
+            return
 
-    def _export_csv(self, file_path):
-        """Export data to CSV file with metadata header"""
-        # Calculate derived values
-        n_points = len(self.load_plot_times)
-        first_time = self.load_plot_times[0]
-        last_time = self.load_plot_times[-1]
-        duration_s = (last_time - first_time).total_seconds()
+        # Add the run to the test catalog
+        try:
+            self.catalog_indexer.add_file(file_path)
+        except Exception as e:
+            self.append_to_console(f"Catalog error: {str(e)}")
 
+    def _export_metadata(self):
+        """Collect the metadata written to the header of every export format"""
         # Calculate max stress and strain
         max_stress = self.max_load / self.cross_sectional_area if self.cross_sectional_area > 0 else 0
         # Find max strain (based on max position)
-        max_position = max(self.load_plot_positions, key=abs) if self.load_plot_positions else 0
+        max_position = abs_max(self.samples.position)
         max_strain = max_position / self.gauge_length if self.gauge_length > 0 else 0
 
+        # Material properties of the exported (whole) curve
+        properties = material_properties(self.derived.get("engineering_strain"),
+                                         self.derived.get("engineering_stress"),
+                                         self.samples.break_index)
+
         # Get comment from UI if available
         comment = ""
         if hasattr(self, 'commentLineEdit'):
             comment = self.commentLineEdit.text()
 
+        return {
+            "test_date": self.samples.start_time.strftime('%Y-%m-%d %H:%M:%S'),
+            "duration_s": self.samples.duration(),
+            "data_points": len(self.samples),
+            "comment": comment,
+            "calibration_scale": self.force_scale,
+            "calibration_offset": self.force_offset,
+            "specimen_area_mm2": self.cross_sectional_area,
+            "gauge_length_mm": self.gauge_length,
+            "break_detection_enabled": self.break_detection_enabled,
+            "break_drop_fraction": self.break_drop_fraction,
+            "break_drop_window_s": self.break_drop_window,
+            "break_min_force_n": self.break_min_force,
+            "break_post_margin_s": self.break_post_margin,
+            "max_load_n": self.max_load,
+            "max_stress_mpa": max_stress,
+            "max_strain": max_strain,
+            **{key: properties[key] for key in RESULT_KEYS},
+            "break_index": self.samples.break_index,
+            # Yield point flagged by the live detector (None if not detected)
+            "live_yield_strain": self.yield_detector.yield_strain if self.yield_detector.detected else None,
+            "live_yield_stress_mpa": self.yield_detector.yield_stress if self.yield_detector.detected else None,
+            "app_version": __version__,
+            "firmware_version": self.firmware_version,
+        }
+
+    def _export_utm(self, file_path):
+        """Export data to a native .utm file (JSON metadata + binary column blocks)"""
+        # Saving over the loaded file: stop reading it (the file is replaced, which
+        # also fails on Windows while it is mapped)
+        mapped = self.samples.mapped_file()
+        if mapped is not None and Path(file_path).exists() and Path(mapped).samefile(file_path):
+            self.samples.detach()
+        utm_format.write_utm(file_path, self._export_metadata(), {
+            "time": self.samples.time,
+            "raw": self.samples.raw,
+            "force": self.samples.force,
+            "position": self.samples.position,
+            "speed": self.samples.speed,
+        }, self._export_derived())
+
+    def _export_columns(self):
+        """All data columns for export (views of the sample store, no copy)"""
+        # Strain and stress with the current specimen dimensions (cached derived channels)
+        return {
+            "time": self.samples.time,
+            "raw": self.samples.raw,
+            "force": self.samples.force,
+            "position": self.samples.position,
+            "speed": self.samples.speed,
+            "strain": self.derived.get("engineering_strain"),
+            "stress": self.derived.get("engineering_stress"),
+        }
+
+    def _export_derived(self):
+        """Derived channels written after the data columns: file column name -> values (cached, no copy)"""
+        return {file_name: self.derived.get(name) for file_name, name in EXPORT_CHANNELS}
+
+    def _export_mat(self, file_path):
+        """Export data to a MATLAB .mat file in a background thread"""
+        if self.mat_export_worker is not None and self.mat_export_worker.isRunning():
+            QMessageBox.warning(self, "Export Busy", "A MATLAB export is already in progress.")
+            return
+
+        # Appended samples don't touch the exported views, so recording can continue
+        # (the data only counts as saved if nothing changed before the export finished)
+        self._mat_export_version = self.samples.version
+        self.mat_export_worker = MatExportWorker(file_path, self._export_metadata(), self._export_columns(),
+                                                 self._export_derived())
+        self.mat_export_worker.export_finished.connect(self._on_mat_export_finished)
+        self.mat_export_worker.export_failed.connect(self._on_mat_export_failed)
+        self.append_to_console(f"Saving MATLAB file: {file_path}...")
+        self.mat_export_worker.start()
+
+    def _on_mat_export_finished(self, file_path):
+        if self.samples.version == self._mat_export_version:
+            self.data_unsaved = False
+            self._update_plot_title()
+            self.append_to_console(f"Data saved to: {file_path}")
+        else:
+            self.append_to_console(f"Data saved to: {file_path} "
+                                   f"(data changed during the export and is still unsaved)")
+
+    def _on_mat_export_failed(self, file_path, error):
+        QMessageBox.critical(self, "Export Error", f"Failed to save data:\n{error}")
+        self.append_to_console(f"Export error: {error}")
+
+    def _export_csv(self, file_path):
+        """Export data to CSV file with metadata header"""
+        meta = self._export_metadata()
+        columns = self._export_columns()
+        derived = self._export_derived()
+        rows = np.column_stack([columns[name] for name in data_files.CSV_COLUMNS] + list(derived.values()))
+
         with open(file_path, 'w', newline='', encoding='utf-8') as f:
             # Write metadata header
             f.write("# UTM Test Data Export\n")
             f.write("# https://github.com/cenmir/UTM\n")
             f.write("#\n")
-            f.write(f"# Test Date: {first_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Duration: {duration_s:.1f} s\n")
-            f.write(f"# Data Points: {n_points}\n")
-            if comment:
-                f.write(f"# Comment: {comment}\n")
+            f.write(f"# Test Date: {meta['test_date']}\n")
+            f.write(f"# Duration: {meta['duration_s']:.1f} s\n")
+            f.write(f"# Data Points: {meta['data_points']}\n")
+            if meta['comment']:
+                f.write(f"# Comment: {meta['comment']}\n")
+            f.write("#\n")
+            f.write(f"# Calibration - Scale: {meta['calibration_scale']}, Offset: {meta['calibration_offset']}\n")
+            f.write(f"# Specimen - Area: {meta['specimen_area_mm2']} mm², Gauge Length: {meta['gauge_length_mm']} mm\n")
+            f.write(f"# Break Detection - Enabled: {'yes' if meta['break_detection_enabled'] else 'no'}, "
+                    f"Drop: {meta['break_drop_fraction'] * 100:g} %, Window: {meta['break_drop_window_s']:g} s, "
+                    f"Min Peak: {meta['break_min_force_n']:g} N, Post Margin: {meta['break_post_margin_s']:g} s\n")
             f.write("#\n")
-            f.write(f"# Calibration - Scale: {self.force_scale}, Offset: {self.force_offset}\n")
-            f.write(f"# Specimen - Area: {self.cross_sectional_area} mm², Gauge Length: {self.gauge_length} mm\n")
+            f.write(f"# Max Load: {meta['max_load_n']:.2f} N\n")
+            f.write(f"# Max Stress: {meta['max_stress_mpa']:.4f} MPa\n")
+            f.write(f"# Max Strain: {meta['max_strain']:.6f}\n")
             f.write("#\n")
-            f.write(f"# Max Load: {self.max_load:.2f} N\n")
-            f.write(f"# Max Stress: {max_stress:.4f} MPa\n")
-            f.write(f"# Max Strain: {max_strain:.6f}\n")
+            f.write(f"# Modulus: {meta['modulus_mpa']:.1f} MPa\n")
+            f.write(f"# Yield Strength (Rp0.2): {meta['yield_strength_mpa']:.2f} MPa\n")
+            f.write(f"# UTS: {meta['uts_mpa']:.2f} MPa\n")
+            f.write(f"# Uniform Elongation: {meta['uniform_elongation_pct']:.2f} %\n")
+            f.write(f"# Elongation at Break: {meta['elongation_at_break_pct']:.2f} %\n")
+            f.write(f"# Toughness: {meta['toughness_mj_m3']:.2f} MJ/m³\n")
+            if meta['break_index'] is not None:
+                f.write(f"# Break Index: {meta['break_index']}\n")
+            if meta['live_yield_stress_mpa'] is not None:
+                f.write(f"# Live Yield: {meta['live_yield_stress_mpa']:.2f} MPa at Strain {meta['live_yield_strain']:.6f}\n")
             f.write("#\n")
-            f.write(f"# App Version: {__version__}\n")
-            f.write(f"# Firmware Version: {self.firmware_version}\n")
+            f.write(f"# App Version: {meta['app_version']}\n")
+            f.write(f"# Firmware Version: {meta['firmware_version']}\n")
             f.write("#\n")
 
-            # Write data header
-            f.write("Time_s,RawADC,Force_N,Position_mm,Speed_mm_s,Strain,Stress_MPa\n")
+            # Write data header (derived channels follow the seven data columns)
+            header = ["Time_s", "RawADC", "Force_N", "Position_mm", "Speed_mm_s", "Strain", "Stress_MPa"]
+            f.write(",".join(header + list(derived)) + "\n")
 
             # Write data rows
-            for i in range(n_points):
-                elapsed_s = (self.load_plot_times[i] - first_time).total_seconds()
-                raw_adc = self.load_plot_raw_forces[i]
-                force = self.load_plot_forces[i]
-                position = self.load_plot_positions[i] if i < len(self.load_plot_positions) else 0
-                speed = self.load_plot_speeds[i] if i < len(self.load_plot_speeds) else 0
-                strain = position / self.gauge_length if self.gauge_length > 0 else 0
-                stress = force / self.cross_sectional_area if self.cross_sectional_area > 0 else 0
-
-                f.write(f"{elapsed_s:.3f},{raw_adc:.0f},{force:.4f},{position:.4f},{speed:.4f},{strain:.6f},{stress:.4f}\n")
+            np.savetxt(f, rows, delimiter=',',
+                       fmt=['%.3f', '%.0f', '%.4f', '%.4f', '%.4f', '%.6f', '%.4f'] + ['%.6g'] * len(derived))
 
     def on_open_data(self):
-        """Open and load data from a CSV file"""
+        """Open and load data from a .utm or CSV file"""
         # Open file dialog
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Open Test Data",
             "",
-            "CSV Files (*.csv);;All Files (*)"
+            "UTM Test Data (*.utm *.csv);;UTM Files (*.utm);;CSV Files (*.csv);;All Files (*)"
         )
 
         if not file_path:
             return  # User cancelled
 
+        self._open_data_file(file_path)
+
+    def on_browse_tests(self):
+        """Open the test browser and load the selected run"""
+        dialog = TestBrowserDialog(self.catalog, self.catalog_indexer, self)
+        dialog.fileSelected.connect(self._open_data_file)
+        dialog.compareRequested.connect(self.on_compare_tests)
+        dialog.exec()
+        dialog.deleteLater()
+
+    def on_compare_tests(self, paths):
+        """Overlay the given test files in the comparison window"""
+        if self.comparison_window is None:
+            self.comparison_window = ComparisonWindow(self)
+        self.comparison_window.add_files(paths)
+        self.comparison_window.show()
+        self.comparison_window.raise_()
+        self.comparison_window.activateWindow()
+
+    def _open_data_file(self, file_path):
+        """Load a .utm or CSV file, replacing the current data"""
         try:
-            self._import_csv(file_path)
+            if file_path.lower().endswith(".utm"):
+                self._import_utm(file_path)
+            else:
+                self._import_csv(file_path)
             self.append_to_console(f"Data loaded from: {file_path}")
         except Exception as e:
             QMessageBox.critical(self, "Import Error", f"Failed to load data:\n{str(e)}")
             self.append_to_console(f"Import error: {str(e)}")
 
+    def _import_utm(self, file_path):
+        """Import data from a native .utm file (memory-mapped, no parsing)"""
+        metadata, columns = utm_format.open_utm(file_path)
+
+        # Output metadata to console
+        self.append_to_console("--- Loading UTM file ---")
+        for key, value in metadata.items():
+            if key != "Columns":
+                self.append_to_console(f"# {key}: {value}")
+
+        self._load_imported_data(metadata, columns)
+
     def _import_csv(self, file_path):
         """Import data from CSV file with metadata header"""
-        import re
-
-        # Clear existing data
-        self.load_plot_times.clear()
-        self.load_plot_forces.clear()
-        self.load_plot_raw_forces.clear()
-        self.load_plot_positions.clear()
-        self.load_plot_speeds.clear()
-        self.stress_strain_strains.clear()
-        self.stress_strain_stresses.clear()
-
-        # Metadata to extract
-        comment = ""
-        calibration_scale = None
-        calibration_offset = None
-        specimen_area = None
-        gauge_length = None
+        metadata, columns, header_lines = data_files.read_csv(file_path)
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        # Parse metadata from header comments and output to console
+        # Output preamble to console
         self.append_to_console("--- Loading CSV file ---")
-        data_start_line = 0
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if line.startswith('#'):
-                # Output preamble to console
-                self.append_to_console(line)
-                # Parse metadata
-                if '# Comment:' in line:
-                    comment = line.replace('# Comment:', '').strip()
-                elif '# Calibration' in line:
-                    # Parse: # Calibration - Scale: -0.0065, Offset: -24.5185
-                    match = re.search(r'Scale:\s*([+-]?\d*\.?\d+),\s*Offset:\s*([+-]?\d*\.?\d+)', line)
-                    if match:
-                        calibration_scale = float(match.group(1))
-                        calibration_offset = float(match.group(2))
-                elif '# Specimen' in line:
-                    # Parse: # Specimen - Area: 80.0 mm², Gauge Length: 80.0 mm
-                    match = re.search(r'Area:\s*([+-]?\d*\.?\d+)', line)
-                    if match:
-                        specimen_area = float(match.group(1))
-                    match = re.search(r'Gauge Length:\s*([+-]?\d*\.?\d+)', line)
-                    if match:
-                        gauge_length = float(match.group(1))
-            elif line and not line.startswith('#'):
-                # First non-comment, non-empty line should be header
-                if 'Time_s' in line or 'Force_N' in line:
-                    data_start_line = i + 1
-                    break
-                else:
-                    data_start_line = i
-                    break
+        for line in header_lines:
+            self.append_to_console(line)
 
+        self._load_imported_data(metadata, columns)
+
+    def _load_imported_data(self, metadata, columns):
+        """Replace the current data with imported columns and apply the file metadata"""
         # Update UI with loaded metadata
+        calibration_scale = metadata.get("calibration_scale")
         if calibration_scale is not None:
             self.scaleSpinBox.blockSignals(True)
             self.scaleSpinBox.setValue(calibration_scale)
             self.scaleSpinBox.blockSignals(False)
             self.force_scale = calibration_scale
 
+        calibration_offset = metadata.get("calibration_offset")
         if calibration_offset is not None:
             self.offsetSpinBox.blockSignals(True)
             self.offsetSpinBox.setValue(calibration_offset)
             self.offsetSpinBox.blockSignals(False)
             self.force_offset = calibration_offset
 
+        specimen_area = metadata.get("specimen_area_mm2")
         if specimen_area is not None:
             self.areaSpinBox.blockSignals(True)
             self.areaSpinBox.setValue(specimen_area)
             self.areaSpinBox.blockSignals(False)
             self.cross_sectional_area = specimen_area
 
+        gauge_length = metadata.get("gauge_length_mm")
         if gauge_length is not None:
             self.gaugeLengthSpinBox.blockSignals(True)
             self.gaugeLengthSpinBox.setValue(gauge_length)
             self.gaugeLengthSpinBox.blockSignals(False)
             self.gauge_length = gauge_length
-
+        self.derived.set_params(gauge_length=self.gauge_length, area=self.cross_sectional_area)
+
+        # Break detection settings the test was recorded with
+        break_enabled = metadata.get("break_detection_enabled")
+        if break_enabled is not None:
+            self.breakDetectionCheckBox.blockSignals(True)
+            self.breakDetectionCheckBox.setChecked(bool(break_enabled))
+            self.breakDetectionCheckBox.blockSignals(False)
+        for spin_box, key, scale in ((self.breakDropSpinBox, "break_drop_fraction", 100.0),
+                                     (self.breakWindowSpinBox, "break_drop_window_s", 1.0),
+                                     (self.breakMinForceSpinBox, "break_min_force_n", 1.0),
+                                     (self.breakMarginSpinBox, "break_post_margin_s", 1.0)):
+            value = metadata.get(key)
+            if value is not None:
+                spin_box.blockSignals(True)
+                spin_box.setValue(value * scale)
+                spin_box.blockSignals(False)
+        self._apply_break_settings()
+
+        comment = metadata.get("comment")
         if comment and hasattr(self, 'commentLineEdit'):
             self.commentLineEdit.setText(comment)
 
-        # Parse data rows
-        # Use first timestamp as base time
-        base_time = datetime.now()
-
-        for line in lines[data_start_line:]:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-
-            parts = line.split(',')
-            if len(parts) >= 3:
-                try:
-                    elapsed_s = float(parts[0])
-                    raw_adc = float(parts[1]) if len(parts) > 1 else 0
-                    force = float(parts[2]) if len(parts) > 2 else 0
-                    position = float(parts[3]) if len(parts) > 3 else 0
-                    speed = float(parts[4]) if len(parts) > 4 else 0
-                    strain = float(parts[5]) if len(parts) > 5 else 0
-                    stress = float(parts[6]) if len(parts) > 6 else 0
-
-                    # Create timestamp from elapsed time
-                    from datetime import timedelta
-                    timestamp = base_time + timedelta(seconds=elapsed_s)
-
-                    self.load_plot_times.append(timestamp)
-                    self.load_plot_raw_forces.append(raw_adc)
-                    self.load_plot_forces.append(force)
-                    self.load_plot_positions.append(position)
-                    self.load_plot_speeds.append(speed)
-                    self.stress_strain_strains.append(strain)
-                    self.stress_strain_stresses.append(stress)
-                except ValueError:
-                    continue  # Skip malformed rows
-
-        # Recalculate max load
-        if self.load_plot_forces:
-            self.max_load = max(self.load_plot_forces, key=abs)
-            self.maxLoadValue.setText(f"{self.max_load:.2f}")
-        else:
-            self.max_load = 0.0
-            self.maxLoadValue.setText("0.00")
-
-        # Recalculate max stress/strain
-        if self.stress_strain_stresses:
-            self.max_stress = max(self.stress_strain_stresses, key=abs)
-            self.ssMaxStressValue.setText(f"{self.max_stress:.4f}")
-        else:
-            self.max_stress = 0.0
-            self.ssMaxStressValue.setText("0.0000")
+        # Use the recorded test date as base time (fall back to now)
+        try:
+            base_time = datetime.strptime(metadata.get("test_date", ""), '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            base_time = datetime.now()
 
-        if self.stress_strain_strains:
-            self.max_strain = max(self.stress_strain_strains, key=abs)
-            self.ssMaxStrainValue.setText(f"{self.max_strain:.6f}")
-        else:
-            self.max_strain = 0.0
-            self.ssMaxStrainValue.setText("0.000000")
+        # Replace existing data (arrays are used as-is, no copy)
+        self.samples.set_arrays(base_time, **columns)
+        self.samples.break_index = metadata.get("break_index")
+        self._reset_live_analysis()
+        self._reset_break_recording()
 
-        # Update current points count
-        self.currentPointsValue.setText(str(len(self.load_plot_forces)))
-        self.ssCurrentPointsValue.setText(str(len(self.stress_strain_stresses)))
+        # Recalculate max load/stress/strain and point counts
+        self._update_max_values()
 
         # Mark data as not unsaved (just loaded)
         self.data_unsaved = False
@@ -1963,8 +2468,80 @@ class UTMApplication(QMainWindow):
 
         # Force plot updates
         self.load_plot_needs_update = True
-        self._update_load_plot()
-        self._update_stress_strain_plot()
+        self.stress_strain_plot_needs_update = True
+        self._render_frame()
+
+    # ========== Plot Image Export ==========
+
+    def on_export_plot_image(self):
+        """Export the plot of the current tab (load plot by default) as a PNG, SVG or PDF image"""
+        if len(self.samples) == 0:
+            QMessageBox.warning(self, "No Data", "No data to export. Record some data first.")
+            return
+
+        ss_tab = self.tabWidget.currentWidget() is self.stressStrainTab
+        kind = self.ss_view if ss_tab else "load"
+        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_id = self.fileIdLineEdit.text().strip()
+        suffix = "".join(word.capitalize() for word in kind.split("_")) if ss_tab else "Load"
+        default_filename = f"{file_id}_{suffix}_{timestamp_str}.png" if file_id else f"UTM_{suffix}_{timestamp_str}.png"
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Plot Image",
+            default_filename,
+            "PNG Image (*.png);;SVG Image (*.svg);;PDF Document (*.pdf)"
+        )
+        if not file_path:
+            return  # User cancelled
+
+        # Choosing the SVG/PDF filter switches the default .png extension
+        if file_path.lower().endswith(".png"):
+            if selected_filter.startswith("SVG"):
+                file_path = file_path[:-4] + ".svg"
+            elif selected_filter.startswith("PDF"):
+                file_path = file_path[:-4] + ".pdf"
+        extension = Path(file_path).suffix.lower()
+        if extension not in IMAGE_FORMATS:
+            file_path += ".png"
+            extension = ".png"
+
+        show_markers = self.ssShowMarkersCheckBox if ss_tab else self.loadShowMarkersCheckBox
+        settings = {
+            "kind": kind,
+            "format": IMAGE_FORMATS[extension],
+            "title": f"{PLOT_KINDS[kind][0]} - {file_id}" if file_id else None,
+            "markers": show_markers.isChecked(),
+        }
+        _, _, _, x_name, y_name = PLOT_KINDS[kind]
+        key = self.plot_renderer.cache_key((self.samples.version, self.derived.stamp(x_name, y_name)), settings)
+
+        # Appended samples don't touch the store/channel views, so recording can continue while rendering
+        data = self.plot_renderer.request(key, self.derived.get(x_name), self.derived.get(y_name), settings)
+        if data is not None:
+            self._write_plot_image(file_path, data)
+            return
+        self._plot_image_requests.setdefault(key, []).append(file_path)
+        self.append_to_console(f"Rendering plot image: {file_path}...")
+
+    def _on_plot_image_ready(self, key, data):
+        for file_path in self._plot_image_requests.pop(key, []):
+            self._write_plot_image(file_path, data)
+
+    def _on_plot_image_failed(self, key, error):
+        self._plot_image_requests.pop(key, None)
+        QMessageBox.critical(self, "Export Error", f"Failed to render plot image:\n{error}")
+        self.append_to_console(f"Plot image error: {error}")
+
+    def _write_plot_image(self, file_path, data):
+        try:
+            with open(file_path, 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to save plot image:\n{e}")
+            self.append_to_console(f"Plot image error: {e}")
+            return
+        self.append_to_console(f"Plot image saved to: {file_path}")
 
     # ========== Serial Communication Signal Handlers ==========
 
@@ -1984,7 +2561,7 @@ class UTMApplication(QMainWindow):
             # Start motor position polling
             self._start_motor_polling()
             # Auto-tare position and load cell after a short delay to allow data to arrive
-            from PyQt6.QtCore import QTimer
+            from PyQt6.QtCore import QTimer, QEvent
             QTimer.singleShot(500, self._auto_tare_on_connect)
         else:
             self.update_status_lamp(False)
@@ -2007,21 +2584,20 @@ class UTMApplication(QMainWindow):
         self.update_controls_enabled_state()
 
     def on_serial_data_received(self, data):
-        """Handle raw serial data (display in console based on toggle states)"""
-        # Filter out position/velocity data based on toggle states
-        # These are parsed separately and displayed via their own handlers
-        if data.startswith("Total Angle:"):
-            # Position data - only show if position toggle is on
-            # (handled by on_motor_position_data)
-            return
-        if data.startswith("Velocity:"):
-            # Velocity data - only show if velocity toggle is on
-            # (handled by on_motor_velocity_data)
-            return
-
-        # Display other received data in console
+        """Handle raw serial data (only the subscribed line categories arrive here)"""
         self.append_to_console(f"<< {data}")
 
+    def _is_recording(self):
+        """
+        Whether load cell readings are added to the test data
+
+        Requires the load cell data stream (loadCellSwitch) and the plot checkbox
+        (loadTogglePlotCheckBox), and no recording freeze after a break.
+        """
+        load_cell_on = hasattr(self, 'loadCellSwitch') and self.loadCellSwitch.isChecked()
+        plot_enabled = hasattr(self, 'loadTogglePlotCheckBox') and self.loadTogglePlotCheckBox.isChecked()
+        return load_cell_on and plot_enabled and not self.recording_frozen
+
     def on_load_cell_data(self, raw_value):
         """Handle parsed load cell data"""
         # If calibration is active, collect raw values
@@ -2034,48 +2610,48 @@ class UTMApplication(QMainWindow):
         self.current_load = force
         self.update_load_display()
 
-        # Add to plot data if:
-        # 1. Load cell data stream is enabled (loadCellSwitch)
-        # 2. Plot checkbox is checked (loadTogglePlotCheckBox)
-        load_cell_on = hasattr(self, 'loadCellSwitch') and self.loadCellSwitch.isChecked()
-        plot_enabled = hasattr(self, 'loadTogglePlotCheckBox') and self.loadTogglePlotCheckBox.isChecked()
-
-        if load_cell_on and plot_enabled:
+        if self._is_recording():
             now = datetime.now()
-            # Store all data points
-            self.load_plot_times.append(now)
-            self.load_plot_forces.append(force)
-            self.load_plot_raw_forces.append(raw_value)
-            self.load_plot_positions.append(self.motor_displacement_mm)
             # Convert RPM to mm/s: (RPM / 60) * (5mm / 20) = RPM * 5 / 1200
             speed_mm_s = self.motor_velocity_rpm * 5.0 / 1200.0
-            self.load_plot_speeds.append(speed_mm_s)
 
-            # Calculate stress and strain for stress-strain plot
-            # Strain = displacement / gauge_length (dimensionless)
-            strain = self.motor_displacement_mm / self.gauge_length if self.gauge_length > 0 else 0
-            # Stress = force / area (N/mm² = MPa)
-            stress = force / self.cross_sectional_area if self.cross_sectional_area > 0 else 0
-
-            self.stress_strain_strains.append(strain)
-            self.stress_strain_stresses.append(stress)
+            # Store all data points
+            self.samples.append(now, raw_value, force, self.motor_displacement_mm, speed_mm_s)
+
+            # Stress and strain of the new sample (derived channels, extended incrementally)
+            strain = float(self.derived.get("engineering_strain")[-1])
+            stress = float(self.derived.get("engineering_stress")[-1])
+
+            # Freeze recording once the post-break margin has been recorded
+            if self._break_freeze_time is not None and self.samples.time[-1] >= self._break_freeze_time:
+                self.recording_frozen = True
+                self._break_freeze_time = None
+                self.append_to_console(f"Recording stopped {self.break_post_margin:.1f} s after break "
+                                       f"({len(self.samples)} points, clear to start a new test)")
+
+            # Live stiffness and yield (constant time per sample)
+            self.live_modulus.update(strain, stress)
+            fit = self.live_modulus.fit()
+            self.readouts.set('live_modulus', fit[0])
+            if self.yield_detector.update(strain, stress, *fit):
+                self.readouts.set('live_yield', stress)
+                self.append_to_console(f"Yield detected: {stress:.2f} MPa at strain {strain:.5f}")
 
             # Update max load if this is a new maximum (by absolute value, preserving sign)
             if abs(force) > abs(self.max_load):
                 self.max_load = force
-                self.maxLoadValue.setText(f"{self.max_load:.2f}")
+                self.readouts.set('max_load', force)
 
             # Update max stress/strain if new maximum (by absolute value, preserving sign)
             if abs(stress) > abs(self.max_stress):
                 self.max_stress = stress
-                self.maxStressValue.setText(f"{self.max_stress:.4f}")
+                self.readouts.set('max_stress', stress)
             if abs(strain) > abs(self.max_strain):
                 self.max_strain = strain
-                self.maxStrainValue.setText(f"{self.max_strain:.6f}")
+                self.readouts.set('max_strain', strain)
 
             # Update current points count (same for both plots)
-            self.currentPointsValue.setText(str(len(self.load_plot_forces)))
-            self.ssCurrentPointsValue.setText(str(len(self.stress_strain_stresses)))
+            self.readouts.set('points', len(self.samples))
 
             # Mark data as unsaved and update plot title
             if not self.data_unsaved:
@@ -2100,8 +2676,8 @@ class UTMApplication(QMainWindow):
         # Calculate displacement relative to tare point (positive going down)
         self.motor_displacement_mm = -(position_mm - self.motor_position_zero)
 
-        # Update displacement label
-        self.displacementLabel.setText(f"δ = {self.motor_displacement_mm:.4f} mm")
+        # Update displacement label (on the next display frame)
+        self.readouts.set('displacement', self.motor_displacement_mm)
 
         # Display to console if toggle is on
         if self.display_position_to_console:
@@ -2215,6 +2791,15 @@ class UTMApplication(QMainWindow):
             # Disconnect serial port if connected
             if self.connected:
                 self.serial_manager.disconnect()
+
+            # Let a running catalog index pass finish
+            self.catalog_indexer.stop()
+            if self.mat_export_worker is not None:
+                self.mat_export_worker.wait()  # Don't leave a half-written file
+            if self.comparison_window is not None:
+                self.comparison_window.close()
+            self.plot_renderer.shutdown()
+            self.logToFileCheckBox.setChecked(False)  # Flushes and closes the log file
             
             print("Goodbye!")
             event.accept()
@@ -2224,6 +2809,7 @@ class UTMApplication(QMainWindow):
 
 def main():
     """Main entry point for the application"""
+    multiprocessing.freeze_support()  # Plot image rendering runs in a worker process (also in the .exe)
     app = QApplication(sys.argv)
 
     # Create and show the main window
@@ -0,0 +1,67 @@
+"""
+MATLAB Export for UTM Application
+
+Writes a test as a MATLAB v5 .mat file: one typed column vector per data
+channel plus a 'metadata' struct with the same fields as the CSV header, so
+the Matlab app can load a run with a single load() call instead of parsing
+text.
+"""
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+from scipy.io import savemat
+
+# (MATLAB variable name, sample store column, dtype)
+MAT_COLUMNS = (
+    ("Time_s", "time", np.float64),
+    ("RawADC", "raw", np.int32),
+    ("Force_N", "force", np.float64),
+    ("Position_mm", "position", np.float64),
+    ("Speed_mm_s", "speed", np.float64),
+    ("Strain", "strain", np.float64),
+    ("Stress_MPa", "stress", np.float64),
+)
+
+
+def write_mat(file_path, metadata, columns, extra_columns=None):
+    """
+    Write a test to a MATLAB v5 .mat file
+
+    Args:
+        file_path (str): Output path
+        metadata (dict): Header fields (see UTMApplication._export_metadata), None values are written as ''
+        columns (dict): Sample store column name -> 1-D array (all MAT_COLUMNS)
+        extra_columns (dict): MATLAB variable name -> 1-D float array (e.g. derived channels)
+    """
+    variables = {}
+    for mat_name, store_name, dtype in MAT_COLUMNS:
+        values = np.asarray(columns[store_name])
+        if values.dtype != dtype:
+            values = np.rint(values) if np.issubdtype(dtype, np.integer) else values
+            values = values.astype(dtype)
+        variables[mat_name] = values.reshape(-1, 1)  # Column vectors, as MATLAB users expect
+    for mat_name, values in (extra_columns or {}).items():
+        variables[mat_name] = np.asarray(values, dtype=np.float64).reshape(-1, 1)
+    variables["metadata"] = {key: ("" if value is None else value) for key, value in metadata.items()}
+    savemat(file_path, variables, format='5', long_field_names=True, do_compression=False, oned_as='column')
+
+
+class MatExportWorker(QThread):
+    """Worker thread that writes a .mat file without blocking the GUI"""
+    export_finished = pyqtSignal(str)  # file path
+    export_failed = pyqtSignal(str, str)  # file path, error message
+
+    def __init__(self, file_path, metadata, columns, extra_columns=None):
+        super().__init__()
+        self.file_path = file_path
+        self.metadata = metadata
+        self.columns = columns
+        self.extra_columns = extra_columns
+
+    def run(self):
+        try:
+            write_mat(self.file_path, self.metadata, self.columns, self.extra_columns)
+        except Exception as e:
+            self.export_failed.emit(self.file_path, str(e))
+            return
+        self.export_finished.emit(self.file_path)
@@ -0,0 +1,193 @@
+"""
+Material Properties for UTM Application
+
+Tensile test results from an engineering stress-strain curve: Young's
+modulus, 0.2 % offset yield strength, UTS, uniform elongation, elongation at
+break and toughness. Everything is vectorized NumPy over the curve (a few
+passes over the samples), so a 1M-sample test is analyzed in tens of
+milliseconds and the results can follow the crop selection live.
+
+Compression tests (negative peak stress) are analyzed on the mirrored curve;
+stresses and strains are reported with their original sign.
+"""
+
+import numpy as np
+
+# 0.2 % offset for the yield strength (Rp0.2)
+OFFSET_STRAIN = 0.002
+# Elastic window search: windows ELASTIC_WIDTH of peak stress wide, starting at
+# ELASTIC_STARTS of peak stress on the loading branch
+ELASTIC_WIDTH = 0.2
+ELASTIC_STARTS = np.arange(0.05, 0.55, 0.05)
+# Windows fitting at least this well are considered linear (the steepest one is used)
+MIN_R2 = 0.99
+MIN_FIT_POINTS = 5
+# Residuals beyond this many (scaled) MADs are dropped before the final modulus fit
+OUTLIER_MADS = 3.0
+# Break: first sample after the peak where stress drops below this fraction of peak
+BREAK_DROP_FRACTION = 0.1
+
+RESULT_KEYS = (
+    "modulus_mpa", "yield_strength_mpa", "uts_mpa",
+    "uniform_elongation_pct", "elongation_at_break_pct", "toughness_mj_m3",
+)
+
+
+def _fit_line(x, y):
+    """Least-squares line through the points: (slope, intercept, r²)"""
+    n = len(x)
+    if n < 2:
+        return np.nan, np.nan, 0.0
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+    sxx = np.dot(dx, dx)
+    syy = np.dot(dy, dy)
+    if sxx <= 0 or syy <= 0:
+        return np.nan, np.nan, 0.0
+    sxy = np.dot(dx, dy)
+    slope = sxy / sxx
+    return slope, y_mean - slope * x_mean, sxy * sxy / (sxx * syy)
+
+
+def _robust_fit(x, y):
+    """Line fit, refitted without the outliers of the first fit (MAD of the residuals)"""
+    slope, intercept, r2 = _fit_line(x, y)
+    if not np.isfinite(slope):
+        return slope, intercept
+    residuals = y - (slope * x + intercept)
+    mad = np.median(np.abs(residuals - np.median(residuals)))
+    if mad > 0:
+        keep = np.abs(residuals) <= OUTLIER_MADS * 1.4826 * mad
+        if np.count_nonzero(keep) >= MIN_FIT_POINTS:
+            slope, intercept, _ = _fit_line(x[keep], y[keep])
+    return slope, intercept
+
+
+def elastic_window(strain, stress, peak_idx):
+    """
+    Index range (start, stop) of the linear elastic part of the loading branch
+
+    Candidate windows span ELASTIC_WIDTH of the peak stress, at the points
+    where the loading branch first reaches each stress level. The steepest
+    window with r² >= MIN_R2 is used (the best fitting one if none is).
+
+    Args:
+        strain, stress (np.ndarray): Curve with positive peak stress
+        peak_idx (int): Index of the peak stress
+
+    Returns:
+        tuple: (start, stop), or None if no window has enough points
+    """
+    envelope = np.maximum.accumulate(stress[:peak_idx + 1])
+    peak = envelope[-1]
+    levels = np.concatenate((ELASTIC_STARTS, ELASTIC_STARTS + ELASTIC_WIDTH)) * peak
+    crossings = np.searchsorted(envelope, levels)
+    starts, stops = np.split(crossings, 2)
+
+    best = None  # (linear, slope, r2, start, stop)
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        if stop - start < MIN_FIT_POINTS:
+            continue
+        slope, _, r2 = _fit_line(strain[start:stop], stress[start:stop])
+        if not np.isfinite(slope) or slope <= 0:
+            continue
+        candidate = (r2 >= MIN_R2, slope if r2 >= MIN_R2 else r2, r2, start, stop)
+        if best is None or candidate[:2] > best[:2]:
+            best = candidate
+    return None if best is None else (best[3], best[4])
+
+
+def material_properties(strain, stress, break_index=None):
+    """
+    Tensile properties of an engineering stress-strain curve
+
+    Args:
+        strain (np.ndarray): Engineering strain (mm/mm)
+        stress (np.ndarray): Engineering stress (MPa)
+        break_index (int): Break detected during the test, used instead of
+            searching for the post-peak drop (ignored if before the peak or out of range)
+
+    Returns:
+        dict: RESULT_KEYS (NaN where undefined) plus the sample indices used:
+            elastic_range (start, stop) or None, yield_index, uts_index and
+            break_index (None where undefined)
+    """
+    result = dict.fromkeys(RESULT_KEYS, float("nan"))
+    result.update(elastic_range=None, yield_index=None, uts_index=None, break_index=None)
+    strain = np.asarray(strain, dtype=np.float64)
+    stress = np.asarray(stress, dtype=np.float64)
+    n = len(stress)
+    if n < 2:
+        return result
+
+    # Mirror compression curves so the peak is positive
+    peak_idx = int(np.argmax(np.abs(stress)))
+    sign = 1.0 if stress[peak_idx] >= 0 else -1.0
+    s = stress if sign > 0 else -stress
+    e = strain if sign > 0 else -strain
+    peak = s[peak_idx]
+    if not peak > 0:
+        return result
+
+    # Break: last sample before the post-peak drop (the end of the test if there is none)
+    if break_index is not None and peak_idx <= break_index < n:
+        break_idx = int(break_index)
+    else:
+        dropped = np.flatnonzero(s[peak_idx:] < BREAK_DROP_FRACTION * peak)
+        break_idx = max(peak_idx, peak_idx + int(dropped[0]) - 1) if len(dropped) else n - 1
+
+    # Toughness: area under the curve up to the break (MPa = MJ/m³)
+    toughness = 0.5 * np.dot(s[1:break_idx + 1] + s[:break_idx], np.diff(e[:break_idx + 1]))
+
+    result.update(
+        uts_mpa=float(stress[peak_idx]),
+        uts_index=peak_idx,
+        uniform_elongation_pct=float(strain[peak_idx]) * 100.0,
+        elongation_at_break_pct=float(strain[break_idx]) * 100.0,
+        break_index=break_idx,
+        toughness_mj_m3=float(toughness),
+    )
+
+    # Young's modulus: robust fit on the detected elastic window
+    window = elastic_window(e, s, peak_idx)
+    if window is None:
+        return result
+    start, stop = window
+    modulus, intercept = _robust_fit(e[start:stop], s[start:stop])
+    if not (np.isfinite(modulus) and modulus > 0):
+        return result
+    result.update(modulus_mpa=float(modulus), elastic_range=window)
+
+    # Yield: first crossing of the curve below the 0.2 % offset line (shifted by the toe intercept)
+    zero_strain = -intercept / modulus
+    ahead = s[stop:break_idx + 1] - modulus * (e[stop:break_idx + 1] - zero_strain - OFFSET_STRAIN)
+    below = np.flatnonzero(ahead <= 0)
+    if len(below):
+        i = stop + int(below[0])
+        if i > stop:
+            # Interpolate between the last sample above and the first below the offset line
+            before, after = ahead[i - stop - 1], ahead[i - stop]
+            t = before / (before - after)
+            yield_stress = s[i - 1] + t * (s[i] - s[i - 1])
+        else:
+            yield_stress = s[i]
+        result.update(yield_strength_mpa=float(sign * yield_stress), yield_index=i)
+    return result
+
+
+def summary_text(result):
+    """One-line summary of a material_properties() result (for labels and logs)"""
+    def value(key, scale, spec, unit):
+        v = result[key]
+        return "–" if not np.isfinite(v) else f"{v * scale:{spec}} {unit}"
+
+    return "   ".join((
+        f"E: {value('modulus_mpa', 1e-3, '.2f', 'GPa')}",
+        f"Rp0.2: {value('yield_strength_mpa', 1, '.1f', 'MPa')}",
+        f"Rm: {value('uts_mpa', 1, '.1f', 'MPa')}",
+        f"Ag: {value('uniform_elongation_pct', 1, '.2f', '%')}",
+        f"A: {value('elongation_at_break_pct', 1, '.2f', '%')}",
+        f"Toughness: {value('toughness_mj_m3', 1, '.2f', 'MJ/m³')}",
+    ))
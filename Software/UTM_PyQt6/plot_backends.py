@@ -0,0 +1,526 @@
+"""
+Live Plot Backends for UTM Application
+
+The load and stress-strain plots talk to a small LivePlot interface so the
+rendering library can be swapped:
+
+- 'pyqtgraph': scene-graph plot with mouse zoom/pan (default when installed).
+- 'matplotlib': Agg-rendered canvas with the navigation toolbar.
+
+Callers pass already decimated data for the visible x range (see
+SampleStore.pyramid) and re-render when the user zooms or pans.
+
+Matplotlib stays in use for publication-quality figure exports either way.
+The backend can be forced with the UTM_PLOT_BACKEND environment variable.
+"""
+
+import os
+from datetime import timedelta
+
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+from PyQt6.QtCore import QObject, QEvent
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+try:
+    import pyqtgraph as pg
+except ImportError:
+    pg = None
+
+BACKENDS = ("pyqtgraph", "matplotlib")
+
+
+def available_backends():
+    """Names of the backends that can be used in this environment"""
+    return [name for name in BACKENDS if name != "pyqtgraph" or pg is not None]
+
+
+def default_backend():
+    """Backend from UTM_PLOT_BACKEND if set and available, otherwise the fastest available"""
+    available = available_backends()
+    requested = os.environ.get("UTM_PLOT_BACKEND", "").strip().lower()
+    return requested if requested in available else available[0]
+
+
+def create_live_plot(backend, title, xlabel, ylabel, time_axis=False):
+    """Create a LivePlot for the given backend name"""
+    if backend == "pyqtgraph":
+        return PyQtGraphLivePlot(title, xlabel, ylabel, time_axis)
+    return MatplotlibLivePlot(title, xlabel, ylabel, time_axis)
+
+
+class LivePlot:
+    """
+    Interface of a live plot with one curve, optional markers and a crop overlay
+
+    x values of time axes are elapsed seconds; the backend labels them as
+    clock time relative to set_time_origin().
+
+    on_view_changed is called (without arguments) when the user zooms or
+    pans, but not for autoscale().
+
+    on_hover is called with (x, y, x_scale, y_scale) when the mouse moves over
+    the data area (data coordinates and data units per pixel) and with None
+    when it leaves.
+    """
+
+    def __init__(self, title, xlabel, ylabel, time_axis=False):
+        self.time_axis = time_axis
+        self.time_origin = None
+        self.widget = None
+        self.on_view_changed = None
+        self.on_hover = None
+        self.crosshair_visible = False
+
+    def _notify_view_changed(self):
+        if self.on_view_changed is not None:
+            self.on_view_changed()
+
+    def _notify_hover(self, hover):
+        if self.on_hover is not None:
+            self.on_hover(hover)
+
+    def set_title(self, title):
+        raise NotImplementedError
+
+    def set_labels(self, xlabel, ylabel):
+        """Change the axis labels (e.g. when the plotted channels change)"""
+        raise NotImplementedError
+
+    def set_time_origin(self, start_time):
+        """Wall-clock time (datetime) of x = 0 on a time axis"""
+        self.time_origin = start_time
+
+    def set_data(self, x, y, markers=False):
+        """Replace the curve (and show markers on the same points if requested)"""
+        raise NotImplementedError
+
+    def show_crop(self, x_low, x_high):
+        """Show the crop lines and shaded region between x_low and x_high"""
+        raise NotImplementedError
+
+    def hide_crop(self):
+        raise NotImplementedError
+
+    def show_crosshair(self, x, y):
+        """Show the crosshair on the point (x, y)"""
+        raise NotImplementedError
+
+    def hide_crosshair(self):
+        raise NotImplementedError
+
+    def autoscale(self, x_min=None, x_max=None, y_min=None, y_max=None):
+        """
+        Fit the view to the data
+
+        Explicit bounds are used as given (with a small y margin); if the y
+        bounds are omitted they are computed from the displayed curve.
+        """
+        raise NotImplementedError
+
+    def pixel_width(self):
+        """Width of the data area in pixels (drives decimation)"""
+        raise NotImplementedError
+
+    def x_range(self):
+        """Visible (x_min, x_max) in data coordinates (elapsed seconds on time axes)"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove the curve data and reset the view"""
+        self.set_data([], [])
+        self.hide_crop()
+        self.autoscale()
+
+    def redraw(self):
+        """Schedule a repaint"""
+        raise NotImplementedError
+
+
+class _LeaveFilter(QObject):
+    """Event filter that calls a function when the mouse leaves a widget"""
+
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self._callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Leave:
+            self._callback()
+        return False
+
+
+class MatplotlibLivePlot(LivePlot):
+    """
+    LivePlot on a matplotlib FigureCanvasQTAgg
+
+    Uses blitting: the axes, grid, tick labels and title are rendered once
+    into a cached background, and a frame only restores it and draws the
+    curve, marker and crop artists on top. The background is re-rendered
+    after a resize, an axis-limit change or a title change.
+    """
+
+    # Headroom (fraction of the data span) added when growing live data
+    # outgrows the axes, so the limits - and the background - change rarely
+    LIVE_HEADROOM = 0.1
+
+    def __init__(self, title, xlabel, ylabel, time_axis=False):
+        super().__init__(title, xlabel, ylabel, time_axis)
+        # Create the matplotlib figure and canvas
+        self.figure = Figure(figsize=(8, 4), dpi=100)
+        self.figure.set_facecolor('#f0f0f0')
+        self.canvas = FigureCanvas(self.figure)
+
+        # Canvas with the zoom/pan toolbar
+        self.widget = QWidget()
+        layout = QVBoxLayout(self.widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        self.toolbar = NavigationToolbar(self.canvas, self.widget)
+        layout.addWidget(self.toolbar)
+        layout.addWidget(self.canvas)
+
+        # Create the axes
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_title(title)
+        self.ax.grid(True, alpha=0.3)
+
+        # Create the line object (empty initially)
+        self.line, = self.ax.plot([], [], 'b-', linewidth=1)
+        self.markers, = self.ax.plot([], [], 'b.', markersize=3)
+
+        # Create crop selection markers (vertical lines and shaded region)
+        self.crop_line_low = self.ax.axvline(x=0, color='red', linestyle='--', linewidth=1.5, visible=False)
+        self.crop_line_high = self.ax.axvline(x=0, color='red', linestyle='--', linewidth=1.5, visible=False)
+        # The span is a rectangle in (data x, axes y) coordinates, moved in place by show_crop()
+        self.crop_span = Rectangle((0, 0), 1, 1, transform=self.ax.get_xaxis_transform(),
+                                   alpha=0.2, color='yellow', visible=False)
+        self.ax.add_patch(self.crop_span)
+
+        # Hover crosshair on the nearest sample
+        crosshair_style = dict(color='gray', linestyle=':', linewidth=1, visible=False)
+        self.crosshair_v = self.ax.axvline(x=0, **crosshair_style)
+        self.crosshair_h = self.ax.axhline(y=0, **crosshair_style)
+        self.crosshair_point, = self.ax.plot([], [], 'o', color='red', markersize=5, visible=False)
+
+        if time_axis:
+            # Format x-axis for time (x data are matplotlib date numbers)
+            self.ax.xaxis_date()
+            self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+            self.figure.autofmt_xdate()
+
+        self.figure.tight_layout()
+
+        # Artists drawn per frame on top of the cached background
+        for artist in self._animated_artists():
+            artist.set_animated(True)
+        self._background = None
+        self._last_x_max = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('resize_event', self._invalidate_background)
+        self.ax.callbacks.connect('ylim_changed', self._invalidate_background)
+
+        # xlim changes outside autoscale() come from the toolbar (zoom, pan, home, back)
+        self._autoscaling = False
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+        self.canvas.mpl_connect('motion_notify_event', self._on_mouse_moved)
+        self.canvas.mpl_connect('axes_leave_event', lambda event: self._notify_hover(None))
+        self.canvas.mpl_connect('figure_leave_event', lambda event: self._notify_hover(None))
+
+    def _animated_artists(self):
+        return (self.crop_span, self.crop_line_low, self.crop_line_high, self.line, self.markers,
+                self.crosshair_v, self.crosshair_h, self.crosshair_point)
+
+    def _on_mouse_moved(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            self._notify_hover(None)
+            return
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        x_scale = abs(self._from_display_x(x1) - self._from_display_x(x0)) / max(1.0, self.ax.bbox.width)
+        y_scale = abs(y1 - y0) / max(1.0, self.ax.bbox.height)
+        self._notify_hover((self._from_display_x(event.xdata), event.ydata, x_scale, y_scale))
+
+    def _on_draw(self, event):
+        """Full redraw finished: cache the static background and draw the dynamic artists on it"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated_artists():
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+
+    def _invalidate_background(self, *args):
+        self._background = None
+
+    def _on_xlim_changed(self, ax):
+        self._invalidate_background()
+        if not self._autoscaling:
+            self._notify_view_changed()
+
+    def _to_display_x(self, x):
+        """Elapsed seconds -> matplotlib date numbers on time axes"""
+        if self.time_axis and self.time_origin is not None:
+            return mdates.date2num(self.time_origin) + x / 86400.0
+        return x
+
+    def _from_display_x(self, x):
+        if self.time_axis and self.time_origin is not None:
+            return (x - mdates.date2num(self.time_origin)) * 86400.0
+        return x
+
+    def set_title(self, title):
+        if title != self.ax.get_title():
+            self.ax.set_title(title)
+            self._invalidate_background()
+
+    def set_labels(self, xlabel, ylabel):
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self._invalidate_background()
+
+    def set_data(self, x, y, markers=False):
+        x = self._to_display_x(x) if len(x) else x
+        self.line.set_data(x, y)
+        if markers:
+            self.markers.set_data(x, y)
+        self.markers.set_visible(markers)
+
+    def show_crop(self, x_low, x_high):
+        x_low, x_high = self._to_display_x(x_low), self._to_display_x(x_high)
+
+        # Update vertical line positions
+        self.crop_line_low.set_xdata([x_low, x_low])
+        self.crop_line_high.set_xdata([x_high, x_high])
+
+        # Update the span (shaded region)
+        self.crop_span.set_x(x_low)
+        self.crop_span.set_width(x_high - x_low)
+
+        # Show the markers
+        self.crop_line_low.set_visible(True)
+        self.crop_line_high.set_visible(True)
+        self.crop_span.set_visible(True)
+
+    def hide_crop(self):
+        self.crop_line_low.set_visible(False)
+        self.crop_line_high.set_visible(False)
+        self.crop_span.set_visible(False)
+
+    def show_crosshair(self, x, y):
+        x = self._to_display_x(x)
+        self.crosshair_v.set_xdata([x, x])
+        self.crosshair_h.set_ydata([y, y])
+        self.crosshair_point.set_data([x], [y])
+        for artist in (self.crosshair_v, self.crosshair_h, self.crosshair_point):
+            artist.set_visible(True)
+        self.crosshair_visible = True
+
+    def hide_crosshair(self):
+        for artist in (self.crosshair_v, self.crosshair_h, self.crosshair_point):
+            artist.set_visible(False)
+        self.crosshair_visible = False
+
+    def autoscale(self, x_min=None, x_max=None, y_min=None, y_max=None):
+        self._autoscaling = True
+        try:
+            if x_min is not None and x_max is not None and x_min != x_max:
+                growing = self._last_x_max is not None and x_max > self._last_x_max
+                self._last_x_max = x_max
+                # Explicit limits (autoscale_view doesn't handle datetime x data well)
+                x_lo, x_hi = self._to_display_x(x_min), self._to_display_x(x_max)
+                self._fit_limits(self.ax.get_xlim, self.ax.set_xlim, x_lo, x_hi, growing, 0.0, both_ends=False)
+                if y_min is not None and y_max is not None and y_min != y_max:
+                    self._fit_limits(self.ax.get_ylim, self.ax.set_ylim, y_min, y_max, growing,
+                                     self.ax.margins()[1], both_ends=True)
+                else:
+                    self.ax.relim()
+                    self.ax.autoscale_view(scalex=False, scaley=True)
+            else:
+                self._last_x_max = None
+                self.ax.relim()
+                self.ax.autoscale_view()
+        finally:
+            self._autoscaling = False
+
+    def _fit_limits(self, get_limits, set_limits, lo, hi, growing, margin, both_ends):
+        """
+        Set axis limits for data in [lo, hi]
+
+        While live data grows, the current limits are kept as long as the data
+        fits and they aren't much too wide; when they are changed, headroom is
+        added so the next few frames fit as well.
+        """
+        span = hi - lo
+        lo, hi = lo - span * margin, hi + span * margin
+        current = get_limits()
+        if growing:
+            if current[0] <= lo and hi <= current[1] and \
+                    current[1] - current[0] <= (hi - lo) * (1 + 3 * self.LIVE_HEADROOM):
+                return
+            hi += span * self.LIVE_HEADROOM
+            if both_ends:
+                lo -= span * self.LIVE_HEADROOM
+        if (lo, hi) != tuple(current):
+            set_limits(lo, hi)
+
+    def pixel_width(self):
+        return max(1, int(self.ax.bbox.width))
+
+    def x_range(self):
+        x_min, x_max = self.ax.get_xlim()
+        return self._from_display_x(x_min), self._from_display_x(x_max)
+
+    def redraw(self):
+        if self._background is None:
+            # Static parts changed: full redraw (caches a new background in _on_draw)
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+
+
+if pg is not None:
+    class ElapsedTimeAxis(pg.AxisItem):
+        """Axis that labels elapsed seconds as clock time (HH:MM:SS)"""
+
+        def __init__(self, plot, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._plot = plot
+
+        def tickStrings(self, values, scale, spacing):
+            origin = self._plot.time_origin
+            if origin is None:
+                return super().tickStrings(values, scale, spacing)
+            return [(origin + timedelta(seconds=float(v))).strftime('%H:%M:%S') for v in values]
+
+
+class PyQtGraphLivePlot(LivePlot):
+    """LivePlot on a pyqtgraph PlotWidget (mouse wheel zoom, drag to pan)"""
+
+    def __init__(self, title, xlabel, ylabel, time_axis=False):
+        super().__init__(title, xlabel, ylabel, time_axis)
+        axis_items = {'bottom': ElapsedTimeAxis(self, orientation='bottom')} if time_axis else None
+        self.plot_widget = pg.PlotWidget(background='#f0f0f0', axisItems=axis_items)
+        self.widget = self.plot_widget
+        self.plot_item = self.plot_widget.getPlotItem()
+
+        for name in ('left', 'bottom'):
+            axis = self.plot_item.getAxis(name)
+            axis.setPen('k')
+            axis.setTextPen('k')
+        self.plot_item.setLabel('bottom', xlabel)
+        self.plot_item.setLabel('left', ylabel)
+        self.set_title(title)
+        self.plot_item.showGrid(x=True, y=True, alpha=0.3)
+
+        self.line = self.plot_item.plot([], [], pen=pg.mkPen('b', width=1))
+        self.line.setSkipFiniteCheck(True)
+        # Markers are only distinguishable at about one per two pixels
+        self.markers = self.plot_item.plot([], [], pen=None, symbol='o', symbolSize=3,
+                                           symbolPen=None, symbolBrush='b', autoDownsampleFactor=0.5)
+        self.markers.setDownsampling(auto=True, method='subsample')
+        self.markers.setClipToView(True)
+        self.markers.setSkipFiniteCheck(True)
+        self.markers.setVisible(False)
+        self._pending_markers = None
+
+        # Crop overlay (not user-movable, driven by the range sliders)
+        crop_pen = pg.mkPen('r', width=1.5, style=pg.QtCore.Qt.PenStyle.DashLine)
+        self.crop_region = pg.LinearRegionItem(movable=False, brush=pg.mkBrush(255, 255, 0, 51), pen=crop_pen)
+        self.crop_region.setZValue(-10)
+        self.crop_region.setVisible(False)
+        self.plot_item.addItem(self.crop_region, ignoreBounds=True)
+
+        # Hover crosshair on the nearest sample
+        crosshair_pen = pg.mkPen('gray', width=1, style=pg.QtCore.Qt.PenStyle.DotLine)
+        self.crosshair_v = pg.InfiniteLine(angle=90, movable=False, pen=crosshair_pen)
+        self.crosshair_h = pg.InfiniteLine(angle=0, movable=False, pen=crosshair_pen)
+        self.crosshair_point = pg.ScatterPlotItem(size=7, pen=None, brush='r')
+        for item in (self.crosshair_v, self.crosshair_h, self.crosshair_point):
+            item.setVisible(False)
+            self.plot_item.addItem(item, ignoreBounds=True)
+
+        self.plot_item.getViewBox().sigRangeChangedManually.connect(lambda *args: self._notify_view_changed())
+        # At most one hover update per display frame
+        self._mouse_proxy = pg.SignalProxy(self.plot_widget.scene().sigMouseMoved, rateLimit=60,
+                                           slot=self._on_mouse_moved)
+        self._leave_filter = _LeaveFilter(lambda: self._notify_hover(None), self.plot_widget)
+        self.plot_widget.installEventFilter(self._leave_filter)
+
+    def _on_mouse_moved(self, args):
+        view_box = self.plot_item.getViewBox()
+        pos = args[0]
+        if not view_box.sceneBoundingRect().contains(pos):
+            self._notify_hover(None)
+            return
+        point = view_box.mapSceneToView(pos)
+        x_scale, y_scale = view_box.viewPixelSize()
+        self._notify_hover((point.x(), point.y(), x_scale, y_scale))
+
+    def set_title(self, title):
+        self.plot_item.setTitle(title, color='k')
+
+    def set_labels(self, xlabel, ylabel):
+        self.plot_item.setLabel('bottom', xlabel)
+        self.plot_item.setLabel('left', ylabel)
+
+    def set_data(self, x, y, markers=False):
+        self.line.setData(x, y)
+        # Markers are set in redraw(), once autoscale() has set the visible x range,
+        # so only the visible points are turned into scatter spots
+        self._pending_markers = (x, y) if markers else None
+        if not markers and self.markers.isVisible():
+            self.markers.setData([], [])
+            self.markers.setVisible(False)
+
+    def show_crop(self, x_low, x_high):
+        self.crop_region.setRegion((x_low, x_high))
+        self.crop_region.setVisible(True)
+
+    def hide_crop(self):
+        self.crop_region.setVisible(False)
+
+    def show_crosshair(self, x, y):
+        self.crosshair_v.setPos(x)
+        self.crosshair_h.setPos(y)
+        self.crosshair_point.setData([x], [y])
+        for item in (self.crosshair_v, self.crosshair_h, self.crosshair_point):
+            item.setVisible(True)
+        self.crosshair_visible = True
+
+    def hide_crosshair(self):
+        for item in (self.crosshair_v, self.crosshair_h, self.crosshair_point):
+            item.setVisible(False)
+        self.crosshair_visible = False
+
+    def autoscale(self, x_min=None, x_max=None, y_min=None, y_max=None):
+        view_box = self.plot_item.getViewBox()
+        if x_min is not None and x_max is not None and x_min != x_max:
+            view_box.setXRange(x_min, x_max, padding=0)
+            if y_min is not None and y_max is not None and y_min != y_max:
+                view_box.setYRange(y_min, y_max)
+            else:
+                view_box.enableAutoRange(axis=pg.ViewBox.YAxis)
+        else:
+            view_box.enableAutoRange()
+
+    def pixel_width(self):
+        return max(1, int(self.plot_item.getViewBox().width()))
+
+    def x_range(self):
+        return tuple(self.plot_item.getViewBox().viewRange()[0])
+
+    def redraw(self):
+        if self._pending_markers is not None:
+            self.markers.setData(*self._pending_markers)
+            self.markers.setVisible(True)
+            self._pending_markers = None
+        self.plot_widget.update()
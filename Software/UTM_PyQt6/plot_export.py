@@ -0,0 +1,152 @@
+"""
+Plot Image Export for UTM Application
+
+Renders publication-quality plots (all samples, high DPI) with matplotlib's
+Agg backend in a separate process, so exporting a long test never blocks the
+GUI. Rendered images are cached by data version and plot settings, so
+exporting the same plot again (e.g. as part of a report) is free.
+"""
+
+import io
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+# Plot kind -> (default title, x label, y label, x channel, y channel)
+# (channels are sample store columns or derived_channels names)
+PLOT_KINDS = {
+    "load": ("Load vs Time", "Time (s)", "Force (N)", "time", "force"),
+    "stress_strain": ("Stress vs Strain", "Strain (mm/mm)", "Stress (MPa)",
+                      "engineering_strain", "engineering_stress"),
+    "true_stress_strain": ("True Stress vs True Strain", "True strain", "True stress (MPa)",
+                           "true_strain", "true_stress"),
+    "force_displacement": ("Force vs Displacement", "Displacement (mm)", "Force (N)", "displacement", "force"),
+    "crosshead_speed": ("Crosshead Speed vs Time", "Time (s)", "Crosshead speed (mm/s)", "time", "crosshead_speed"),
+    "strain_rate": ("Strain Rate vs Time", "Time (s)", "Strain rate (1/s)", "time", "strain_rate"),
+}
+
+# File extension -> matplotlib format
+IMAGE_FORMATS = {".png": "png", ".svg": "svg", ".pdf": "pdf"}
+
+DEFAULT_SETTINGS = {
+    "kind": "load",
+    "format": "png",
+    "title": None,  # None: the kind's default title
+    "dpi": 300,
+    "width_in": 8.0,
+    "height_in": 5.0,
+    "markers": False,
+}
+
+
+def render_plot(x, y, settings):
+    """
+    Render a plot to image data (runs in the worker process)
+
+    Args:
+        x, y (np.ndarray): All samples to draw
+        settings (dict): See DEFAULT_SETTINGS
+
+    Returns:
+        bytes: Encoded image in settings["format"]
+    """
+    # Imported here so the GUI process never loads matplotlib just for exports
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    default_title, xlabel, ylabel, _, _ = PLOT_KINDS[settings["kind"]]
+    fig = Figure(figsize=(settings["width_in"], settings["height_in"]), dpi=settings["dpi"])
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.plot(x, y, 'b-', linewidth=0.8)
+    if settings["markers"]:
+        ax.plot(x, y, 'o', color='blue', markersize=1.5)
+    ax.set_title(settings["title"] or default_title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=settings["format"], dpi=settings["dpi"])
+    return buffer.getvalue()
+
+
+def image_from_bytes(data):
+    """Decode rendered PNG data into a QImage (e.g. for previews or reports)"""
+    return QImage.fromData(data)
+
+
+class PlotImageRenderer(QObject):
+    """
+    Renders plot images in a background process, with a cache
+
+    request() returns cached image data right away. Otherwise it hands a
+    snapshot of the data to the worker process and emits image_ready when the
+    image is done. Concurrent requests for the same key are rendered only once.
+    """
+    image_ready = pyqtSignal(object, bytes)  # cache key, image data
+    render_failed = pyqtSignal(object, str)  # cache key, error message
+    _finished = pyqtSignal(object, bytes, str)  # key, image data, error (from the executor thread)
+
+    CACHE_SIZE = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = None  # Started on first use
+        self._cache = OrderedDict()  # key -> image data (least recently used first)
+        self._pending = set()
+        self._finished.connect(self._on_finished)
+
+    @staticmethod
+    def cache_key(data_version, settings):
+        """Key for an image of the given data version with the given settings"""
+        return (data_version,) + tuple(sorted(settings.items()))
+
+    def request(self, key, x, y, settings):
+        """
+        Get the image for key, rendering it in the background if it isn't cached
+
+        Args:
+            key: Cache key (see cache_key)
+            x, y (np.ndarray): Data to draw (not modified while rendering, e.g. sample store views)
+            settings (dict): See DEFAULT_SETTINGS
+
+        Returns:
+            bytes or None: Cached image data, or None if image_ready will follow
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if key not in self._pending:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=1)
+            self._pending.add(key)
+            future = self._pool.submit(render_plot, x, y, dict(DEFAULT_SETTINGS, **settings))
+            future.add_done_callback(lambda f, key=key: self._on_done(key, f))
+        return None
+
+    def _on_done(self, key, future):
+        # Executor thread: hand the result over to the GUI thread
+        try:
+            self._finished.emit(key, future.result(), "")
+        except Exception as e:
+            self._finished.emit(key, b"", str(e) or type(e).__name__)
+
+    def _on_finished(self, key, data, error):
+        self._pending.discard(key)
+        if error:
+            self.render_failed.emit(key, error)
+            return
+        self._cache[key] = data
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        self.image_ready.emit(key, data)
+
+    def shutdown(self):
+        """Stop the worker process (waits for a running render)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,123 @@
+"""
+Nearest-Sample Lookup for UTM Application
+
+Finds the sample under the mouse cursor without scanning the whole test: a
+binary search for series with a monotone x (time), and a uniform grid index
+for curves that fold back on themselves (stress-strain).
+"""
+
+import numpy as np
+
+
+def nearest_sorted_index(values, x):
+    """
+    Index of the value closest to x in a sorted (non-decreasing) array
+
+    Args:
+        values (np.ndarray): Sorted values (e.g. the time column)
+        x (float): Query value
+
+    Returns:
+        int or None: Index, None for an empty array
+    """
+    n = len(values)
+    if n == 0:
+        return None
+    i = int(np.searchsorted(values, x))
+    if i <= 0:
+        return 0
+    if i >= n:
+        return n - 1
+    return i if values[i] - x < x - values[i - 1] else i - 1
+
+
+class GridIndex:
+    """
+    Uniform grid over the (x, y) points of a curve, for nearest-point queries
+
+    Points are bucketed into GRID_SIZE x GRID_SIZE cells and stored sorted by
+    cell, column by column, so the cells of one grid column within a y range
+    are one contiguous slice. A query only looks at the cells within the
+    search radius. Samples appended after the last build are kept in an
+    unindexed tail that is searched directly, and the grid is rebuilt lazily
+    once the tail grows too large.
+    """
+
+    GRID_SIZE = 512
+    MIN_TAIL = 50000  # Unindexed samples searched directly before a rebuild is considered
+
+    def __init__(self):
+        self._count = 0  # Number of indexed samples
+        self._order = np.empty(0, dtype=np.int64)  # Sample indices sorted by cell
+        self._starts = np.zeros(1, dtype=np.int64)  # Offset of each cell in _order
+        self._origin = (0.0, 0.0)
+        self._cell = (1.0, 1.0)
+        self._size = 1
+
+    def update(self, x, y):
+        """Index x, y (the whole series; rebuilt if it shrank or the tail is too long)"""
+        n = len(x)
+        tail = n - self._count
+        if tail < 0 or tail > max(self.MIN_TAIL, self._count // 4):
+            self._build(x, y)
+
+    def _build(self, x, y):
+        n = len(x)
+        self._count = n
+        if n == 0:
+            self._order = np.empty(0, dtype=np.int64)
+            self._starts = np.zeros(1, dtype=np.int64)
+            return
+        size = int(min(self.GRID_SIZE, max(1, np.sqrt(n))))
+        x0, x1 = float(x.min()), float(x.max())
+        y0, y1 = float(y.min()), float(y.max())
+        self._size = size
+        self._origin = (x0, y0)
+        self._cell = ((x1 - x0) / size or 1.0, (y1 - y0) / size or 1.0)
+        keys = self._cell_keys(x, y)
+        self._order = np.argsort(keys, kind='stable')
+        self._starts = np.searchsorted(keys[self._order], np.arange(size * size + 1))
+
+    def _cell_coords(self, x, y):
+        cx = np.clip(((x - self._origin[0]) / self._cell[0]).astype(np.int64), 0, self._size - 1)
+        cy = np.clip(((y - self._origin[1]) / self._cell[1]).astype(np.int64), 0, self._size - 1)
+        return cx, cy
+
+    def _cell_keys(self, x, y):
+        cx, cy = self._cell_coords(x, y)
+        return cx * self._size + cy
+
+    def nearest(self, x, y, px, py, x_scale, y_scale, max_distance):
+        """
+        Index of the sample closest to (px, py) in screen distance
+
+        Args:
+            x, y (np.ndarray): The series passed to update() (possibly grown since)
+            px, py (float): Query point in data coordinates
+            x_scale, y_scale (float): Data units per pixel on each axis
+            max_distance (float): Search radius in pixels
+
+        Returns:
+            int or None: Sample index, None if no sample is within max_distance
+        """
+        rx, ry = max_distance * x_scale, max_distance * y_scale
+        candidates = []
+        if self._count:
+            (cx0, cx1), (cy0, cy1) = (self._cell_coords(np.array([px - rx, px + rx]),
+                                                        np.array([py - ry, py + ry])))
+            for cx in range(cx0, cx1 + 1):
+                first = self._starts[cx * self._size + cy0]
+                last = self._starts[cx * self._size + cy1 + 1]
+                if last > first:
+                    candidates.append(self._order[first:last])
+        if len(x) > self._count:
+            candidates.append(np.arange(self._count, len(x)))  # Unindexed tail
+        if not candidates:
+            return None
+
+        idx = np.concatenate(candidates)
+        d2 = ((x[idx] - px) / x_scale) ** 2 + ((y[idx] - py) / y_scale) ** 2
+        best = int(np.argmin(d2))
+        if d2[best] > max_distance * max_distance:
+            return None
+        return int(idx[best])
@@ -0,0 +1,59 @@
+"""
+Readout View-Model for UTM Application
+
+Holds the latest value of each numeric readout (current load, maxima, point
+count, displacement) and pushes them to their labels once per display frame.
+Data handlers only record values, so label updates (and the relayouts they
+cause) cost the same whatever the sample rate.
+"""
+
+
+class ReadoutModel:
+    """
+    Latest readout values, pushed to their bound labels by flush()
+
+    set() only records a value. flush() formats the values that changed since
+    the last flush and calls setText() only where the text actually differs
+    from what the label shows.
+    """
+
+    def __init__(self):
+        self._bindings = {}  # name -> list of [label, format, text shown]
+        self._values = {}
+        self._dirty = set()
+
+    def bind(self, name, label, fmt="{}"):
+        """
+        Show a readout on a label (a readout may be bound to several labels)
+
+        Args:
+            name (str): Readout name
+            label (QLabel): Widget with setText()
+            fmt (str or callable): str.format pattern for the value, or a function returning the text
+        """
+        self._bindings.setdefault(name, []).append([label, fmt, None])
+        if name in self._values:
+            self._dirty.add(name)
+
+    def set(self, name, value):
+        """Record the latest value of a readout (shown on the next flush)"""
+        if self._values.get(name) != value or name not in self._values:
+            self._values[name] = value
+            self._dirty.add(name)
+
+    def get(self, name, default=None):
+        return self._values.get(name, default)
+
+    def flush(self):
+        """Push the changed readouts to their labels"""
+        if not self._dirty:
+            return
+        for name in self._dirty:
+            value = self._values[name]
+            for binding in self._bindings.get(name, ()):
+                label, fmt, shown = binding
+                text = fmt(value) if callable(fmt) else fmt.format(value)
+                if text != shown:
+                    label.setText(text)
+                    binding[2] = text
+        self._dirty.clear()
@@ -0,0 +1,227 @@
+"""
+Sample Store for UTM Application
+
+Columnar storage for the samples recorded during a test. Each channel is kept
+as a contiguous NumPy float64 array so plots, exports and analysis can work on
+slices without copying. A store can also wrap read-only arrays (for example a
+memory-mapped .utm file), in which case the data is only copied into memory
+once new samples are appended.
+
+Only measured channels are stored; strain, stress and the other series that
+depend on the specimen geometry are computed by derived_channels.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from decimation import MinMaxPyramid, MonotoneEnvelope
+from point_lookup import GridIndex
+
+
+class SampleStore:
+    """Append-only columnar sample storage with a version counter"""
+
+    # Column names, in file/export order
+    COLUMNS = ("time", "raw", "force", "position", "speed")
+
+    INITIAL_CAPACITY = 4096
+
+    def __init__(self):
+        self.start_time = None  # datetime of the first sample (time column is elapsed seconds)
+        self.version = 0  # Incremented on every change, used to invalidate caches
+        self.epoch = 0  # Incremented when existing samples change (not on append)
+        self.break_index = None  # Last sample before the detected specimen fracture
+        self._pyramids = {}  # column name -> (epoch, MinMaxPyramid)
+        self._envelopes = {}  # column name -> (epoch, MonotoneEnvelope)
+        self._grid_indexes = {}  # (x column, y column) -> (epoch, GridIndex)
+        self._n = 0
+        self._capacity = 0
+        self._columns = {name: np.empty(0) for name in self.COLUMNS}
+
+    def __len__(self):
+        return self._n
+
+    def column(self, name):
+        """Return a view of the given column (only the valid samples)"""
+        return self._columns[name][:self._n]
+
+    def pyramid(self, name):
+        """Min/max pyramid of a column, updated incrementally for appended samples"""
+        cached = self._pyramids.get(name)
+        if cached is None or cached[0] != self.epoch:
+            cached = (self.epoch, MinMaxPyramid())
+            self._pyramids[name] = cached
+        cached[1].update(self.column(name))
+        return cached[1]
+
+    def envelope(self, name):
+        """Running-max envelope of a column (for x-range lookups), updated incrementally"""
+        cached = self._envelopes.get(name)
+        if cached is None or cached[0] != self.epoch:
+            cached = (self.epoch, MonotoneEnvelope())
+            self._envelopes[name] = cached
+        cached[1].update(self.column(name))
+        return cached[1]
+
+    def grid_index(self, x_name, y_name):
+        """Nearest-point index over two columns, rebuilt lazily as samples are appended"""
+        key = (x_name, y_name)
+        cached = self._grid_indexes.get(key)
+        if cached is None or cached[0] != self.epoch:
+            cached = (self.epoch, GridIndex())
+            self._grid_indexes[key] = cached
+        cached[1].update(self.column(x_name), self.column(y_name))
+        return cached[1]
+
+    # Column views (no copies)
+    @property
+    def time(self):
+        return self._columns["time"][:self._n]
+
+    @property
+    def raw(self):
+        return self._columns["raw"][:self._n]
+
+    @property
+    def force(self):
+        return self._columns["force"][:self._n]
+
+    @property
+    def position(self):
+        return self._columns["position"][:self._n]
+
+    @property
+    def speed(self):
+        return self._columns["speed"][:self._n]
+
+    def append(self, timestamp, raw, force, position, speed):
+        """
+        Append one sample
+
+        Args:
+            timestamp (datetime): Wall-clock time of the sample
+            raw, force, position, speed (float): Channel values
+        """
+        if self.start_time is None:
+            self.start_time = timestamp
+        if self._n >= self._capacity:
+            self._grow(max(self.INITIAL_CAPACITY, self._capacity * 2))
+
+        i = self._n
+        columns = self._columns
+        columns["time"][i] = (timestamp - self.start_time).total_seconds()
+        columns["raw"][i] = raw
+        columns["force"][i] = force
+        columns["position"][i] = position
+        columns["speed"][i] = speed
+        self._n = i + 1
+        self.version += 1
+
+    def _grow(self, capacity):
+        """Reallocate all columns into owned, writable arrays of the given capacity"""
+        for name in self.COLUMNS:
+            new = np.empty(capacity, dtype=np.float64)
+            new[:self._n] = self._columns[name][:self._n]
+            self._columns[name] = new
+        self._capacity = capacity
+
+    def mapped_file(self):
+        """Path of the file any column is memory-mapped from (None for owned data)"""
+        for column in self._columns.values():
+            filename = getattr(column, "filename", None)
+            if filename is not None:
+                return filename
+        return None
+
+    def detach(self):
+        """
+        Copy wrapped read-only (e.g. memory-mapped) columns into owned memory
+
+        Cached pyramids are rebound to the copies, so no view of the file is
+        left afterwards (envelopes and grid indexes keep only their own arrays).
+        """
+        if self.mapped_file() is None:
+            return
+        self._grow(self._n)
+        self._pyramids = {name: cached for name, cached in self._pyramids.items() if cached[0] == self.epoch}
+        for name, (_, pyramid) in self._pyramids.items():
+            pyramid.update(self.column(name))  # Same samples: only the values are rebound
+
+    def set_arrays(self, start_time, **columns):
+        """
+        Replace the store contents with existing arrays (no copy)
+
+        The arrays may be read-only (e.g. np.memmap views). They are only copied
+        into owned memory if samples are appended later.
+
+        Args:
+            start_time (datetime): Wall-clock time of the first sample
+            **columns: One 1-D array per name in COLUMNS, all of equal length (other names are ignored)
+        """
+        lengths = {len(columns[name]) for name in self.COLUMNS}
+        if len(lengths) != 1:
+            raise ValueError("All columns must have the same length")
+        self._columns = {name: columns[name] for name in self.COLUMNS}
+        self._n = lengths.pop()
+        self._capacity = self._n  # Next append reallocates into owned memory
+        self.start_time = start_time if self._n else None
+        self.break_index = None
+        self.version += 1
+        self.epoch += 1
+
+    def crop(self, low_idx, high_idx):
+        """Keep only samples low_idx..high_idx (inclusive)"""
+        self._columns = {name: col[low_idx:high_idx + 1] for name, col in self._columns.items()}
+        n = len(self._columns["time"])
+        if self.break_index is not None:
+            self.break_index = self.break_index - low_idx if 0 <= self.break_index - low_idx < n else None
+        if n:
+            # Re-base elapsed time on the new first sample
+            first = float(self._columns["time"][0])
+            if first != 0.0:
+                self._columns["time"] = self._columns["time"] - first
+                self.start_time = self.start_time + timedelta(seconds=first)
+        else:
+            self.start_time = None
+        self._n = n
+        self._capacity = n
+        self.version += 1
+        self.epoch += 1
+
+    def clear(self):
+        """Remove all samples"""
+        self._columns = {name: np.empty(0) for name in self.COLUMNS}
+        self._n = 0
+        self._capacity = 0
+        self.start_time = None
+        self.break_index = None
+        self.version += 1
+        self.epoch += 1
+
+    def tail_range(self, seconds):
+        """
+        Index range (start, stop) of the samples in the last `seconds` of the test
+
+        Slicing any column with it gives a view of the rolling window (no copy),
+        so work on the window is O(window) whatever the test length.
+        """
+        if self._n == 0:
+            return 0, 0
+        times = self.time
+        start = int(np.searchsorted(times, times[-1] - seconds, side='left'))
+        return start, self._n
+
+    def duration(self):
+        """Elapsed time between first and last sample in seconds"""
+        if self._n == 0:
+            return 0.0
+        return float(self._columns["time"][self._n - 1])
+
+
+def abs_max(values):
+    """Value with the largest magnitude (sign preserved), 0.0 for empty input"""
+    if len(values) == 0:
+        return 0.0
+    return float(values[np.argmax(np.abs(values))])
+
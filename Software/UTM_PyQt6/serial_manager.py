@@ -9,6 +9,7 @@ from PyQt6.QtCore import QObject, pyqtSignal, QIODevice, QTimer, QThread
 from PyQt6.QtSerialPort import QSerialPort, QSerialPortInfo
 import serial
 import serial.tools.list_ports
+import time
 
 
 class PortOpenWorker(QThread):
@@ -44,14 +45,28 @@ class PortOpenWorker(QThread):
 class SerialManager(QObject):
     """Manages serial communication with the UTM firmware"""
 
+    # Categories of received lines, for data_received subscriptions
+    STATUS = "status"        # Welcome banner, firmware version
+    ECHO = "echo"            # "Command: ..." echoes of sent commands
+    LOAD = "load"            # Load cell readings (bare numbers)
+    POSITION = "position"    # "Total Angle: ..." encoder telemetry
+    VELOCITY = "velocity"    # "Velocity: ..." encoder telemetry
+    UNKNOWN = "unknown"      # Any other text (help, motor messages, errors)
+    TELEMETRY = (LOAD, POSITION, VELOCITY)
+    CATEGORIES = (STATUS, ECHO, LOAD, POSITION, VELOCITY, UNKNOWN)
+
     # Signals for asynchronous communication
     connection_changed = pyqtSignal(bool)  # True=connected, False=disconnected
-    data_received = pyqtSignal(str)        # Raw data line received
+    data_received = pyqtSignal(str)        # Raw data line received (subscribed categories only)
     load_cell_data = pyqtSignal(float)     # Parsed load cell value
     position_data = pyqtSignal(float)      # Parsed position value
     velocity_data = pyqtSignal(float, float)  # Parsed velocity values (val1, val2)
     firmware_version = pyqtSignal(str)     # Firmware version string
     error_occurred = pyqtSignal(str)       # Error message
+    break_detected = pyqtSignal(float)     # Force (N) of the sample that tripped the break detector
+
+    # Longest wait for a priority command to leave the port buffer (ms)
+    PRIORITY_WRITE_TIMEOUT_MS = 5
 
     def __init__(self):
         super().__init__()
@@ -63,7 +78,11 @@ class SerialManager(QObject):
         self.connected = False
         self.port_open = False  # Port is open but not yet confirmed
         self.awaiting_handshake = False  # Waiting for firmware response
-        self.buffer = ""  # Buffer for incomplete lines
+        self.buffer = b""  # Buffer for incomplete lines (bytes, decoded only when emitted)
+        self._subscriptions = set(self.CATEGORIES)  # Categories emitted as data_received
+        self._break_detector = None  # streaming_analysis.BreakDetector checked on every load reading
+        self._to_force = None  # Raw load cell reading -> force in N
+        self._to_index = None  # () -> store index of the reading about to be emitted, or None
 
         # Connection timeout timer
         self.handshake_timer = QTimer()
@@ -92,6 +111,27 @@ class SerialManager(QObject):
         ports = QSerialPortInfo.availablePorts()
         port_names = [port.portName() for port in ports]
         return port_names
+
+    def set_subscriptions(self, categories):
+        """
+        Choose which categories of received lines are emitted as data_received
+
+        Lines of other categories are still parsed into the typed signals
+        (load_cell_data, position_data, ...) but never decoded to text or
+        emitted as raw lines.
+
+        Args:
+            categories (iterable): Subset of CATEGORIES
+        """
+        categories = set(categories)
+        unknown = categories - set(self.CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown line categories: {', '.join(sorted(unknown))}")
+        self._subscriptions = categories
+
+    def subscriptions(self):
+        """Categories currently emitted as data_received"""
+        return set(self._subscriptions)
     
     def connect(self, port_name, baud_rate=9600):
         """
@@ -161,18 +201,14 @@ class SerialManager(QObject):
             # Step 0: Read any buffered data after port stabilization
             if self.serial_port.bytesAvailable() > 0:
                 buffered_data = self.serial_port.readAll()
-                try:
-                    text = buffered_data.data().decode('utf-8', errors='ignore')
-                    for line in text.split('\n'):
-                        line = line.strip()
-                        if line:
-                            self.data_received.emit(line)
-                except:
-                    pass
+                for line in buffered_data.data().split(b'\n'):
+                    line = line.strip()
+                    if line and self._classify(line) in self._subscriptions:
+                        self.data_received.emit(line.decode('utf-8', errors='ignore'))
 
             # Clear any remaining stale data
             self.serial_port.clear(QSerialPort.Direction.AllDirections)
-            self.buffer = ""
+            self.buffer = b""
 
             # Send EStop for safety
             self._send_raw("EStop")
@@ -254,84 +290,154 @@ class SerialManager(QObject):
 
         return self._send_raw(command)
     
+    def send_priority(self, command):
+        """
+        Send a command right away and wait (briefly) until it has left the port buffer
+
+        For safety stops issued from the read handler: the command does not wait
+        for the event loop to write it out.
+
+        Args:
+            command (str): Command string (e.g., 'Stop')
+
+        Returns:
+            bool: True if command sent successfully, False otherwise
+        """
+        if not self.connected or not self._send_raw(command):
+            return False
+        self.serial_port.waitForBytesWritten(self.PRIORITY_WRITE_TIMEOUT_MS)
+        return True
+
+    def set_break_detector(self, detector, to_force=None, to_index=None):
+        """
+        Watch the load cell readings for specimen fracture
+
+        The detector is fed in the read handler, before any signal is emitted
+        for the reading. When it trips, 'Stop' is sent with send_priority()
+        and break_detected is emitted after load_cell_data.
+
+        Args:
+            detector (BreakDetector or None): Detector to feed, None to disable
+            to_force (callable): Raw load cell reading -> force in N
+            to_index (callable): () -> index the reading will be stored at, or None
+                (called before load_cell_data is emitted for the reading)
+        """
+        self._break_detector = detector
+        self._to_force = to_force
+        self._to_index = to_index
+
+    def _check_break(self, line):
+        """Feed a load cell line to the break detector, stopping the motors if it trips"""
+        detector = self._break_detector
+        if detector is None or detector.detected:
+            return None
+        try:
+            force = self._to_force(float(line))
+        except ValueError:
+            return None
+        index = self._to_index() if self._to_index is not None else None
+        if not detector.update(time.perf_counter(), force, index):
+            return None
+        self.send_priority("Stop")
+        return force
+
     def _on_data_ready(self):
         """Internal handler for when data is available to read"""
         # Read all available data
         data = self.serial_port.readAll()
-        
+
         try:
-            # Decode bytes to string
-            text = data.data().decode('utf-8', errors='ignore')
-            
-            # Add to buffer and process complete lines
-            self.buffer += text
-            
-            # Process all complete lines in the buffer
-            while '\n' in self.buffer:
-                line, self.buffer = self.buffer.split('\n', 1)
+            # Lines stay bytes: only subscribed categories are decoded to text
+            self.buffer += data.data()
+            if b'\n' not in self.buffer:
+                return
+            *lines, self.buffer = self.buffer.split(b'\n')
+
+            for line in lines:
                 line = line.strip()
-                
                 if line:
+                    category = self._classify(line)
+
+                    # Break check first, so Stop goes out before any slot runs
+                    break_force = self._check_break(line) if category == self.LOAD else None
+
                     # Emit raw data
-                    self.data_received.emit(line)
-                    
+                    if category in self._subscriptions:
+                        self.data_received.emit(line.decode('utf-8', errors='ignore'))
+
                     # Parse specific data types
-                    self._parse_response(line)
-                    
+                    self._parse_response(line, category)
+
+                    if break_force is not None:
+                        self.break_detected.emit(break_force)
+
         except Exception as e:
             self.error_occurred.emit(f"Error reading data: {str(e)}")
-    
-    def _parse_response(self, line):
+
+    def _classify(self, line):
+        """
+        Category of a received line
+
+        Args:
+            line (bytes): A stripped line received from the serial port
+
+        Returns:
+            str: One of CATEGORIES
+        """
+        if line.startswith(b"Total Angle:"):
+            return self.POSITION
+        if line.startswith(b"Velocity:"):
+            return self.VELOCITY
+        if line.startswith(b"Firmware Version:") or line.startswith(b"Welcome to"):
+            return self.STATUS
+        if line.startswith(b"Command:"):
+            return self.ECHO
+        try:
+            # Load cell data (single numeric value, float() parses the bytes directly)
+            float(line)
+            return self.LOAD
+        except ValueError:
+            return self.UNKNOWN
+
+    def _parse_response(self, line, category):
         """
         Parse different types of responses from the Arduino
-        
+
         Args:
-            line (str): A line of text received from the serial port
+            line (bytes): A line received from the serial port
+            category (str): Its category (see _classify)
         """
         try:
-            # Check for specific response patterns
-            if line.startswith("Welcome to"):
-                # Welcome message - connection established
-                pass
-            
-            elif line.startswith("Total Angle:"):
+            if category == self.LOAD:
+                self.load_cell_data.emit(float(line))
+
+            elif category == self.POSITION:
                 # Position data: "Total Angle: [value]\t[value]"
-                parts = line.split(':')[1].strip().split('\t')
+                parts = line.split(b':')[1].strip().split(b'\t')
                 if parts:
                     raw_angle = float(parts[0])
                     self.position_data.emit(raw_angle)
-            
-            elif line.startswith("Velocity:"):
+
+            elif category == self.VELOCITY:
                 # Velocity data: "Velocity: [val1]\t[val2]"
-                parts = line.split(':')[1].strip().split('\t')
+                parts = line.split(b':')[1].strip().split(b'\t')
                 if len(parts) >= 2:
                     vel1 = float(parts[0])
                     vel2 = float(parts[1])
                     self.velocity_data.emit(vel1, vel2)
-            
-            elif line.startswith("Firmware Version:"):
+
+            elif line.startswith(b"Firmware Version:"):
                 # Firmware version: "Firmware Version: 1.1.0"
-                version = line.split(':', 1)[1].strip()
+                version = line.split(b':', 1)[1].strip().decode('utf-8', errors='ignore')
 
                 # If awaiting handshake, this confirms the connection
                 if self.awaiting_handshake:
                     self._confirm_connection()
 
                 self.firmware_version.emit(version)
-            
-            elif line.startswith("Command:"):
-                # Command echo - ignore
-                pass
-            
-            else:
-                # Try to parse as load cell data (single numeric value)
-                try:
-                    value = float(line)
-                    self.load_cell_data.emit(value)
-                except ValueError:
-                    # Not a number, just a regular message
-                    pass
-                    
+
+            # Welcome banner, command echoes and other messages carry no data
+
         except Exception as e:
             # Don't emit error for parsing failures - just ignore malformed data
             pass
@@ -0,0 +1,215 @@
+"""
+Streaming Analysis for UTM Application
+
+Live estimators fed one sample at a time from the acquisition path: a
+windowed least-squares slope of the stress-strain curve (the running
+stiffness), a 0.2 % offset yield detector and a fracture (break) detector.
+Each update is O(1), so their cost does not grow with the length of the
+test. The same windowed slope is available for the whole recording as the
+'windowed_modulus' derived channel.
+"""
+
+import math
+from collections import deque
+
+from material_properties import OFFSET_STRAIN, MIN_R2
+
+
+class WindowedSlope:
+    """
+    Least-squares line through the last `window` (x, y) points
+
+    Keeps the sums of x, y, x², xy and y² over a ring buffer and updates them
+    as points enter and leave the window. Coordinates are taken relative to
+    the first point after a reset to limit cancellation, and the sums are
+    recomputed from the buffer once per window length so rounding errors of
+    the add/remove updates cannot accumulate.
+    """
+
+    def __init__(self, window=200):
+        self.window = max(2, int(window))
+        self.reset()
+
+    def reset(self):
+        self._xs = [0.0] * self.window
+        self._ys = [0.0] * self.window
+        self._next = 0  # Ring buffer position of the next point
+        self._count = 0
+        self._origin = None
+        self._sx = self._sy = self._sxx = self._sxy = self._syy = 0.0
+        self._updates = 0
+
+    def update(self, x, y):
+        """Add a point (the oldest one leaves the window once it is full)"""
+        if self._origin is None:
+            self._origin = (x, y)
+        x -= self._origin[0]
+        y -= self._origin[1]
+        i = self._next
+        if self._count == self.window:
+            old_x, old_y = self._xs[i], self._ys[i]
+            self._sx -= old_x
+            self._sy -= old_y
+            self._sxx -= old_x * old_x
+            self._sxy -= old_x * old_y
+            self._syy -= old_y * old_y
+        else:
+            self._count += 1
+        self._xs[i] = x
+        self._ys[i] = y
+        self._sx += x
+        self._sy += y
+        self._sxx += x * x
+        self._sxy += x * y
+        self._syy += y * y
+        self._next = (i + 1) % self.window
+
+        self._updates += 1
+        if self._updates >= self.window:
+            self._resync()
+
+    def _resync(self):
+        xs, ys = self._xs, self._ys
+        if self._count < self.window:
+            xs, ys = xs[:self._count], ys[:self._count]
+        self._sx = math.fsum(xs)
+        self._sy = math.fsum(ys)
+        self._sxx = math.fsum(x * x for x in xs)
+        self._sxy = math.fsum(x * y for x, y in zip(xs, ys))
+        self._syy = math.fsum(y * y for y in ys)
+        self._updates = 0
+
+    def fit(self):
+        """
+        Current fit
+
+        Returns:
+            tuple: (slope, intercept, r²), NaN slope/intercept while x doesn't vary
+        """
+        n = self._count
+        if n < 2:
+            return math.nan, math.nan, 0.0
+        sxx = n * self._sxx - self._sx * self._sx
+        syy = n * self._syy - self._sy * self._sy
+        if sxx <= 1e-12 * n * self._sxx or sxx <= 0:
+            return math.nan, math.nan, 0.0
+        sxy = n * self._sxy - self._sx * self._sy
+        slope = sxy / sxx
+        # Intercept in the original coordinates
+        intercept = (self._sy - slope * self._sx) / n + self._origin[1] - slope * self._origin[0]
+        r2 = sxy * sxy / (sxx * syy) if syy > 0 else 0.0
+        return slope, intercept, r2
+
+
+class OffsetYieldDetector:
+    """
+    Flags yield when the curve drops below the 0.2 % offset line
+
+    The elastic line is the steepest windowed fit seen so far with
+    r² >= MIN_R2, which locks onto the linear part before yielding flattens
+    the curve. Detection is latched until reset().
+    """
+
+    def __init__(self, offset=OFFSET_STRAIN, min_r2=MIN_R2):
+        self.offset = offset
+        self.min_r2 = min_r2
+        self.reset()
+
+    def reset(self):
+        self.modulus = math.nan  # Slope of the elastic line
+        self._zero_strain = 0.0  # Strain where the elastic line crosses zero stress
+        self._sign = 1.0
+        self.detected = False
+        self.yield_strain = math.nan
+        self.yield_stress = math.nan
+
+    def update(self, strain, stress, slope, intercept, r2):
+        """
+        Check a new sample against the offset line
+
+        Args:
+            strain, stress (float): The sample
+            slope, intercept, r2 (float): Current windowed fit (see WindowedSlope.fit)
+
+        Returns:
+            bool: True for the sample at which yield is detected (once)
+        """
+        if self.detected:
+            return False
+        if r2 >= self.min_r2 and slope > 0 and not slope <= self.modulus:
+            self.modulus = slope
+            self._zero_strain = -intercept / slope
+            self._sign = 1.0 if stress >= 0 else -1.0  # Tension or compression
+        if math.isnan(self.modulus):
+            return False
+        # Offset line, mirrored for compression
+        offset_stress = self.modulus * (strain - self._zero_strain - self._sign * self.offset)
+        if self._sign * stress > 0 and self._sign * stress <= self._sign * offset_stress:
+            self.detected = True
+            self.yield_strain = strain
+            self.yield_stress = stress
+            return True
+        return False
+
+
+class BreakDetector:
+    """
+    Flags specimen fracture as a sudden drop from the recent peak force
+
+    Keeps the largest |force| of the last `window` seconds in a monotonic
+    deque (amortized O(1) per sample). A break is a sample whose |force| has
+    fallen by more than `drop_fraction` of that peak, once the peak has
+    reached `min_force` (so noise around zero load never triggers). Slow
+    unloading spread over more than the window is not a break. Detection is
+    latched until reset(). Samples may carry an index (e.g. their position in
+    the sample store), reported back for the peak and the last sample before
+    the drop.
+    """
+
+    def __init__(self, drop_fraction=0.5, window=0.2, min_force=20.0):
+        self.drop_fraction = drop_fraction
+        self.window = window
+        self.min_force = min_force
+        self.reset()
+
+    def reset(self):
+        self._peaks = deque()  # (time, |force|, index), |force| strictly decreasing
+        self._last_index = None  # Index of the previous sample
+        self.detected = False
+        self.break_time = math.nan
+        self.peak_force = math.nan  # |force| before the drop
+        self.peak_index = None  # Index of the peak sample
+        self.break_index = None  # Index of the last sample before the drop
+
+    def update(self, t, force, index=None):
+        """
+        Check a new sample
+
+        Args:
+            t (float): Sample time in seconds (any monotonic clock)
+            force (float): Force in N
+            index (int): Index of the sample, None if it has none (e.g. not recorded)
+
+        Returns:
+            bool: True for the sample at which the break is detected (once)
+        """
+        if self.detected:
+            return False
+        magnitude = abs(force)
+        peaks = self._peaks
+        while peaks and peaks[0][0] < t - self.window:
+            peaks.popleft()
+        if peaks:
+            peak = peaks[0][1]
+            if peak >= self.min_force and magnitude <= (1.0 - self.drop_fraction) * peak:
+                self.detected = True
+                self.break_time = t
+                self.peak_force = peak
+                self.peak_index = peaks[0][2]
+                self.break_index = self._last_index
+                return True
+        while peaks and peaks[-1][1] <= magnitude:
+            peaks.pop()
+        peaks.append((t, magnitude, index))
+        self._last_index = index
+        return False
@@ -0,0 +1,25 @@
+"""Tests for the batch analysis summary"""
+
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import batch_analysis  # noqa: E402
+
+
+def test_corrupt_file_reports_error_in_summary(tmp_path):
+    (tmp_path / "Bad_UTM_Test_20240101_120000.csv").write_bytes(b"# UTM Test Data Export\n\xff\xfe\x00garbage\n")
+    (tmp_path / "Bad_UTM_Test_20240101_130000.utm").write_bytes(b"not a utm file")
+    output = tmp_path / "summary.csv"
+
+    rows = batch_analysis.run_batch(tmp_path, output=output, jobs=1, use_cache=False, log=lambda message: None)
+
+    assert len(rows) == 2
+    with open(output, newline="", encoding="utf-8") as f:
+        summary = list(csv.DictReader(f))
+    assert "Error" in summary[0]
+    for row in summary:
+        assert row["File"].startswith("Bad_UTM_Test_")
+        assert row["Error"]
@@ -0,0 +1,141 @@
+"""
+Native .utm Test File Format
+
+Binary file format for UTM test data that can be opened with np.memmap
+without parsing or copying.
+
+Layout (all integers little-endian):
+
+    offset  size  field
+    0       8     magic b"UTMDATA\\0"
+    8       2     format version (uint16)
+    10      2     reserved (0)
+    12      4     JSON metadata length in bytes (uint32)
+    16      8     number of samples (uint64)
+    24      8     data offset in bytes from start of file (uint64)
+    32      ...   JSON metadata (UTF-8), zero padded up to the data offset
+    data    ...   one contiguous block per column, n_samples * 8 bytes each
+
+The data offset is aligned to DATA_ALIGNMENT so the column blocks start on a
+page boundary. Columns are stored as little-endian float64 in COLUMNS order.
+The JSON metadata holds the same fields as the CSV export header plus a
+"Columns" list describing the blocks. Blocks of derived channels may follow
+the COLUMNS blocks; they are listed in "Columns" too and need not be read.
+"""
+
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b"UTMDATA\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHIQQ")
+DATA_ALIGNMENT = 4096
+DTYPE = np.dtype("<f8")
+
+# (column name in file, sample store column)
+COLUMNS = (
+    ("Time_s", "time"),
+    ("RawADC", "raw"),
+    ("Force_N", "force"),
+    ("Position_mm", "position"),
+    ("Speed_mm_s", "speed"),
+)
+
+
+class UTMFormatError(Exception):
+    """Raised when a file is not a valid .utm file"""
+
+
+def write_utm(file_path, metadata, columns, extra_columns=None):
+    """
+    Write a .utm file
+
+    The file is written next to the destination under a temporary name and
+    then moved over it, so an existing file is only replaced by a complete one
+    (and columns that are memory-mapped views of it stay readable while writing).
+
+    Args:
+        file_path (str): Destination path
+        metadata (dict): JSON-serializable metadata (same fields as the CSV header)
+        columns (dict): Sample store column name -> 1-D array, all of equal length
+        extra_columns (dict): File column name -> 1-D array, written after the COLUMNS blocks
+    """
+    extra_columns = extra_columns or {}
+    names = [file_name for file_name, _ in COLUMNS] + list(extra_columns)
+    arrays = [np.ascontiguousarray(columns[store_name], dtype=DTYPE) for _, store_name in COLUMNS]
+    arrays += [np.ascontiguousarray(values, dtype=DTYPE) for values in extra_columns.values()]
+    n_samples = len(arrays[0])
+    if any(len(a) != n_samples for a in arrays):
+        raise ValueError("All columns must have the same length")
+
+    metadata = dict(metadata)
+    metadata["Columns"] = [
+        {"name": file_name, "dtype": DTYPE.str, "offset": i * n_samples * DTYPE.itemsize}
+        for i, file_name in enumerate(names)
+    ]
+    meta_bytes = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+
+    data_offset = HEADER.size + len(meta_bytes)
+    data_offset = -(-data_offset // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".utm.tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(meta_bytes), n_samples, data_offset))
+            f.write(meta_bytes)
+            f.write(b"\0" * (data_offset - HEADER.size - len(meta_bytes)))
+            for array in arrays:
+                array.tofile(f)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_utm_header(file_path):
+    """
+    Read only the header of a .utm file
+
+    Returns:
+        tuple: (metadata dict, number of samples, data offset)
+    """
+    with open(file_path, "rb") as f:
+        raw = f.read(HEADER.size)
+        if len(raw) < HEADER.size:
+            raise UTMFormatError("File too short")
+        magic, version, _, meta_len, n_samples, data_offset = HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise UTMFormatError("Not a .utm file")
+        if version > FORMAT_VERSION:
+            raise UTMFormatError(f"Unsupported .utm format version {version}")
+        metadata = json.loads(f.read(meta_len).decode("utf-8"))
+    return metadata, n_samples, data_offset
+
+
+def open_utm(file_path):
+    """
+    Open a .utm file for zero-copy access
+
+    The column arrays are read-only views into a single np.memmap, so opening is
+    constant time and only the pages that are actually accessed are read.
+
+    Returns:
+        tuple: (metadata dict, dict of sample store column name -> array)
+    """
+    metadata, n_samples, data_offset = read_utm_header(file_path)
+    n_columns = len(COLUMNS)
+    if n_samples == 0:
+        return metadata, {store_name: np.empty(0, dtype=DTYPE) for _, store_name in COLUMNS}
+
+    blocks = np.memmap(file_path, dtype=DTYPE, mode="r", offset=data_offset,
+                       shape=(n_columns, n_samples))
+    by_name = {entry["name"]: i for i, entry in enumerate(metadata.get("Columns", []))}
+    columns = {}
+    for i, (file_name, store_name) in enumerate(COLUMNS):
+        columns[store_name] = blocks[by_name.get(file_name, i)]
+    return metadata, columns
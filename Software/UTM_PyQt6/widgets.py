@@ -1,7 +1,7 @@
 """
 Custom Widgets for UTM Application
 
-Contains custom Qt widgets including toggle switches and gauges.
+Contains custom Qt widgets including toggle switches, gauges and a plot overview strip.
 """
 
 # Source - https://stackoverflow.com/a/62364553
@@ -10,8 +10,9 @@ Contains custom Qt widgets including toggle switches and gauges.
 # Modified for PyQt6 compatibility
 
 import math
-from PyQt6.QtCore import QObject, QSize, QPointF, QRectF, QPropertyAnimation, QEasingCurve, pyqtProperty, pyqtSlot, Qt
-from PyQt6.QtGui import QPainter, QPalette, QLinearGradient, QGradient, QColor, QPen, QFont, QConicalGradient, QBrush
+import numpy as np
+from PyQt6.QtCore import QObject, QSize, QPointF, QRectF, QPropertyAnimation, QEasingCurve, QTimer, pyqtProperty, pyqtSlot, Qt
+from PyQt6.QtGui import QPainter, QPalette, QLinearGradient, QGradient, QColor, QPen, QFont, QConicalGradient, QBrush, QPolygonF, QPixmap
 from PyQt6.QtWidgets import QAbstractButton, QWidget
 
 
@@ -239,6 +240,10 @@ class SpeedGauge(QWidget):
     - Digital readout in center
     - Color gradient based on absolute speed (green low, red high)
 
+    The static dial (face, track, ticks, unit) is rendered once into a cached
+    pixmap; a repaint only draws the value arc, needle and readout on top.
+    Value updates are coalesced to at most one repaint per frame.
+
     Usage:
         gauge = SpeedGauge()
         gauge.setValue(120.0)  # Set current speed (positive or negative)
@@ -266,6 +271,14 @@ class SpeedGauge(QWidget):
         self._text_color = QColor(220, 220, 220)
         self._needle_color = QColor(255, 80, 80)
 
+        self._dial_cache = None  # QPixmap of the static layers, rebuilt when invalidated
+
+        # Coalesce value updates to one repaint per frame
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(16)
+        self._repaint_timer.timeout.connect(self.update)
+
         self.setMinimumSize(120, 120)
 
     def sizeHint(self):
@@ -274,41 +287,76 @@ class SpeedGauge(QWidget):
     def setValue(self, value):
         """Set the current speed value (can be negative or positive)"""
         # Clamp to symmetric range: -max to +max
-        self._value = max(-self._max_value, min(value, self._max_value))
-        self.update()
+        value = max(-self._max_value, min(value, self._max_value))
+        if value == self._value:
+            return
+        self._value = value
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
 
     def value(self):
         return self._value
 
     def setMaxValue(self, max_val):
         """Set the maximum value on the gauge (range becomes -max to +max)"""
-        self._max_value = abs(max_val)  # Ensure positive
+        max_val = abs(max_val)  # Ensure positive
+        if max_val == self._max_value:
+            return  # Called on every speed update, keep the cached dial
+        self._max_value = max_val
+        self._dial_cache = None
         self.update()
 
     def setUnit(self, unit):
         """Set the unit label (e.g., 'RPM' or 'mm/s')"""
+        if unit == self._unit:
+            return
         self._unit = unit
+        self._dial_cache = None
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def resizeEvent(self, event):
+        self._dial_cache = None
+        super().resizeEvent(event)
 
-        # Calculate dimensions
+    def _setup_painter(self, painter):
+        """Antialiasing, origin at the center and 160x160 logical units scaled to fit"""
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         side = min(self.width(), self.height())
         painter.translate(self.width() / 2, self.height() / 2)
-
-        # Scale to fit
         scale = side / 160.0
         painter.scale(scale, scale)
 
-        # Draw background circle
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(self._background_color)
-        painter.drawEllipse(QPointF(0, 0), 75, 75)
+    def _dial_pixmap(self):
+        """The static layers, rendered at the device pixel ratio of the screen"""
+        dpr = self.devicePixelRatioF()
+        if self._dial_cache is None or self._dial_cache.devicePixelRatio() != dpr:
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            self._setup_painter(painter)
+
+            # Draw background circle
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self._background_color)
+            painter.drawEllipse(QPointF(0, 0), 75, 75)
+
+            # Draw arc background (gray track)
+            self._draw_arc(painter, self._arc_background, 0, self._span_angle)
+
+            # Draw tick marks (inside the track, the value arc never covers them)
+            self._draw_ticks(painter)
 
-        # Draw arc background (gray track)
-        self._draw_arc(painter, self._arc_background, 0, self._span_angle)
+            # Unit label
+            self._draw_unit(painter)
+            painter.end()
+            self._dial_cache = pixmap
+        return self._dial_cache
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._dial_pixmap())
+        self._setup_painter(painter)
 
         # Draw colored arc from center (0) to current value
         # Range is -max to +max, with 0 at center (top, 12 o'clock)
@@ -347,9 +395,6 @@ class SpeedGauge(QWidget):
                 arc_span = abs(normalized) * half_span
                 self._draw_arc_from_center(painter, arc_color, arc_span, positive=False)
 
-        # Draw tick marks
-        self._draw_ticks(painter)
-
         # Draw needle
         self._draw_needle(painter)
 
@@ -467,7 +512,7 @@ class SpeedGauge(QWidget):
         painter.restore()
 
     def _draw_text(self, painter):
-        """Draw the digital readout text"""
+        """Draw the digital readout value"""
         # Value text
         font = QFont("Arial", 14, QFont.Weight.Bold)
         painter.setFont(font)
@@ -486,9 +531,9 @@ class SpeedGauge(QWidget):
         value_rect = QRectF(-40, 15, 80, 25)
         painter.drawText(value_rect, Qt.AlignmentFlag.AlignCenter, value_text)
 
-        # Unit text
-        font.setPointSize(9)
-        font.setWeight(QFont.Weight.Normal)
+    def _draw_unit(self, painter):
+        """Draw the unit label under the readout"""
+        font = QFont("Arial", 9, QFont.Weight.Normal)
         painter.setFont(font)
         painter.setPen(QColor(150, 150, 150))
 
@@ -502,6 +547,10 @@ class RangeSlider(QWidget):
 
     Emits rangeChanged signal when either handle is moved.
     Values are in percentage (0-100).
+
+    An optional envelope (per-column min/max of a series, see setEnvelope) is
+    drawn behind the track, so the crop range can be chosen without looking
+    at the plot. Its polygon is cached and only rebuilt on new data or resize.
     """
     from PyQt6.QtCore import pyqtSignal
     rangeChanged = pyqtSignal(int, int)  # (low, high) percentages
@@ -514,6 +563,9 @@ class RangeSlider(QWidget):
         self._handle_width = 12
         self._handle_height = 20
         self._track_height = 6
+        self._envelope = None  # (min, max) arrays, one entry per column
+        self._envelope_range = (0.0, 1.0)
+        self._envelope_polygon = None  # Cached for the current size
 
         self.setMinimumHeight(30)
         self.setMinimumWidth(100)
@@ -553,6 +605,48 @@ class RangeSlider(QWidget):
             self.update()
             self.rangeChanged.emit(self._low, self._high)
 
+    def trackWidth(self):
+        """Width of the track in pixels (the useful envelope resolution)"""
+        return max(1, self.width() - self._handle_width)
+
+    def setEnvelope(self, low, high):
+        """
+        Draw a series envelope behind the track
+
+        Args:
+            low, high (np.ndarray): Min and max of each column, evenly spread over the track
+        """
+        self._envelope = (np.array(low, dtype=np.float64), np.array(high, dtype=np.float64))
+        if len(low):
+            y0, y1 = float(self._envelope[0].min()), float(self._envelope[1].max())
+            self._envelope_range = (y0, y1) if y1 > y0 else (y0 - 1.0, y0 + 1.0)
+        self._envelope_polygon = None
+        self.update()
+
+    def clearEnvelope(self):
+        self._envelope = None
+        self._envelope_polygon = None
+        self.update()
+
+    def resizeEvent(self, event):
+        self._envelope_polygon = None
+        super().resizeEvent(event)
+
+    def _envelope_shape(self):
+        """Filled polygon of the envelope in widget coordinates (cached)"""
+        if self._envelope_polygon is None:
+            low, high = self._envelope
+            n = len(low)
+            y0, y1 = self._envelope_range
+            x = self._handle_width / 2 + (np.arange(n) + 0.5) * (self.trackWidth() / n)
+            scale = (self.height() - 3) / (y1 - y0)
+            top = 1 + (y1 - high) * scale
+            bottom = 1 + (y1 - low) * scale + 1  # At least one pixel thick
+            xs = np.concatenate((x, x[::-1])).tolist()
+            ys = np.concatenate((top, bottom[::-1])).tolist()
+            self._envelope_polygon = QPolygonF([QPointF(a, b) for a, b in zip(xs, ys)])
+        return self._envelope_polygon
+
     def _value_to_x(self, value):
         """Convert a value (0-100) to x coordinate"""
         usable_width = self.width() - self._handle_width
@@ -575,6 +669,21 @@ class RangeSlider(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
+        # Series envelope (selected part highlighted)
+        if self._envelope is not None and len(self._envelope[0]):
+            shape = self._envelope_shape()
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(150, 150, 150, 140))
+            painter.drawPolygon(shape)
+            if self._low > 0 or self._high < 100:
+                low_x = self._value_to_x(self._low)
+                high_x = self._value_to_x(self._high)
+                painter.save()
+                painter.setClipRect(QRectF(low_x, 0, high_x - low_x, self.height()))
+                painter.setBrush(QColor(0, 120, 215, 110))
+                painter.drawPolygon(shape)
+                painter.restore()
+
         # Track background
         track_y = (self.height() - self._track_height) // 2
         track_rect = QRectF(self._handle_width / 2, track_y,
@@ -653,3 +762,71 @@ class RangeSlider(QWidget):
 
     def sizeHint(self):
         return QSize(200, 30)
+
+
+class OverviewStrip(QWidget):
+    """
+    Thin low-resolution plot of a whole series with a highlighted window
+
+    Shown under the load plot in rolling-window mode, so the whole test stays
+    visible while the main plot follows the last few seconds. The points are
+    expected to be decimated to about the strip width already.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._x = self._y = np.empty(0)
+        self._x_range = (0.0, 1.0)
+        self._y_range = (0.0, 1.0)
+        self._window = None  # (x_low, x_high) or None
+
+        self.setMinimumHeight(36)
+        self.setMaximumHeight(36)
+
+    def setData(self, x, y, x_range, y_range):
+        """
+        Set the curve
+
+        Args:
+            x, y (np.ndarray): Decimated points
+            x_range (tuple): (min, max) x of the whole series
+            y_range (tuple): (min, max) y of the whole series
+        """
+        self._x = np.array(x, dtype=np.float64)  # Copies: the inputs may be reused display buffers
+        self._y = np.array(y, dtype=np.float64)
+        self._x_range = x_range if x_range[1] > x_range[0] else (x_range[0], x_range[0] + 1.0)
+        self._y_range = y_range if y_range[1] > y_range[0] else (y_range[0] - 1.0, y_range[0] + 1.0)
+        self.update()
+
+    def setWindow(self, x_low, x_high):
+        """Highlight the x range shown by the main plot"""
+        self._window = (x_low, x_high)
+        self.update()
+
+    def clear(self):
+        self._x = self._y = np.empty(0)
+        self._window = None
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(250, 250, 250))
+        painter.setPen(QPen(QColor(200, 200, 200), 1))
+        painter.drawRect(QRectF(0, 0, self.width() - 1, self.height() - 1))
+
+        if self._window is not None:
+            x0, x1 = self._x_range
+            scale = (self.width() - 1) / (x1 - x0)
+            left = max(0.0, (self._window[0] - x0) * scale)
+            right = min(self.width() - 1.0, (self._window[1] - x0) * scale)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(0, 120, 215, 50))
+            painter.drawRect(QRectF(left, 0, max(1.0, right - left), self.height()))
+
+        if len(self._x):
+            x0, x1 = self._x_range
+            y0, y1 = self._y_range
+            px = (self._x - x0) * ((self.width() - 1) / (x1 - x0))
+            py = 2 + (y1 - self._y) * ((self.height() - 5) / (y1 - y0))
+            painter.setPen(QPen(QColor(0, 0, 255), 1))
+            painter.drawPolyline(QPolygonF([QPointF(a, b) for a, b in zip(px.tolist(), py.tolist())]))